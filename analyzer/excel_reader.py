@@ -0,0 +1,224 @@
+"""
+Fast Excel ingestion for the analyzer inputs
+Reads only the columns an analyzer needs; rows/sec is recorded per read, the total is shown
+in the pipeline's final report and per-read lines are printed on request
+
+Engines (env EXCEL_READER_ENGINE, default 'auto'):
+- calamine: Rust-based reader via pandas (requires the python-calamine package)
+- openpyxl: read_only streaming of cell values, skipping openpyxl Cell objects
+- pandas: plain pd.read_excel (reference behaviour)
+'auto' picks calamine when installed, openpyxl otherwise. Every engine returns the same
+DataFrame pd.read_excel would (header on the first row, same type inference and NaN handling)
+
+Environment variables: EXCEL_READER_ENGINE, EXCEL_READER_REPORT (1 = print rows/sec)
+"""
+
+import os
+import time
+import fnmatch
+import importlib.util
+from pathlib import Path
+
+import pandas as pd
+
+ENGINES = ('calamine', 'openpyxl', 'pandas')
+
+
+def available_engines():
+    """Engines usable in this environment, fastest first"""
+    engines = []
+    if importlib.util.find_spec('python_calamine') is not None:
+        engines.append('calamine')
+    if importlib.util.find_spec('openpyxl') is not None:
+        engines.append('openpyxl')
+    engines.append('pandas')
+    return engines
+
+
+def resolve_engine(engine=None):
+    """Explicit engine, else env EXCEL_READER_ENGINE; 'auto' -> fastest available"""
+    engine = (engine or os.getenv('EXCEL_READER_ENGINE', 'auto')).lower()
+    if engine == 'auto':
+        return available_engines()[0]
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown Excel reader engine: {engine} (expected auto or one of {', '.join(ENGINES)})")
+    return engine
+
+
+def column_matcher(columns):
+    """
+    Header predicate for a column selection
+    Entries are exact names or fnmatch patterns ('*Ciro*'); None selects every column
+    """
+    if columns is None:
+        return None
+    names = set(columns)
+    patterns = [column for column in columns if any(ch in column for ch in '*?[')]
+
+    def matches(header):
+        header = str(header)
+        return header in names or any(fnmatch.fnmatchcase(header, pattern) for pattern in patterns)
+
+    return matches
+
+
+class ExcelReadStats:
+    def __init__(self, path, engine, rows, columns, seconds):
+        self.path = path
+        self.engine = engine
+        self.rows = rows
+        self.columns = columns
+        self.seconds = seconds
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds > 0 else float('inf')
+
+    def __str__(self):
+        return (f"{Path(self.path).name}: {self.rows} rows x {self.columns} columns in {self.seconds:.2f}s "
+                f"({self.rows_per_sec:,.0f} rows/s, {self.engine})")
+
+
+class ExcelReader:
+    def __init__(self, engine=None, report=None):
+        """
+        Args:
+            engine: calamine, openpyxl, pandas or auto (default: env EXCEL_READER_ENGINE)
+            report: Print rows/sec after each read (default: env EXCEL_READER_REPORT = 1, off)
+        """
+        self.engine = resolve_engine(engine)
+        if report is None:
+            report = os.getenv('EXCEL_READER_REPORT', '0').lower() in ('1', 'true', 'yes')
+        self.report = report
+        self.stats = []
+
+    def read(self, path, columns=None, sheet_name=0):
+        """
+        Read one sheet, keeping only the selected columns (see column_matcher)
+        Selected columns keep their sheet order; names that do not exist are ignored
+        """
+        start = time.perf_counter()
+        matcher = column_matcher(columns)
+        if self.engine == 'openpyxl':
+            df = self._read_openpyxl(path, matcher, sheet_name)
+        else:
+            engine = 'calamine' if self.engine == 'calamine' else None
+            df = pd.read_excel(path, sheet_name=sheet_name, usecols=matcher, engine=engine)
+
+        stats = ExcelReadStats(path, self.engine, len(df), len(df.columns), time.perf_counter() - start)
+        self.stats.append(stats)
+        if self.report:
+            print(f"[EXCEL] {stats}")
+        return df
+
+    def summary(self):
+        """Total throughput over every read so far (None before the first read)"""
+        if not self.stats:
+            return None
+        rows = sum(stats.rows for stats in self.stats)
+        seconds = sum(stats.seconds for stats in self.stats)
+        rows_per_sec = rows / seconds if seconds > 0 else float('inf')
+        return (f"{len(self.stats)} reads, {rows} rows in {seconds:.2f}s "
+                f"({rows_per_sec:,.0f} rows/s, {self.engine})")
+
+    @staticmethod
+    def _read_openpyxl(path, matcher, sheet_name):
+        from openpyxl import load_workbook
+        from openpyxl.cell.cell import ERROR_CODES
+
+        errors = frozenset(ERROR_CODES)
+
+        def convert(value):
+            # Same cell conversion as pandas' openpyxl reader
+            if value is None:
+                return ""
+            if type(value) is float:
+                as_int = int(value)
+                return as_int if as_int == value else value
+            if type(value) is str and value in errors:
+                return float('nan')
+            return value
+
+        book = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+        try:
+            sheet = book[sheet_name] if isinstance(sheet_name, str) else book.worksheets[sheet_name]
+            sheet.reset_dimensions()
+
+            # Same row layout as pandas' openpyxl reader, built from plain values instead of Cell objects
+            data = []
+            last_row_with_data = -1
+            for row in sheet.iter_rows(values_only=True):
+                converted = [convert(value) for value in row]
+                while converted and converted[-1] == "":
+                    converted.pop()
+                if converted:
+                    last_row_with_data = len(data)
+                data.append(converted)
+        finally:
+            book.close()
+
+        data = data[:last_row_with_data + 1]
+        if not data:
+            return pd.DataFrame()
+
+        max_width = max(len(row) for row in data)
+        data = [row + [""] * (max_width - len(row)) for row in data]
+        return frame_from_rows(data[0], data[1:], matcher)
+
+
+# pandas' default na_values (documented in pd.read_excel)
+NA_STRINGS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+
+
+def header_names(header):
+    """pd.read_excel column labels: blank -> 'Unnamed: i', repeated names -> 'name.1', 'name.2'"""
+    names = []
+    seen = {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value == "" else value
+        base = name
+        while name in seen:
+            seen[base] += 1
+            name = f"{base}.{seen[base]}"
+        seen[name] = 0
+        names.append(name)
+    return names
+
+
+NUMERIC_CELL_TYPES = (bool, int, float, str)
+
+
+def infer_column(values):
+    """Type inference of pd.read_excel for one column of cell values"""
+    values = values.mask(values.isin(NA_STRINGS))
+    non_null = values.dropna()
+    if len(non_null) == 0:
+        return values if len(values) == 0 else values.astype(float)
+    if all(type(value) is bool for value in non_null) and len(non_null) == len(values):
+        return values.astype(bool)
+    if all(type(value) in NUMERIC_CELL_TYPES for value in non_null):
+        # Numbers, numeric text and booleans with gaps become numeric; any other text keeps the column textual
+        try:
+            return pd.to_numeric(values)
+        except (ValueError, TypeError):
+            pass
+    return values.infer_objects()
+
+
+def frame_from_rows(header, rows, matcher=None):
+    """
+    DataFrame pd.read_excel would build from already converted cell values
+    (header row + data rows of equal width), keeping only columns accepted by matcher
+    """
+    names = header_names(header)
+    selected = [i for i, name in enumerate(names) if matcher is None or matcher(name)]
+    if not selected:
+        return pd.DataFrame(columns=pd.Index([], dtype=object))
+    # Labels are inferred from the selected names only (str dtype unless a numeric header is kept)
+    columns = pd.Index([names[i] for i in selected])
+    df = pd.DataFrame(rows, columns=pd.Index(names, dtype=object), dtype=object).iloc[:, selected]
+    return pd.DataFrame({name: infer_column(df.iloc[:, pos]) for pos, name in enumerate(columns)},
+                        columns=columns)
@@ -4,89 +4,168 @@ Analyzes customer payment compliance, collection periods, and credit limit compl
 """
 
 import pandas as pd
+import numpy as np
 import json
-import re
 import os
+import sys
+import argparse
 from datetime import datetime
 from dotenv import load_dotenv
 
 # .env dosyasını yükle
 load_dotenv()
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.amount_utils import parse_amount_parts, parse_amounts
+from analyzer.workbook_cache import get_workbook_cache
+from utils.company_name_utils import normalize_company_name
+
+DEVIATION_COLUMNS = ['BT Sapma', 'bt sapma', 'Bt Sapma', 'bt_sapma', 'Bt_Sapma', 'BT_SAPMA']
+
+# Candidate columns naming the customer of each balance statement row (batch mode)
+BALANCE_CUSTOMER_COLUMNS = ['Ad', 'Müşteri', 'Müşteri Adı', 'Musteri', 'Cari Ad', 'Cari Adı', 'Cari Hesap Adı']
+
+# Columns the analyses read from each workbook (everything else is skipped at load time)
+VADE_COLUMNS = ['Ad', 'ÖdemeKoşul', 'Toplam FatFatOrtVade'] + DEVIATION_COLUMNS
+BALANCE_COLUMNS = ['Alan', 'Değer'] + BALANCE_CUSTOMER_COLUMNS
+
+BALANCE_LABELS = {
+    # Checked in this order; the first label found in 'Alan' wins for a row
+    'credit_limit': 'Cari Limiti',
+    'current_risk': 'Cari Riski',
+    'check_risk': 'Kendi Çek Riski',
+    'promissory_note_risk': 'Senet Riski',
+}
+
+
+class BalanceSheetIndex:
+    """
+    Alan -> Değer lookup over a balance statement, built once with vectorized string ops
+    When a customer column is given, values are indexed per (customer, field) so one
+    statement covering thousands of customers is classified in a single pass
+    """
+
+    def __init__(self, balance_df, value_parser, labels=None, customer_column=None):
+        """
+        Args:
+            balance_df: Statement with 'Alan' and 'Değer' columns
+            value_parser: Batch currency cleaner (list/Series -> float array)
+            labels: field -> substring of 'Alan' (default: BALANCE_LABELS)
+            customer_column: Optional column identifying the customer of each row
+        """
+        self.labels = labels or BALANCE_LABELS
+        self.customer_column = customer_column
+        self._values = {}
+        self._frame = pd.DataFrame(columns=['customer', 'field', 'value'])
+
+        if balance_df is None or balance_df.empty:
+            return
+
+        alan = balance_df['Alan'].astype(str)
+        masks = [alan.str.contains(label, regex=False).to_numpy() for label in self.labels.values()]
+        fields = np.select(masks, list(self.labels.keys()), default='')
+        matched = fields != ''
+        if not matched.any():
+            return
+
+        index = pd.DataFrame({
+            'field': fields[matched],
+            'value': value_parser(balance_df['Değer'][matched]),
+        })
+        key_columns = ['field']
+        if customer_column:
+            index.insert(0, 'customer', balance_df[customer_column].to_numpy()[matched])
+            key_columns = ['customer', 'field']
+
+        # Later rows override earlier ones, same as the original row-by-row scan
+        index = index.drop_duplicates(subset=key_columns, keep='last')
+        self._frame = index
+        keys = index['field'] if not customer_column else zip(index['customer'], index['field'])
+        self._values = dict(zip(keys, index['value'].astype(float)))
+
+    def get(self, field, customer=None):
+        """Parsed value of a field (None when the statement has no such row)"""
+        key = field if not self.customer_column else (customer, field)
+        return self._values.get(key)
+
+    def customers(self):
+        """Customers present in the statement (customer-indexed mode only)"""
+        if not self.customer_column:
+            return []
+        return list(dict.fromkeys(customer for customer, _ in self._values))
+
+    def to_wide(self):
+        """Customer x field DataFrame (customer-indexed mode only); missing fields are NaN"""
+        wide = self._frame.pivot(index='customer', columns='field', values='value') if self.customer_column and not self._frame.empty else pd.DataFrame()
+        return wide.reindex(columns=list(self.labels.keys()))
+
+
 class FinancialAnalyzer:
     def __init__(self):
         datas_base = os.getenv('DATAS_BASE', r'C:\Users\acer\Desktop\NORM HOLDING\datasforfinalblock')
         self.vade_file_path = os.path.join(datas_base, 'Musteri_Ortalama_Vade_Raporu.xlsx')
         self.balance_file_path = os.path.join(datas_base, 'Yuruyen_Bakiyeli_Musteri_Ekstresi.xlsx')
         self.sales_file_path = os.path.join(datas_base, 'LLM_Input_Satis_Analizi.json')
+        self.batch_output_path = os.path.join(datas_base, 'Finansal_Analiz_Tum_Musteriler.json')
+        # Shared cache: each workbook is parsed once per interpreter; snapshots let reruns skip openpyxl
+        self.workbooks = get_workbook_cache()
+        self._balance_index = None
     
     def clean_currency_value(self, value_str):
         """
         Clean currency values by removing TRY suffix and other formatting
         Handles various formats like: "1000 TRY", "1.000,50 TRY", "25.435.852,83 - 02.07.2025", etc.
+        Parsing rules live in the shared engine (utils.amount_utils)
         """
-        if not value_str or pd.isna(value_str):
+        if value_str is None or (not isinstance(value_str, str) and pd.isna(value_str)):
             return 0.0
-            
-        # Convert to string and strip whitespace
-        clean_str = str(value_str).strip()
-        
-        # Remove "TRY" suffix (case insensitive)
-        clean_str = re.sub(r'\s*TRY\s*$', '', clean_str, flags=re.IGNORECASE)
         
-        # For sales data that might contain dates, extract only the number part at the beginning
-        # Pattern: "25.435.852,83 - 02.07.2025" -> "25.435.852,83"
-        date_pattern = r'\s*-\s*\d{2}\.\d{2}\.\d{4}.*$'
-        if re.search(date_pattern, clean_str):
-            clean_str = re.sub(date_pattern, '', clean_str)
-        
-        # Remove any remaining non-numeric characters except digits, commas, periods, and minus signs
-        clean_str = re.sub(r'[^\d,.,-]', '', clean_str)
-        
-        # Handle different decimal separator conventions
-        # If there are multiple periods and commas, assume European format (1.000,50)
-        if '.' in clean_str and ',' in clean_str:
-            # European format: 1.000,50 -> 1000.50
-            parts = clean_str.split(',')
-            if len(parts) == 2:
-                integer_part = parts[0].replace('.', '')  # Remove thousand separators
-                decimal_part = parts[1]
-                clean_str = f"{integer_part}.{decimal_part}"
-        elif ',' in clean_str and clean_str.count(',') == 1:
-            # Check if comma is decimal separator or thousand separator
-            comma_pos = clean_str.find(',')
-            after_comma = clean_str[comma_pos + 1:]
-            
-            # If 1-2 digits after comma, it's likely decimal separator
-            if len(after_comma) <= 2 and after_comma.isdigit():
-                clean_str = clean_str.replace(',', '.')
-            else:
-                # Otherwise, it's thousand separator
-                clean_str = clean_str.replace(',', '')
-        elif ',' in clean_str:
-            # Multiple commas - treat as thousand separators
-            clean_str = clean_str.replace(',', '')
-        
-        # Convert to float
-        try:
-            return float(clean_str)
-        except (ValueError, TypeError):
-            print(f"Warning: Could not convert '{value_str}' to numeric value")
+        canonical, _ = parse_amount_parts(value_str)
+        if canonical is None:
+            if str(value_str).strip():
+                print(f"Warning: Could not convert '{value_str}' to numeric value")
             return 0.0
+        return float(canonical)
+    
+    def clean_currency_values(self, values):
+        """
+        Batch version of clean_currency_value for a list or pandas Series
+        Returns a float numpy array; unparseable values become 0.0
+        """
+        amounts, _ = parse_amounts(values)
+        return np.nan_to_num(amounts, nan=0.0)
+    
+    def get_balance_index(self, balance_df):
+        """
+        Balance sheet index for the given statement, built once per analyzer instance
+        """
+        if self._balance_index is None or self._balance_index[0] is not balance_df:
+            self._balance_index = (balance_df, BalanceSheetIndex(balance_df, self.clean_currency_values))
+        return self._balance_index[1]
+    
+    def read_vade_report(self):
+        """Average maturity report, restricted to VADE_COLUMNS"""
+        return self.workbooks.read_excel(self.vade_file_path, columns=VADE_COLUMNS)
+    
+    def read_balance_statement(self):
+        """Balance statement, restricted to BALANCE_COLUMNS (+ env BALANCE_CUSTOMER_COLUMN)"""
+        customer_column = os.getenv('BALANCE_CUSTOMER_COLUMN')
+        columns = BALANCE_COLUMNS + [customer_column] if customer_column else BALANCE_COLUMNS
+        return self.workbooks.read_excel(self.balance_file_path, columns=columns)
     
     def extract_payment_compliance(self):
         """
         Extract company's compliance with payment terms as a percentage
         """
         try:
-            vade_df = pd.read_excel(self.vade_file_path)
+            vade_df = self.read_vade_report()
             
             if not vade_df.empty:
                 company_name = vade_df['Ad'].iloc[0]
                 payment_condition = vade_df['ÖdemeKoşul'].iloc[0] if 'ÖdemeKoşul' in vade_df.columns else None
                 # Try different variations of "bt sapma" column name
                 deviation = None
-                for col_name in ['BT Sapma', 'bt sapma', 'Bt Sapma', 'bt_sapma', 'Bt_Sapma', 'BT_SAPMA']:
+                for col_name in DEVIATION_COLUMNS:
                     if col_name in vade_df.columns:
                         deviation = vade_df[col_name].iloc[0]
                         print(f"Found deviation column '{col_name}': {deviation}")
@@ -129,17 +208,13 @@ class FinancialAnalyzer:
         Calculate average collection period using (Receivables/Sales) x Number of days
         """
         try:
-            vade_df = pd.read_excel(self.vade_file_path)
-            balance_df = pd.read_excel(self.balance_file_path)
+            vade_df = self.read_vade_report()
+            balance_df = self.read_balance_statement()
             
-            # Get receivables from balance sheet
-            receivables = None
             sales_amount = None
             
-            # Extract receivables (Cari Riski)
-            for i, row in balance_df.iterrows():
-                if 'Cari Riski' in str(row['Alan']):
-                    receivables = self.clean_currency_value(row['Değer'])
+            # Get receivables (Cari Riski) from balance sheet
+            receivables = self.get_balance_index(balance_df).get('current_risk')
             
             # Extract sales data from vade report
             if not vade_df.empty:
@@ -166,29 +241,14 @@ class FinancialAnalyzer:
         Determine credit limit compliance and payment method
         """
         try:
-            balance_df = pd.read_excel(self.balance_file_path)
-            # Initialize variables
-            credit_limit = None
-            current_risk = None
-            check_risk = None
-            promissory_note_risk = None
+            balance_df = self.read_balance_statement()
             
             # Extract relevant values
-            for i, row in balance_df.iterrows():
-                alan = str(row['Alan'])
-                deger = str(row['Değer'])
-                
-                if 'Cari Limiti' in alan:
-                    credit_limit = self.clean_currency_value(deger)
-                
-                elif 'Cari Riski' in alan:
-                    current_risk = self.clean_currency_value(deger)
-                
-                elif 'Kendi Çek Riski' in alan:
-                    check_risk = self.clean_currency_value(deger)
-                
-                elif 'Senet Riski' in alan:
-                    promissory_note_risk = self.clean_currency_value(deger)
+            balance_index = self.get_balance_index(balance_df)
+            credit_limit = balance_index.get('credit_limit')
+            current_risk = balance_index.get('current_risk')
+            check_risk = balance_index.get('check_risk')
+            promissory_note_risk = balance_index.get('promissory_note_risk')
             
             # Determine compliance
             compliance = "NO"
@@ -221,6 +281,118 @@ class FinancialAnalyzer:
             print(f"Error determining credit limit compliance: {e}")
             return None
     
+    def generate_all_customers_financial_records(self):
+        """
+        Batch mode: vadeye_uyum, ortalama_tahsilat_suresi_gun and kredi_limit_uyumu for every
+        customer in the vade report, computed with vectorized pandas operations in a single pass.
+        Balance rows are matched to customers via a customer column (BALANCE_CUSTOMER_COLUMN env
+        or one of BALANCE_CUSTOMER_COLUMNS), compared by normalized company name.
+        Returns one enriched record per customer
+        """
+        vade_df = self.read_vade_report()
+        balance_df = self.read_balance_statement()
+        
+        customers = vade_df[vade_df['Ad'].notna()].drop_duplicates(subset='Ad', keep='first')
+        if customers.empty:
+            return []
+        customers = customers.reset_index(drop=True)
+        keys = self._customer_keys(customers['Ad'])
+        
+        # Payment compliance: 100 - ((BT Sapma - ÖdemeKoşul) / ÖdemeKoşul) * 100, minimum 0
+        payment_condition = self._numeric_column(customers, ['ÖdemeKoşul'])
+        deviation = self._numeric_column(customers, DEVIATION_COLUMNS)
+        has_compliance = payment_condition.notna() & (payment_condition != 0) & deviation.notna()
+        compliance = (100 - ((deviation - payment_condition) / payment_condition) * 100).clip(lower=0).round(2)
+        
+        # Balance sheet fields per customer
+        balance = self._balance_by_customer(balance_df, keys)
+        credit_limit = balance['credit_limit']
+        current_risk = balance['current_risk']
+        check_risk = balance['check_risk']
+        promissory_note_risk = balance['promissory_note_risk']
+        
+        # Collection period: (Receivables / Sales) x 365
+        if 'Toplam FatFatOrtVade' in customers.columns:
+            sales_amount = pd.Series(self.clean_currency_values(customers['Toplam FatFatOrtVade']))
+        else:
+            sales_amount = pd.Series(np.nan, index=customers.index)
+        has_period = current_risk.notna() & (sales_amount > 0)
+        collection_period = ((current_risk / sales_amount) * 365).round(2)
+        
+        # Credit limit compliance and payment method
+        has_limit = credit_limit.notna() & (credit_limit != 0)
+        credit_compliance = np.where(has_limit & current_risk.notna() & (current_risk <= credit_limit), "YES", "NO")
+        payment_method = np.select([check_risk > 0, promissory_note_risk > 0], ["çek", "senet"], default="")
+        
+        columns = zip(
+            customers['Ad'].tolist(), has_compliance.tolist(), compliance.tolist(),
+            has_period.tolist(), current_risk.tolist(), sales_amount.tolist(), collection_period.tolist(),
+            balance['found'].tolist(), credit_compliance.tolist(), credit_limit.tolist(),
+            check_risk.tolist(), payment_method.tolist(),
+        )
+        
+        records = []
+        for (name, compliant_known, compliance_pct, period_known, risk, sales, period,
+             found, limit_ok, limit, cheque, method) in columns:
+            record = {"musteri_adi": name}
+            if compliant_known:
+                record["vadeye_uyum"] = compliance_pct
+            if period_known:
+                record["alacaklar_tutari"] = risk
+                record["satis_tutari"] = sales
+                record["ortalama_tahsilat_suresi_gun"] = period
+            if found:
+                record["kredi_limit_uyumu"] = limit_ok
+                record["kredi_limiti"] = None if pd.isna(limit) else limit
+                record["mevcut_risk"] = None if pd.isna(risk) else risk
+                record["odeme_yontemi"] = method or None
+                if method == "çek":
+                    record["cek_riski"] = cheque
+            records.append(record)
+        
+        return records
+    
+    @staticmethod
+    def _customer_keys(names):
+        """Normalized company names (normalization runs once per distinct name)"""
+        unique_names = pd.unique(names.astype(str))
+        mapping = {name: normalize_company_name(name) for name in unique_names}
+        return names.astype(str).map(mapping).reset_index(drop=True)
+    
+    @staticmethod
+    def _numeric_column(df, candidates):
+        """First existing candidate column as numbers (NaN when missing)"""
+        for col_name in candidates:
+            if col_name in df.columns:
+                return pd.to_numeric(df[col_name], errors='coerce').reset_index(drop=True)
+        return pd.Series(np.nan, index=range(len(df)))
+    
+    def _balance_by_customer(self, balance_df, keys):
+        """Balance fields aligned to the given customer keys, plus a 'found' flag"""
+        fields = list(BALANCE_LABELS.keys())
+        empty = pd.DataFrame(np.nan, index=range(len(keys)), columns=fields)
+        
+        customer_column = os.getenv('BALANCE_CUSTOMER_COLUMN')
+        if not customer_column:
+            customer_column = next((c for c in BALANCE_CUSTOMER_COLUMNS if c in balance_df.columns), None)
+        
+        if customer_column not in balance_df.columns:
+            if len(keys) == 1:
+                # Single-customer statement: same as the non-batch analysis
+                index = self.get_balance_index(balance_df)
+                row = pd.DataFrame([{field: index.get(field) for field in fields}], dtype=float)
+                row['found'] = True
+                return row
+            print("Warning: Balance statement has no customer column - credit fields skipped in batch mode")
+            empty['found'] = False
+            return empty
+        
+        keyed_df = balance_df.assign(_customer_key=self._customer_keys(balance_df[customer_column]).to_numpy())
+        wide = BalanceSheetIndex(keyed_df, self.clean_currency_values, customer_column='_customer_key').to_wide()
+        aligned = wide.reindex(keys.to_numpy()).reset_index(drop=True)
+        aligned['found'] = keys.isin(wide.index).to_numpy()
+        return aligned
+    
     def load_existing_sales_data(self):
         """
         Load existing sales analysis data
@@ -268,12 +440,27 @@ class FinancialAnalyzer:
         
         return financial_analysis
     
-def main():
+def main(argv=None):
     """
     Main function to run the financial analysis
     """
+    parser = argparse.ArgumentParser(description="Norm Holding financial analysis")
+    parser.add_argument("--all-customers", action="store_true",
+                        help="Analyze every customer in the workbooks in one pass (batch mode)")
+    parser.add_argument("--output", help="Batch mode output JSON (default: DATAS_BASE/Finansal_Analiz_Tum_Musteriler.json)")
+    args = parser.parse_args(argv)
+    
     analyzer = FinancialAnalyzer()
     
+    if args.all_customers:
+        print("Starting batch financial analysis for all customers...")
+        records = analyzer.generate_all_customers_financial_records()
+        output_file = args.output or analyzer.batch_output_path
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False, indent=2)
+        print(f"Batch financial analysis completed: {len(records)} customers -> {output_file}")
+        return records
+    
     print("Starting comprehensive financial analysis...")
     
     # Generate comprehensive analysis
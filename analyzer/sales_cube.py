@@ -0,0 +1,248 @@
+"""
+Malzeme × ay satış küpü
+Musteri_Ciro_Raporu.xlsx (hedef) ve mevcut tüm "Gerçekleşen" çalışma kitapları bir kez okunur,
+uzun formatta (kaynak, malzeme, ay, deger) tek bir sütunsal dosyaya (Parquet, pickle yedeği) yazılır.
+Ay, çeyrek ve yılbaşından bugüne (YTD) karşılaştırmaları bellekten cevaplanır.
+
+Küp, kaynak dosyaların mtime + boyut imzası değişmedikçe yeniden oluşturulmaz.
+
+Kullanım:
+    python -m analyzer.sales_cube --month Ağustos
+    python -m analyzer.sales_cube --quarter 3
+    python -m analyzer.sales_cube --ytd [--through Ağustos] [--output ytd.json]
+
+Ortam değişkenleri: DATAS_BASE, SALES_CUBE_PATH
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+from dotenv import load_dotenv
+
+# .env dosyasını yükle
+load_dotenv()
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analyzer.sales_performance import (
+    GERCEKLESEN_FILE_TEMPLATE,
+    compare_material_series,
+    create_monthly_sales_by_material_dataframe,
+    load_real_sales_data,
+)
+
+MONTHS = ["Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran",
+          "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
+
+HEDEF_FILE = "Musteri_Ciro_Raporu.xlsx"
+CUBE_COLUMNS = ['kaynak', 'malzeme', 'ay', 'deger']
+
+
+def _datas_base():
+    return os.getenv('DATAS_BASE', r"c:\Users\acer\Desktop\NORM HOLDING\datasforfinalblock")
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def source_signature(datas_base):
+    """Hedef dosyası + mevcut Gerçekleşen dosyaları -> {dosya adı: mtime-boyut}"""
+    names = [HEDEF_FILE] + [GERCEKLESEN_FILE_TEMPLATE.format(month_name=month) for month in MONTHS]
+    signature = {}
+    for name in names:
+        path = os.path.join(datas_base, name)
+        if os.path.exists(path):
+            signature[name] = _file_signature(path)
+    return signature
+
+
+class SalesCube:
+    """Hedef ve gerçekleşen cirolarını malzeme × ay olarak tutan bellek içi küp"""
+
+    def __init__(self, frame, year=2025):
+        """
+        Args:
+            frame (pandas.DataFrame): Uzun format küp (kaynak: 'hedef'/'gerceklesen', malzeme, ay, deger)
+            year (int): Yıl
+        """
+        self.frame = frame
+        self.year = year
+        gerceklesen_months = set(frame.loc[frame['kaynak'] == 'gerceklesen', 'ay'])
+        # Gerçekleşen çalışma kitabı bulunan aylar, takvim sırasıyla
+        self.available_months = [month for month in MONTHS if month in gerceklesen_months]
+
+    @classmethod
+    def build(cls, datas_base=None, year=2025):
+        """Kaynak çalışma kitaplarını okuyup küpü oluşturur (hedef dosyasında yılın kolonları yoksa ValueError)"""
+        datas_base = datas_base or _datas_base()
+        hedef_df = create_monthly_sales_by_material_dataframe(datas_base, year)
+        parts = [cls._long_part('hedef', hedef_df[month], month) for month in MONTHS if month in hedef_df.columns]
+
+        for month in MONTHS:
+            if os.path.exists(os.path.join(datas_base, GERCEKLESEN_FILE_TEMPLATE.format(month_name=month))):
+                gerceklesen_df = load_real_sales_data(month, year, datas_base)
+                parts.append(cls._long_part('gerceklesen', gerceklesen_df.iloc[:, 0], month))
+
+        frame = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=CUBE_COLUMNS)
+        return cls(frame, year)
+
+    @staticmethod
+    def _long_part(kaynak, series, month):
+        return pd.DataFrame({
+            'kaynak': kaynak,
+            'malzeme': series.index.astype(str),
+            'ay': month,
+            'deger': pd.to_numeric(series, errors='coerce').to_numpy(dtype=float),
+        })
+
+    @classmethod
+    def load(cls, datas_base=None, year=2025, cube_path=None, rebuild=False):
+        """
+        Kayıtlı küpü yükler; kaynak imzası değiştiyse (veya rebuild=True) yeniden oluşturup kaydeder
+        """
+        datas_base = datas_base or _datas_base()
+        cube_path = Path(cube_path or os.getenv('SALES_CUBE_PATH') or Path(datas_base) / f"Satis_Kupu_{year}.parquet")
+        signature = source_signature(datas_base)
+
+        if not rebuild:
+            frame = cls._read_frame(cube_path)
+            if frame is not None and frame.attrs.get('kaynaklar') == signature and frame.attrs.get('yil') == year:
+                print(f"[CACHE] Satış küpü yüklendi: {cube_path}")
+                return cls(frame, year)
+
+        cube = cls.build(datas_base, year)
+        cube.frame.attrs.update({'kaynaklar': signature, 'yil': year})
+        cube.save(cube_path)
+        return cube
+
+    @staticmethod
+    def _read_frame(cube_path):
+        pickle_path = cube_path.with_suffix('.pkl')
+        try:
+            if cube_path.exists():
+                return pd.read_parquet(cube_path)
+            if pickle_path.exists():
+                return pd.read_pickle(pickle_path)
+        except Exception as e:
+            print(f"[WARNING] Satış küpü okunamadı, yeniden oluşturulacak: {e}")
+        return None
+
+    def save(self, cube_path):
+        """Küpü atomik olarak yazar (Parquet, pyarrow yoksa pickle)"""
+        cube_path = Path(cube_path)
+        try:
+            cube_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=cube_path.parent, suffix='.tmp')
+            os.close(fd)
+            try:
+                self.frame.to_parquet(temp_path, index=False)
+                os.replace(temp_path, cube_path)
+            except Exception:
+                self.frame.to_pickle(temp_path)
+                os.replace(temp_path, cube_path.with_suffix('.pkl'))
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            print(f"[SUCCESS] Satış küpü kaydedildi: {cube_path}")
+        except OSError as e:
+            print(f"[WARNING] Satış küpü kaydedilemedi: {e}")
+
+    def _period_series(self, kaynak, months):
+        rows = self.frame[(self.frame['kaynak'] == kaynak) & self.frame['ay'].isin(months)]
+        # İlk görülme sırası korunur; tek ayda NaN değerler olduğu gibi kalır
+        return rows.groupby('malzeme', sort=False)['deger'].sum(min_count=1)
+
+    def compare(self, months, label=None):
+        """
+        Verilen aylar için hedef vs gerçekleşen karşılaştırması
+        Gerçekleşen verisi olmayan aylar dönemden çıkarılır (hedefleri de toplanmaz)
+
+        Returns:
+            dict: compare_hedef_vs_gerceklestirilen ile aynı şekil + 'aylar'
+        """
+        unknown = [month for month in months if month not in MONTHS]
+        if unknown:
+            raise ValueError(f"Geçersiz ay adı: {', '.join(unknown)}")
+
+        period = [month for month in months if month in self.available_months]
+        if not period:
+            raise FileNotFoundError(f"Dönem için gerçekleşen veri yok: {', '.join(months)}")
+
+        hedef = self._period_series('hedef', period)
+        gerceklesen = self._period_series('gerceklesen', period)
+        return {
+            'ay': label or '-'.join(dict.fromkeys([period[0], period[-1]])),
+            'yil': self.year,
+            'aylar': period,
+            **compare_material_series(hedef, gerceklesen)
+        }
+
+    def month(self, month_name):
+        """Tek ay karşılaştırması"""
+        return self.compare([month_name], label=month_name)
+
+    def quarter(self, quarter):
+        """Çeyrek karşılaştırması (1-4)"""
+        if quarter not in (1, 2, 3, 4):
+            raise ValueError(f"Geçersiz çeyrek: {quarter}")
+        return self.compare(MONTHS[(quarter - 1) * 3:quarter * 3], label=f"Q{quarter}")
+
+    def ytd(self, through=None):
+        """Yılbaşından verilen aya (varsayılan: son gerçekleşen ay) kadar karşılaştırma"""
+        if through is None:
+            if not self.available_months:
+                raise FileNotFoundError("Gerçekleşen veri bulunamadı")
+            through = self.available_months[-1]
+        if through not in MONTHS:
+            raise ValueError(f"Geçersiz ay adı: {through}")
+        return self.compare(MONTHS[:MONTHS.index(through) + 1], label=f"YTD-{through}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Malzeme × ay satış küpü")
+    period = parser.add_mutually_exclusive_group(required=True)
+    period.add_argument("--month", help="Ay adı (örn: Ağustos)")
+    period.add_argument("--quarter", type=int, help="Çeyrek (1-4)")
+    period.add_argument("--ytd", action="store_true", help="Yılbaşından bugüne")
+    parser.add_argument("--through", help="YTD için son ay (varsayılan: son gerçekleşen ay)")
+    parser.add_argument("--year", type=int, default=2025, help="Yıl")
+    parser.add_argument("--rebuild", action="store_true", help="Kayıtlı küpü yok sayıp yeniden oluştur")
+    parser.add_argument("--output", help="Sonucun yazılacağı JSON dosyası")
+    args = parser.parse_args(argv)
+
+    cube = SalesCube.load(year=args.year, rebuild=args.rebuild)
+    print(f"[INFO] Gerçekleşen verisi olan aylar: {', '.join(cube.available_months) or '-'}")
+
+    try:
+        if args.month:
+            result = cube.month(args.month)
+        elif args.quarter:
+            result = cube.quarter(args.quarter)
+        else:
+            result = cube.ytd(args.through)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    ozet = result['genel_ozet']
+    print(f"[RESULT] {result['ay']} {result['yil']} ({', '.join(result['aylar'])})")
+    print(f"  - Toplam Hedef: {ozet['toplam_hedef']:,.2f}")
+    print(f"  - Toplam Gerçekleşen: {ozet['toplam_gerceklesen']:,.2f}")
+    print(f"  - Fark: {ozet['toplam_fark']:,.2f}")
+    print(f"  - Büyüme Oranı: {ozet['genel_buyume_orani']:.2f}%")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"[SUCCESS] JSON kaydedildi: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
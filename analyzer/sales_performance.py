@@ -1,27 +1,52 @@
 import pandas as pd
 import os
 import numpy as np
+import sys
 import json
+import argparse
 from pathlib import Path
 from dotenv import load_dotenv
 
 # .env dosyasını yükle
 load_dotenv()
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analyzer.workbook_cache import get_workbook_cache
 
-def create_monthly_sales_by_material_dataframe():
+# Aynı süreçte her çalışma kitabı bir kez ayrıştırılır (hedef dosyası her çağrıda yeniden okunmaz)
+_workbooks = get_workbook_cache()
+
+GERCEKLESEN_FILE_TEMPLATE = "Şirinler Bağlantı El. {month_name} Gerçekleşen .xlsx"
+
+# Hedef ve gerçekleşen çalışma kitaplarından okunan kolonlar
+SALES_COLUMNS = ['Malzeme Tipi', '*Ciro*']
+
+
+def hedef_column_suffix(year=2025):
+    """Hedef dosyasındaki ay kolonlarının yıl eki: 'Ağustos 2025 Ciro' -> ' 2025 Ciro'"""
+    return f" {year} Ciro"
+
+
+def create_monthly_sales_by_material_dataframe(datas_base=None, year=2025):
     """
     Musteri_Ciro_Raporu.xlsx dosyasından ay ay ciroları malzeme tipine göre ayıran DataFrame döndürür
     
+    Args:
+        datas_base (str): Veri klasörü (varsayılan: env DATAS_BASE)
+        year (int): Hedef yılı - sadece '<Ay> <yıl> Ciro' kolonları alınır
+    
     Returns:
-        pandas.DataFrame: Malzeme tiplerine göre aylık ciro verileri (HEDEF)
+        pandas.DataFrame: Malzeme tiplerine göre aylık ciro verileri (HEDEF), kolonlar ay adları
+    
+    Raises:
+        ValueError: Dosyada verilen yıla ait ciro kolonu yoksa
     """
     # Excel dosyasının yolunu belirle
-    datas_base = os.getenv('DATAS_BASE', r"c:\Users\acer\Desktop\NORM HOLDING\datasforfinalblock")
+    datas_base = datas_base or os.getenv('DATAS_BASE', r"c:\Users\acer\Desktop\NORM HOLDING\datasforfinalblock")
     excel_path = os.path.join(datas_base, "Musteri_Ciro_Raporu.xlsx")
     
-    # Excel dosyasını oku
-    df = pd.read_excel(excel_path)
+    # Excel dosyasını oku (paylaşılan önbellek - DataFrame yerinde değiştirilmez)
+    df = _workbooks.read_excel(excel_path, columns=SALES_COLUMNS)
     
     # 'Total' satırını kaldır
     df_filtered = df[df['Malzeme Tipi'] != 'Total'].copy()
@@ -29,30 +54,34 @@ def create_monthly_sales_by_material_dataframe():
     # Malzeme Tipi sütunundaki başlangıçtaki noktaları temizle
     df_filtered['Malzeme Tipi'] = df_filtered['Malzeme Tipi'].str.lstrip('.')
     
-    # Ay sütunlarını belirle
-    month_columns = [col for col in df.columns if 'Ciro' in col]
+    # Ay sütunlarını belirle (sadece istenen yıl)
+    suffix = hedef_column_suffix(year)
+    month_columns = [col for col in df.columns if str(col).endswith(suffix)]
+    if not month_columns:
+        raise ValueError(f"{excel_path} içinde {year} yılına ait hedef kolonu yok (beklenen: '<Ay>{suffix}')")
     
     # DataFrame'i malzeme tipine göre şekillendir
     result_df = df_filtered.set_index('Malzeme Tipi')[month_columns]
     
     # Sütun isimlerini temizle
-    result_df.columns = [col.replace(' 2025 Ciro', '') for col in result_df.columns]
+    result_df.columns = [col[:-len(suffix)] for col in month_columns]
     
     return result_df
 
 
-def get_hedef_dataframe():
+def get_hedef_dataframe(year=2025):
     """Hedef satış miktarları DataFrame'i döndürür"""
-    return create_monthly_sales_by_material_dataframe()
+    return create_monthly_sales_by_material_dataframe(year=year)
 
 
-def load_real_sales_data(month_name="Ağustos", year=2025):
+def load_real_sales_data(month_name="Ağustos", year=2025, datas_base=None):
     """
     Gerçek satış verilerini aylık Excel dosyalarından yükler
     
     Args:
         month_name (str): Ay adı (örn: "Ağustos")
         year (int): Yıl
+        datas_base (str): Veri klasörü (varsayılan: env DATAS_BASE)
     
     Returns:
         pandas.DataFrame: Gerçekleşen satış verileri (malzeme tipi index'li)
@@ -62,15 +91,15 @@ def load_real_sales_data(month_name="Ağustos", year=2025):
         Exception: Veri okuma hatası durumunda
     """
     # Excel dosya yolunu dinamik oluştur
-    datas_base = os.getenv('DATAS_BASE', r"c:\Users\acer\Desktop\NORM HOLDING\datasforfinalblock")
-    excel_path = os.path.join(datas_base, f"Şirinler Bağlantı El. {month_name} Gerçekleşen .xlsx")
+    datas_base = datas_base or os.getenv('DATAS_BASE', r"c:\Users\acer\Desktop\NORM HOLDING\datasforfinalblock")
+    excel_path = os.path.join(datas_base, GERCEKLESEN_FILE_TEMPLATE.format(month_name=month_name))
     
     if not os.path.exists(excel_path):
         raise FileNotFoundError(f"Gerçek veri dosyası bulunamadı: {excel_path}")
     
     try:
-        # Excel dosyasını oku
-        df = pd.read_excel(excel_path)
+        # Excel dosyasını oku (önbellekteki DataFrame paylaşıldığı için kopya üzerinde çalışılır)
+        df = _workbooks.read_excel(excel_path, columns=SALES_COLUMNS).copy()
         
         # Malzeme Tipi sütunundaki başlangıçtaki noktaları temizle
         df['Malzeme Tipi'] = df['Malzeme Tipi'].str.lstrip('.')
@@ -100,7 +129,7 @@ def compare_hedef_vs_gerceklestirilen(month_name="Ağustos", year=2025):
     Returns:
         dict: Basit karşılaştırma sonuçları
     """
-    hedef_df = get_hedef_dataframe()
+    hedef_df = get_hedef_dataframe(year)
     gerceklestirilen_df = load_real_sales_data(month_name, year)
     
     # Sadece ay sütununu al (hedef DataFrame'den belirtilen ay)
@@ -110,36 +139,54 @@ def compare_hedef_vs_gerceklestirilen(month_name="Ağustos", year=2025):
     # Gerçekleşen verideki ay sütununu al 
     gerceklesen_ay = gerceklestirilen_df.iloc[:, 0]  # İlk sütun
     
-    # Malzeme bazında karşılaştırma
-    malzeme_analizi = {}
-    for malzeme in gerceklesen_ay.index:
-        if malzeme in hedef_ay.index:
-            hedef_val = float(hedef_ay.loc[malzeme])
-            gercek_val = float(gerceklesen_ay.loc[malzeme])
-            fark = gercek_val - hedef_val
-            buyume_orani = (fark / hedef_val * 100) if hedef_val != 0 else 0
-            
-            malzeme_analizi[malzeme] = {
-                'hedef': hedef_val,
-                'gerceklesen': gercek_val,
-                'fark': fark,
-                'buyume_orani': round(buyume_orani, 2)
-            }
+    return {
+        'ay': month_name,
+        'yil': year,
+        **compare_material_series(hedef_ay, gerceklesen_ay)
+    }
+
+
+def compare_material_series(hedef_ay, gerceklesen_ay):
+    """
+    Malzeme index'li hedef ve gerçekleşen serilerini index hizalı join ile karşılaştırır
+    
+    Args:
+        hedef_ay (pandas.Series): Malzeme bazında hedef
+        gerceklesen_ay (pandas.Series): Malzeme bazında gerçekleşen
+    
+    Returns:
+        dict: genel_ozet, malzeme_analizi (gerçekleşen sırasıyla) ve eksik_malzemeler
+    """
+    # Hedefte de bulunan malzemeler - gerçekleşen sırası korunur
+    joined = gerceklesen_ay.rename('gerceklesen').to_frame().join(hedef_ay.rename('hedef'), how='inner')
+    hedef = joined['hedef'].astype(float)
+    gerceklesen = joined['gerceklesen'].astype(float)
+    fark = gerceklesen - hedef
+    buyume_orani = (fark / hedef * 100).where(hedef != 0, 0)
+    
+    # Sözlük şekli korunur; round() Python float'ları üzerinde (eski sonuçlarla birebir)
+    malzeme_analizi = {
+        malzeme: {
+            'hedef': hedef_val,
+            'gerceklesen': gercek_val,
+            'fark': fark_val,
+            'buyume_orani': round(buyume_val, 2) if hedef_val != 0 else 0
+        }
+        for malzeme, hedef_val, gercek_val, fark_val, buyume_val in zip(
+            joined.index.tolist(), hedef.tolist(), gerceklesen.tolist(), fark.tolist(), buyume_orani.tolist()
+        )
+    }
     
     # Genel toplam
-    toplam_hedef = sum([data['hedef'] for data in malzeme_analizi.values()])
-    toplam_gerceklesen = sum([data['gerceklesen'] for data in malzeme_analizi.values()])
+    toplam_hedef = float(hedef.sum(skipna=False))
+    toplam_gerceklesen = float(gerceklesen.sum(skipna=False))
     toplam_fark = toplam_gerceklesen - toplam_hedef
     genel_buyume = (toplam_fark / toplam_hedef * 100) if toplam_hedef != 0 else 0
     
-    # Eksik malzemeler
-    hedef_malzemeler = set(hedef_ay.index)
-    gercek_malzemeler = set(gerceklesen_ay.index)
-    eksik_malzemeler = list(hedef_malzemeler - gercek_malzemeler)
+    # Eksik malzemeler (hedefte olup gerçekleşende olmayanlar, hedef sırasıyla)
+    eksik_malzemeler = hedef_ay.index.difference(gerceklesen_ay.index, sort=False).tolist()
     
     return {
-        'ay': month_name,
-        'yil': year,
         'genel_ozet': {
             'toplam_hedef': toplam_hedef,
             'toplam_gerceklesen': toplam_gerceklesen,
@@ -220,7 +267,10 @@ def save_analysis_to_files(month_name="Ağustos", year=2025):
     print(f"[SUCCESS] Excel kaydedildi: {excel_path}")
 
 
-if __name__ == "__main__":
+def main(argv=None):
+    """Ağustos 2025 analizini çalıştırır ve sonuç dosyalarını kaydeder"""
+    argparse.ArgumentParser(description="Norm Holding basit satış analizi").parse_args(argv)
+    
     print("=== NORM HOLDING BASIT SATIŞ ANALİZİ ===")
     print()
     
@@ -254,7 +304,7 @@ if __name__ == "__main__":
     except (FileNotFoundError, Exception) as e:
         print(f"[ERROR] Gerçek veri yüklenemedi: {e}")
         print("Lütfen Excel dosyasının doğru konumda olduğundan emin olun.")
-        exit(1)
+        sys.exit(1)
     print()
     
     print("💾 DOSYALARI KAYDEDİYOR...")
@@ -266,3 +316,6 @@ if __name__ == "__main__":
     print("  - Excel: datasforfinalblock/Satis_Analizi_Detay.xlsx")
     print("  - JSON: datasforfinalblock/LLM_Input_Satis_Analizi.json")
 
+
+if __name__ == "__main__":
+    main()
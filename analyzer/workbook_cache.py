@@ -0,0 +1,120 @@
+"""
+Workbook cache for the analyzer modules
+Loads each Excel source once per instance and persists a columnar snapshot
+(Parquet, pickle fallback) keyed by file mtime + size, so reruns skip openpyxl parsing
+Cache misses are parsed with the fast ExcelReader (see excel_reader)
+
+Environment variables: WORKBOOK_CACHE (0 = memory only), WORKBOOK_CACHE_DIR
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from analyzer.excel_reader import ExcelReader, column_matcher
+
+DEFAULT_SNAPSHOT_DIR = Path(__file__).parent.parent / ".cache" / "workbooks"
+
+
+class WorkbookCache:
+    def __init__(self, snapshot_dir=None, persist=None, reader=None):
+        """
+        Args:
+            snapshot_dir: Snapshot folder (default: env WORKBOOK_CACHE_DIR or .cache/workbooks)
+            persist: Write/read on-disk snapshots (default: env WORKBOOK_CACHE != 0)
+            reader: ExcelReader used on cache misses (default: engine from env EXCEL_READER_ENGINE)
+        """
+        self.snapshot_dir = Path(snapshot_dir or os.getenv('WORKBOOK_CACHE_DIR', str(DEFAULT_SNAPSHOT_DIR)))
+        if persist is None:
+            persist = os.getenv('WORKBOOK_CACHE', '1').lower() not in ('0', 'false', 'no')
+        self.persist = persist
+        self.reader = reader or ExcelReader()
+        self._frames = {}
+
+    def read_excel(self, path, columns=None, **read_kwargs):
+        """
+        Drop-in replacement for pd.read_excel that parses each (file, version, options) once
+        columns: optional selection of names / fnmatch patterns; only those columns are kept
+        The returned DataFrame is shared between callers and must not be modified in place
+        """
+        stat = os.stat(path)
+        source_id = self._source_id(path, {**read_kwargs, 'columns': columns})
+        version = f"{stat.st_mtime_ns}-{stat.st_size}"
+        memory_key = (source_id, version)
+
+        df = self._frames.get(memory_key)
+        if df is not None:
+            return df
+
+        df = self._load_snapshot(source_id, version) if self.persist else None
+        if df is None:
+            df = self._parse(path, columns, read_kwargs)
+            if self.persist:
+                self._save_snapshot(source_id, version, df)
+
+        self._frames[memory_key] = df
+        return df
+
+    def _parse(self, path, columns, read_kwargs):
+        if set(read_kwargs) <= {'sheet_name'}:
+            return self.reader.read(path, columns, **read_kwargs)
+        # Other pd.read_excel options keep the plain pandas path
+        return pd.read_excel(path, usecols=column_matcher(columns), **read_kwargs)
+
+    @staticmethod
+    def _source_id(path, read_kwargs):
+        key_source = json.dumps([os.path.abspath(path), read_kwargs], sort_keys=True, default=str)
+        return hashlib.sha256(key_source.encode('utf-8')).hexdigest()[:24]
+
+    def _snapshot_paths(self, source_id, version):
+        base = self.snapshot_dir / f"{source_id}-{version}"
+        return base.with_suffix('.parquet'), base.with_suffix('.pkl')
+
+    def _load_snapshot(self, source_id, version):
+        parquet_path, pickle_path = self._snapshot_paths(source_id, version)
+        try:
+            if parquet_path.exists():
+                return pd.read_parquet(parquet_path)
+            if pickle_path.exists():
+                return pd.read_pickle(pickle_path)
+        except Exception as e:
+            print(f"Warning: Could not read workbook snapshot, re-parsing Excel: {e}")
+        return None
+
+    def _save_snapshot(self, source_id, version, df):
+        try:
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+            # Older snapshots of the same source are stale once the file changes
+            for stale in self.snapshot_dir.glob(f"{source_id}-*"):
+                stale.unlink(missing_ok=True)
+
+            parquet_path, pickle_path = self._snapshot_paths(source_id, version)
+            fd, temp_path = tempfile.mkstemp(dir=self.snapshot_dir, suffix='.tmp')
+            os.close(fd)
+            try:
+                # Parquet needs pyarrow and uniform column types (mixed object columns fail)
+                df.to_parquet(temp_path, index=True)
+                os.replace(temp_path, parquet_path)
+            except Exception:
+                df.to_pickle(temp_path)
+                os.replace(temp_path, pickle_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        except Exception as e:
+            print(f"Warning: Could not write workbook snapshot: {e}")
+
+
+_default_cache = None
+
+
+def get_workbook_cache():
+    """Shared cache instance - analyzers running in one interpreter parse each workbook once"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = WorkbookCache()
+    return _default_cache
@@ -0,0 +1,55 @@
+"""
+ExcelReader motorlarının sentetik aylık ciro dökümü üzerinde satır/sn karşılaştırması.
+
+Kullanım: python benchmarks/bench_excel_reader.py [--rows 50000] [--path dosya.xlsx]
+"""
+
+import sys
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from analyzer.excel_reader import ExcelReader, available_engines
+from analyzer.sales_performance import SALES_COLUMNS
+
+
+def make_workbook(path: str, rows: int, seed: int = 42):
+    """Malzeme Tipi + 12 aylık ciro + sales_performance'ın okumadığı açıklama kolonları"""
+    rng = np.random.default_rng(seed)
+    months = ["Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran",
+              "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
+    data = {'Malzeme Tipi': [f".MLZ-{i:06d}" for i in range(rows)]}
+    for month in months:
+        data[f"{month} 2025 Ciro"] = rng.uniform(0, 1e5, rows).round(2)
+    data['Açıklama'] = ["bağlantı elemanı"] * rows
+    data['Birim'] = rng.choice(["ADET", "KG", "KUTU"], rows)
+    pd.DataFrame(data).to_excel(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ExcelReader benchmark")
+    parser.add_argument("--rows", type=int, default=50000, help="Sentetik dökümdeki satır sayısı")
+    parser.add_argument("--path", help="Sentetik yerine ölçülecek .xlsx dosyası")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = args.path
+        if not path:
+            path = str(Path(temp_dir) / "ciro.xlsx")
+            make_workbook(path, args.rows)
+
+        reference = None
+        for engine in available_engines():
+            df = ExcelReader(engine=engine, report=True).read(path, columns=SALES_COLUMNS)
+            if reference is None:
+                reference = df
+            elif not df.equals(reference):
+                print(f"[WARNING] {engine} sonucu diğer motorlardan farklı")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+parse_notlar_kv için sentetik korpus üzerinde belge başına ayrıştırma süresi.
+
+Kullanım: python benchmarks/bench_notlar_parser.py [--docs 2000] [--repeat 5]
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from extractor.notlar_parser import parse_notlar_kv, declared_keys
+
+FIELD_LINES = [
+    "2024 Cirosu Kümülatif: {amount} €",
+    "2025 cirosu kümülatif: {amount} €",
+    "Q2 Hedef: {amount} €",
+    "Görüşülen Kişi Adı: {name} Pozisyonu: {position} Sunulan Ürün Grupları / Kampanyalar: {text}",
+    "Firmada Karşılaşılan Rakip Firma Şartları: {text}",
+    "Sipariş Alındı mı? {answer} Yaklaşık Sipariş Tutarı: {amount} TL",
+    "SİPARİŞ ALINDI MI? YAKLAŞIK SİPARİŞ TUTARI: {answer}",
+    "FİRMA HAKKINDA GENEL YORUM: {text}\n{text}",
+    "• {text}",
+    "MUTABAKAT DURUMU",
+]
+
+WORDS = ("bağlantı elemanı vida somun kampanya fiyat teslimat stok müşteri "
+         "talep rakip vade iskonto sipariş proje numune").split()
+
+
+def make_document(rng: random.Random) -> str:
+    """Alanların bir kısmı eksik/karışık sıralı rastgele notlar metni"""
+    lines = []
+    for template in FIELD_LINES:
+        if rng.random() < 0.15:
+            continue
+        lines.append(template.format(
+            amount=f"{rng.randint(1, 999)}.{rng.randint(0, 999):03d},{rng.randint(0, 99):02d}",
+            name=rng.choice(["Ahmet Yılmaz", "Ayşe Demir", "Mehmet Kaya"]),
+            position=rng.choice(["Satın Alma", "Genel Müdür", "Üretim Şefi"]),
+            answer=rng.choice(["Evet", "Hayır", "?", ""]),
+            text=" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 40))),
+        ))
+        # Serbest metin satırları
+        for _ in range(rng.randint(0, 3)):
+            lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 25))))
+    return "\n".join(lines)
+
+
+def bench(func, corpus, repeat: int) -> float:
+    """En iyi turun belge başına süresi (mikrosaniye)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for doc in corpus:
+            func(doc)
+        best = min(best, time.perf_counter() - start)
+    return best / len(corpus) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="notlar_parser benchmark")
+    parser.add_argument("--docs", type=int, default=2000, help="Korpus belge sayısı")
+    parser.add_argument("--repeat", type=int, default=5, help="Tekrar sayısı (en iyisi raporlanır)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [make_document(rng) for _ in range(args.docs)]
+    avg_len = sum(len(doc) for doc in corpus) / len(corpus)
+
+    print(f"Korpus: {len(corpus)} belge, ortalama {avg_len:.0f} karakter")
+    print(f"parse_notlar_kv : {bench(parse_notlar_kv, corpus, args.repeat):8.1f} µs/belge")
+    print(f"declared_keys   : {bench(declared_keys, corpus, args.repeat):8.1f} µs/belge")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+compare_material_series için sentetik malzeme kataloğu üzerinde süre ölçümü.
+
+Kullanım: python benchmarks/bench_sales_performance.py [--materials 50000] [--repeat 5]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from analyzer.sales_performance import compare_material_series
+
+
+def make_catalog(materials: int, seed: int = 42):
+    """Hedef ve gerçekleşen serileri: gerçekleşende %5 eksik malzeme, farklı sıra, sıfır hedefler"""
+    rng = np.random.default_rng(seed)
+    names = pd.Index([f"MLZ-{i:06d}" for i in range(materials)], name='Malzeme Tipi')
+    hedef = pd.Series(rng.uniform(0, 1e6, materials).round(2), index=names)
+    hedef[rng.random(materials) < 0.01] = 0.0
+
+    present = names[rng.random(materials) >= 0.05]
+    gerceklesen = pd.Series(rng.uniform(0, 1.2e6, len(present)).round(2), index=present)
+    gerceklesen = gerceklesen.sample(frac=1.0, random_state=seed)
+    return hedef, gerceklesen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="sales_performance benchmark")
+    parser.add_argument("--materials", type=int, default=50000, help="Katalogdaki malzeme sayısı")
+    parser.add_argument("--repeat", type=int, default=5, help="Tekrar sayısı (en iyisi raporlanır)")
+    args = parser.parse_args()
+
+    hedef, gerceklesen = make_catalog(args.materials)
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        result = compare_material_series(hedef, gerceklesen)
+        best = min(best, time.perf_counter() - start)
+
+    print(f"Katalog: {len(hedef)} hedef, {len(gerceklesen)} gerçekleşen malzeme")
+    print(f"compare_material_series: {best * 1000:.1f} ms "
+          f"({len(result['malzeme_analizi'])} karşılaştırma, {len(result['eksik_malzemeler'])} eksik)")
+
+
+if __name__ == "__main__":
+    main()
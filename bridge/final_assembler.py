@@ -21,6 +21,7 @@ import json
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.company_name_utils import normalize_company_name
+from utils.kpi_index import get_kpi_index
 import time
 import glob
 import re
@@ -90,6 +91,7 @@ class FinalAssembler:
     def find_latest_kpi_file(self, company_name: str = None, month: int = None, year: int = None) -> Optional[str]:
         """
         En güncel KPI JSON dosyasını şirket adına göre bul
+        Önce KPI indeksi sorgulanır (utils/kpi_index.py); kayıt yoksa veya indeks bayatsa klasör taranır
         
         Args:
             company_name: Şirket adı (ZORUNLU)
@@ -123,9 +125,22 @@ class FinalAssembler:
             print(f"[WARNING] Reports dizini bulunamadı: {base_reports_dir}")
             return None
         
-        # Şirket klasörünü fuzzy matching ile bul
         safe_company_name = self._sanitize_company_name(company_name)
         
+        # Önce KPI indeksi (dizin taraması yok); kayıt yoksa veya indeks bayatsa klasör taranır
+        kpi_index = get_kpi_index(base_reports_dir)
+        if kpi_index:
+            try:
+                indexed_file = kpi_index.latest(safe_company_name, year, month)
+            except Exception as e:
+                print(f"[WARNING] KPI indeksi sorgulanamadı, klasör taranacak: {e}")
+                indexed_file = None
+            if indexed_file:
+                print(f"[DEBUG] Şirket '{company_name}' için seçilen KPI dosyası (indeks): {indexed_file}")
+                return indexed_file
+        
+        # Şirket klasörünü fuzzy matching ile bul
+        
         # Mevcut klasörleri listele
         try:
             available_folders = [d for d in os.listdir(base_reports_dir) 
@@ -161,6 +176,13 @@ class FinalAssembler:
         
         print(f"[DEBUG] Şirket '{company_name}' klasöründe {len(kpi_files)} KPI dosyası bulundu")
         
+        # Taranan klasörü indekse yaz: sonraki aramalar (diğer aylar dahil) taramasız cevaplanır
+        if kpi_index:
+            try:
+                kpi_index.index_files(kpi_files, alias=self._sanitize_company_name(company_name))
+            except Exception as e:
+                print(f"[WARNING] KPI indeksi güncellenemedi: {e}")
+        
         # Ay filtresi uygula (zorunlu)
         month_names = {
             1: "ocak", 2: "subat", 3: "mart", 4: "nisan", 5: "mayis", 6: "haziran",
@@ -9,16 +9,18 @@ Workflow (run_complete_bridge_workflow):
 """
 
 import os
+import sys
 import json
-import time
 from typing import Dict, List, Any
-import google.generativeai as genai
 from datetime import datetime
 from dotenv import load_dotenv
 
 # .env dosyasını yükle
 load_dotenv()
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from extractor.llm_client import get_llm_client
+
 class KPIBridge:
     """Finansal analiz ve KPI verilerini birleştiren köprü sınıfı"""
     
@@ -156,8 +158,7 @@ class KPIBridge:
                 print("[WARNING] GEMINI_API_KEY bulunamadı")
                 return self._get_empty_result()
                 
-            genai.configure(api_key=api_key)
-            model = genai.GenerativeModel('gemini-2.0-flash-exp')
+            client = get_llm_client('gemini-2.0-flash-exp')
             
             # Müşterinin aldığı ürünleri JSON formatında hazırla
             customer_materials_json = json.dumps(self.customer_materials, ensure_ascii=False)
@@ -190,11 +191,8 @@ class KPIBridge:
             }}
             """
             
-            # Rate limiting
-            time.sleep(2)
-            
-            response = model.generate_content(prompt)
-            result_text = response.text.strip()
+            # Rate limiting ve yanıt önbelleği paylaşılan istemcide
+            result_text = client.generate_sync(prompt).strip()
             
             # JSON'u parse et
             if '```json' in result_text:
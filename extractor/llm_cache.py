@@ -0,0 +1,130 @@
+"""
+LLM yanıtları için kalıcı SQLite önbelleği.
+
+Anahtar: model adı + normalize edilmiş prompt (+ üretim parametreleri) özeti.
+Kayıtlar TTL sonunda geçersiz olur; kayıt sayısı sınırı aşılınca en uzun süredir
+erişilmeyenler silinir. Pipeline tekrar çalıştırıldığında aynı prompt'lar için
+LLM çağrısı yapılmaz.
+
+Ortam değişkenleri: LLM_CACHE, LLM_CACHE_PATH, LLM_CACHE_TTL_HOURS, LLM_CACHE_MAX_ENTRIES
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / ".cache" / "llm_responses.sqlite"
+DEFAULT_TTL_HOURS = 24 * 30
+DEFAULT_MAX_ENTRIES = 10000
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Girinti ve boşluk farklarını yok sayar (satır başı/sonu boşlukları, çoklu boşluklar)"""
+    lines = [re.sub(r"[ \t]+", " ", line).strip() for line in (prompt or "").splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+class LLMResponseCache:
+    """Model + prompt özetine göre yanıt saklayan SQLite önbelleği"""
+
+    def __init__(self, db_path: str = None, ttl_seconds: float = None, max_entries: int = None):
+        """
+        Args:
+            db_path: SQLite dosyası (varsayılan: env LLM_CACHE_PATH veya .cache/llm_responses.sqlite)
+            ttl_seconds: Kayıt geçerlilik süresi (varsayılan: env LLM_CACHE_TTL_HOURS, 30 gün)
+            max_entries: Maksimum kayıt sayısı (varsayılan: env LLM_CACHE_MAX_ENTRIES, 10000)
+        """
+        self.db_path = Path(db_path or os.getenv("LLM_CACHE_PATH", str(DEFAULT_CACHE_PATH)))
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("LLM_CACHE_TTL_HOURS", DEFAULT_TTL_HOURS)) * 3600
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries or int(os.getenv("LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                       key TEXT PRIMARY KEY,
+                       model TEXT NOT NULL,
+                       response TEXT NOT NULL,
+                       created_at REAL NOT NULL,
+                       last_access REAL NOT NULL
+                   )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # Her çağrıda ayrı bağlantı: thread'ler ve process'ler arasında güvenli
+        return sqlite3.connect(str(self.db_path), timeout=30)
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str, params: dict = None) -> str:
+        """Model adı + normalize prompt + üretim parametrelerinden anahtar üretir"""
+        params_json = json.dumps(params or {}, sort_keys=True, default=str)
+        key_source = f"{model_name}\x00{normalize_prompt(prompt)}\x00{params_json}"
+        return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Geçerli kayıt varsa yanıtı döndürür ve erişim zamanını günceller
+        (veritabanı hatası - kilit, bozuk dosya - ıskalama sayılır)"""
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                response, created_at = row
+                if now - created_at > self.ttl_seconds:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    return None
+                conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                return response
+        except sqlite3.Error as e:
+            print(f"[WARNING] LLM önbelleği okunamadı: {e}")
+            return None
+
+    def put(self, key: str, model_name: str, response: str):
+        """Yanıtı kaydeder, süresi dolanları ve fazla kayıtları temizler
+        (veritabanı hatasında kayıt atlanır)"""
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, response, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, model_name, response, now, now),
+                )
+                conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "  SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?"
+                    ")",
+                    (self.max_entries,),
+                )
+        except sqlite3.Error as e:
+            print(f"[WARNING] LLM önbelleğine yazılamadı: {e}")
+
+
+_default_cache = None
+
+
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """Paylaşılan önbellek örneği (LLM_CACHE=0 ise None)"""
+    global _default_cache
+    if os.getenv("LLM_CACHE", "1").lower() in ("0", "false", "no"):
+        return None
+    if _default_cache is None:
+        try:
+            _default_cache = LLMResponseCache()
+        except (OSError, sqlite3.Error) as e:
+            print(f"[WARNING] LLM yanıt önbelleği açılamadı: {e}")
+            return None
+    return _default_cache
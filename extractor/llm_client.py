@@ -0,0 +1,293 @@
+"""
+Asenkron LLM istemcisi - token bucket ile hız sınırlama.
+
+Sabit bekleme (eski MIN_API_DELAY = 6 sn) yerine sağlayıcı kotası uygulanır:
+- Dakikada istek (RPM) ve dakikada token (TPM) bütçesi ayrı bucket'larda tutulur
+- Aynı anda birden fazla istek uçuşta olabilir (LLM_MAX_CONCURRENCY); sınır süreç
+  genelindedir - farklı thread'lerdeki event loop'lar (generate_sync) aynı slotları paylaşır
+- LLM_BACKEND=stub ile ağ olmadan çalışan yerel backend kullanılır
+- Sağlayıcı yine de 429 / ResourceExhausted dönerse istek üstel bekleme ile
+  sınırlı sayıda tekrarlanır (LLM_MAX_RETRIES, LLM_RETRY_BASE_SECONDS)
+
+Yanıtlar model + prompt anahtarıyla kalıcı önbellekte tutulur (bkz. llm_cache).
+
+Ortam değişkenleri: LLM_BACKEND, LLM_RPM, LLM_TPM, LLM_MAX_CONCURRENCY,
+LLM_MAX_RETRIES, LLM_RETRY_BASE_SECONDS
+"""
+
+import os
+import time
+import asyncio
+import threading
+from typing import Callable, Optional, Union
+from .llm_cache import get_response_cache
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+DEFAULT_RPM = 10
+DEFAULT_TPM = 250000
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_BASE_SECONDS = 30.0
+
+# Sağlayıcının kota aşımı hataları (google.api_core: ResourceExhausted / TooManyRequests)
+RATE_LIMIT_ERROR_NAMES = ("ResourceExhausted", "TooManyRequests")
+
+
+def estimate_tokens(text: str) -> int:
+    """Kaba token tahmini (~4 karakter = 1 token)"""
+    return max(1, len(text or "") // 4)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Hata sağlayıcı kota aşımı (HTTP 429) mı?"""
+    if type(error).__name__ in RATE_LIMIT_ERROR_NAMES:
+        return True
+    message = str(error)
+    return "429" in message or any(name in message for name in RATE_LIMIT_ERROR_NAMES)
+
+
+class TokenBucket:
+    """Dakikalık bütçeyle sürekli dolan token bucket.
+
+    Rezervasyon mantığı: istenen miktar hemen düşülür, bakiye negatife inerse
+    çağıran taraf borç kapanana kadar bekler. Kilit threading tabanlıdır; bu
+    sayede farklı event loop'lar ve thread'ler aynı bucket'ı paylaşabilir.
+    """
+
+    def __init__(self, per_minute: float, capacity: float = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self, amount: float = 1) -> float:
+        """Miktarı düşer ve gereken bekleme süresini (sn) döndürür"""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def charge(self, amount: float):
+        """Sonradan öğrenilen ek tüketimi (ör. yanıt token'ları) bekletmeden düşer"""
+        with self._lock:
+            self._refill()
+            self.tokens -= amount
+
+    async def acquire(self, amount: float = 1):
+        wait = self.reserve(amount)
+        if wait > 0:
+            print(f"[DEBUG] Rate limit - {wait:.2f}s bekleniyor")
+            await asyncio.sleep(wait)
+
+
+class ConcurrencyLimiter:
+    """Event loop'tan bağımsız, süreç genelinde eşzamanlı istek sınırı.
+
+    threading.BoundedSemaphore üzerine kuruludur; asyncio.Semaphore tek bir loop'a bağlı
+    olduğundan her asyncio.run (ör. thread başına generate_sync) kendi sınırını açardı.
+    Slot beklenirken loop bloklanmaz: engellemeyen deneme + kısa uyku ile yoklanır
+    (thread havuzunda bloklayan acquire, to_thread kullanan backend'leri aç bırakabilirdi).
+    """
+
+    POLL_MIN_SECONDS = 0.005
+    POLL_MAX_SECONDS = 0.05
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._slots = threading.BoundedSemaphore(limit)
+
+    async def acquire(self):
+        wait = self.POLL_MIN_SECONDS
+        while not self._slots.acquire(blocking=False):
+            await asyncio.sleep(wait)
+            wait = min(wait * 2, self.POLL_MAX_SECONDS)
+
+    def release(self):
+        self._slots.release()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.release()
+        return False
+
+
+class GeminiBackend:
+    """google.generativeai üzerinden Gemini çağrıları.
+
+    Senkron generate_content thread'de çalıştırılır; gRPC async istemcisi tek bir
+    event loop'a bağlandığı için farklı asyncio.run çağrıları arasında paylaşılamaz.
+    """
+
+    name = "gemini"
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, api_key: str = None):
+        import google.generativeai as genai
+
+        api_key = api_key or os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise RuntimeError("GEMINI_API_KEY bulunamadı")
+
+        genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+
+    async def generate(self, prompt: str, **kwargs) -> str:
+        response = await asyncio.to_thread(self.model.generate_content, prompt, **kwargs)
+        return (response.text or "").strip()
+
+
+class StubBackend:
+    """Ağ kullanmayan yerel backend - testler ve kuru çalıştırmalar için.
+
+    responder bir string ise her istekte o döner, callable ise prompt ile çağrılır.
+    """
+
+    name = "stub"
+
+    def __init__(self, responder: Union[str, Callable[[str], str], None] = None,
+                 latency: float = 0.0, model_name: str = "stub"):
+        self.responder = responder if responder is not None else "{}"
+        self.latency = latency
+        self.model_name = model_name
+        self.calls = []
+
+    async def generate(self, prompt: str, **kwargs) -> str:
+        self.calls.append(prompt)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if callable(self.responder):
+            return self.responder(prompt)
+        return self.responder
+
+
+class AsyncLLMClient:
+    """RPM/TPM bütçesine uyan, eşzamanlı istek gönderebilen LLM istemcisi"""
+
+    def __init__(self, backend, requests_per_minute: float = None,
+                 tokens_per_minute: float = None, max_concurrency: int = None,
+                 cache=None, use_cache: bool = True, max_retries: int = None,
+                 retry_base_delay: float = None):
+        """
+        Args:
+            backend: generate(prompt) coroutine'i olan backend (GeminiBackend, StubBackend)
+            requests_per_minute: Dakikalık istek bütçesi (varsayılan: env LLM_RPM)
+            tokens_per_minute: Dakikalık token bütçesi (varsayılan: env LLM_TPM)
+            max_concurrency: Aynı anda uçuşta olabilecek istek sayısı (varsayılan: env LLM_MAX_CONCURRENCY)
+            cache: Yanıt önbelleği (varsayılan: paylaşılan LLMResponseCache)
+            use_cache: False ise önbellek hiç kullanılmaz
+            max_retries: Kota aşımında en fazla tekrar sayısı (varsayılan: env LLM_MAX_RETRIES)
+            retry_base_delay: İlk tekrar öncesi bekleme (sn), her denemede iki katına çıkar
+                (varsayılan: env LLM_RETRY_BASE_SECONDS)
+        """
+        self.backend = backend
+        self.model_name = getattr(backend, "model_name", "unknown")
+        self.cache = (cache or get_response_cache()) if use_cache else None
+        rpm = requests_per_minute or float(os.getenv("LLM_RPM", DEFAULT_RPM))
+        tpm = tokens_per_minute or float(os.getenv("LLM_TPM", DEFAULT_TPM))
+        self.max_concurrency = max_concurrency or int(os.getenv("LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("LLM_MAX_RETRIES", DEFAULT_MAX_RETRIES))
+        self.retry_base_delay = (retry_base_delay if retry_base_delay is not None
+                                 else float(os.getenv("LLM_RETRY_BASE_SECONDS", DEFAULT_RETRY_BASE_SECONDS)))
+        # Başlangıç patlamasını eşzamanlılık kadar sınırla
+        self.request_bucket = TokenBucket(rpm, capacity=max(1, min(rpm, self.max_concurrency)))
+        self.token_bucket = TokenBucket(tpm)
+        self.limiter = ConcurrencyLimiter(self.max_concurrency)
+
+    async def generate(self, prompt: str, **kwargs) -> str:
+        """Prompt'u bütçe dahilinde gönderir ve yanıt metnini döndürür (önbellekte varsa çağrı yapılmaz)"""
+        cache_key = None
+        if self.cache:
+            # Backend adı anahtara dahil: stub yanıtları gerçek model kayıtlarına karışmaz
+            cache_key = self.cache.make_key(f"{self.backend.name}:{self.model_name}", prompt, kwargs)
+            try:
+                cached = self.cache.get(cache_key)
+            except Exception as e:
+                # Önbellek hatası isteği düşürmez: ıskalama gibi davran
+                print(f"[WARNING] LLM önbelleği okunamadı: {e}")
+                cached = None
+            if cached is not None:
+                print(f"[CACHE] LLM yanıtı önbellekten alındı ({self.model_name})")
+                return cached
+
+        text = await self._generate_with_retry(prompt, **kwargs)
+
+        if self.cache and text:
+            try:
+                self.cache.put(cache_key, self.model_name, text)
+            except Exception as e:
+                print(f"[WARNING] LLM önbelleğine yazılamadı: {e}")
+        return text
+
+    async def _generate_with_retry(self, prompt: str, **kwargs) -> str:
+        """Backend çağrısı; kota aşımında üstel beklemeyle en fazla max_retries kez tekrarlar.
+
+        Slot sadece istek uçuştayken tutulur; bekleme öncesi bırakılır ki kota aşımına
+        düşen çağrılar sağlıklı istekleri bekletmesin.
+        """
+        delay = self.retry_base_delay
+        attempt = 0
+        while True:
+            async with self.limiter:
+                # Her deneme bütçeden yeniden düşülür
+                await self.request_bucket.acquire(1)
+                await self.token_bucket.acquire(estimate_tokens(prompt))
+                try:
+                    text = await self.backend.generate(prompt, **kwargs)
+                    self.token_bucket.charge(estimate_tokens(text))
+                    return text
+                except Exception as e:
+                    if attempt >= self.max_retries or not is_rate_limit_error(e):
+                        raise
+                    error_name = type(e).__name__
+            attempt += 1
+            print(f"[WARNING] LLM rate limit aşıldı ({error_name}). "
+                  f"{delay:.1f}s bekleniyor... ({attempt}/{self.max_retries})")
+            await asyncio.sleep(delay)
+            delay *= 2
+
+    def generate_sync(self, prompt: str, **kwargs) -> str:
+        """Senkron kod yolları için generate sarmalayıcısı"""
+        return asyncio.run(self.generate(prompt, **kwargs))
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def create_backend(model_name: str = DEFAULT_MODEL):
+    """LLM_BACKEND ortam değişkenine göre backend oluşturur"""
+    backend_name = os.getenv("LLM_BACKEND", "gemini").lower()
+    if backend_name == "stub":
+        return StubBackend(model_name=model_name)
+    return GeminiBackend(model_name)
+
+
+def get_llm_client(model_name: str = DEFAULT_MODEL) -> AsyncLLMClient:
+    """Model başına paylaşılan istemci - tüm çağrılar aynı kota bucket'larını kullanır"""
+    with _clients_lock:
+        client = _clients.get(model_name)
+        if client is None:
+            client = AsyncLLMClient(create_backend(model_name))
+            _clients[model_name] = client
+        return client
+
+
+def set_llm_client(client: Optional[AsyncLLMClient], model_name: str = DEFAULT_MODEL):
+    """Paylaşılan istemciyi değiştirir (ör. StubBackend ile test); None verilirse kaldırır"""
+    with _clients_lock:
+        if client is None:
+            _clients.pop(model_name, None)
+        else:
+            _clients[model_name] = client
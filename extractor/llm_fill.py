@@ -1,17 +1,32 @@
-import os, re, json, time  # Added time import
-from typing import Dict, Any, List
+import os, re, json, asyncio
+from typing import Dict, Any, List, Tuple
+from pydantic import ValidationError
 from .normalize import parse_amount
 from .campaigns import check_campaign_mentions, get_campaign_summary
+from .llm_client import get_llm_client
+from .schema import NotlarModel
 
-# Minimum delay between API calls (seconds)
-MIN_API_DELAY = 6
+MONEY_FIELDS = ['ciro_2024', 'ciro_2025', 'q2_hedef', 'yaklasik_siparis_tutari']
+
+FIELD_DESCRIPTIONS = {
+    'gorusulen_kisi': 'görüşülen kişinin adı',
+    'pozisyon': 'görüşülen kişinin pozisyonu',
+    'sunulan_urun_gruplari_kampanyalar': 'sunulan ürün grupları veya kampanyalar',
+    'rakip_firma_sartlari': 'rakip firma şartları',
+    'siparis_alindi_mi': 'sipariş alınıp alınmadığı',
+    'siparis_alinamayan_urunler_ve_nedenleri': 'sipariş alınamayan ürünler ve nedenleri'
+}
+
+def _merged_mode_enabled() -> bool:
+    """LLM_MERGED_CALL=1 ise eksik alanlar + özet tek yapılandırılmış çağrıda istenir"""
+    return os.getenv("LLM_MERGED_CALL", "0").lower() in ("1", "true", "yes")
 
 def _missing_fields(kv: Dict[str, Any], declared_keys: List[str]) -> List[str]:
     """Bu PDF'te declared olan ama kv'de eksik olan alanları döndür"""
     missing = []
     for key in declared_keys:
         # Para alanları için _value suffix'i kontrol et
-        if key in ['ciro_2024', 'ciro_2025', 'q2_hedef', 'yaklasik_siparis_tutari']:
+        if key in MONEY_FIELDS:
             if not kv.get(f"{key}_value"):
                 missing.append(key)
         else:
@@ -20,31 +35,6 @@ def _missing_fields(kv: Dict[str, Any], declared_keys: List[str]) -> List[str]:
                 missing.append(key)
     return missing
 
-# Track last API call timestamp
-_last_api_call = 0
-
-def _rate_limited_api_call(model, prompt):
-    """API çağrılarını rate limit ile yap"""
-    global _last_api_call
-    
-    # Calculate time since last API call
-    current_time = time.time()
-    elapsed = current_time - _last_api_call
-    
-    # If needed, wait to maintain minimum delay between calls
-    if _last_api_call > 0 and elapsed < MIN_API_DELAY:
-        wait_time = MIN_API_DELAY - elapsed
-        print(f"[DEBUG] Rate limit - waiting {wait_time:.2f}s before next API call")
-        time.sleep(wait_time)
-    
-    # Make the API call
-    response = model.generate_content(prompt)
-    
-    # Update timestamp after successful call
-    _last_api_call = time.time()
-    
-    return response
-    
 def _extract_turnover_values(kv: Dict[str, Any]) -> tuple:
     """2024 ve 2025 ciro değerlerini çıkar"""
     try:
@@ -61,8 +51,170 @@ def _extract_turnover_values(kv: Dict[str, Any]) -> tuple:
     except:
         return 0, 0
 
-def llm_fill_and_summarize(kv: Dict[str, Any], raw_notlar: str, declared_keys: List[str]) -> Dict[str, Any]:
+def _field_description(key: str) -> str:
+    if key in MONEY_FIELDS:
+        return f"{key} (sayı + para birimi formatında)"
+    return FIELD_DESCRIPTIONS.get(key, key)
+
+def _apply_filled_fields(kv: Dict[str, Any], missing: List[str], filled: Dict[str, Any]):
+    """LLM'in doldurduğu alanları kv'ye yazar (para alanları value/currency/raw olarak)"""
+    for key in missing:
+        if key in MONEY_FIELDS and filled.get(key):
+            dec, cur = parse_amount(str(filled[key]))
+            kv[f"{key}_value"] = dec  # setdefault() yerine direkt atama
+            kv[f"{key}_currency"] = cur
+            kv[f"{key}_raw"] = str(filled[key])
+            print(f"[DEBUG] DEBUG: Set money field {key} = {dec} {cur}")
+        elif key in filled:
+            # None değeri yerine "—" kullan
+            value = filled[key] if filled[key] is not None else "—"
+            kv[key] = value  # Direkt atama
+            print(f"[DEBUG] DEBUG: Set text field {key} = {value}")
+
+def _validate_merged_response(data: Dict[str, Any], missing: List[str]) -> Dict[str, Any]:
+    """Birleşik yanıtı NotlarModel ile doğrular; geçersiz alanlar atılır"""
+    candidate = {}
+    for key in missing:
+        value = data.get(key)
+        if key in MONEY_FIELDS:
+            if value:
+                dec, cur = parse_amount(str(value))
+                candidate.update({f"{key}_value": dec, f"{key}_currency": cur, f"{key}_raw": str(value)})
+        else:
+            candidate[key] = value
+    candidate["ozet"] = data.get("ozet")
+    
+    try:
+        NotlarModel(**candidate)
+    except ValidationError as e:
+        invalid = {str(err["loc"][0]) for err in e.errors() if err.get("loc")}
+        print(f"[DEBUG] Merged response validation error, dropping fields: {sorted(invalid)}")
+        data = {k: v for k, v in data.items()
+                if k not in invalid and not any(f.startswith(f"{k}_") for f in invalid)}
+    return data
+
+def _build_summary_tasks(kv: Dict[str, Any], raw_notlar: str) -> Dict[str, Any]:
+    """Özet prompt'unun kampanya ve ciro bölümlerini hazırlar"""
+    # Kampanya kontrolü
+    campaign_checks = check_campaign_mentions(raw_notlar)
+    campaign_warnings = []
+    
+    if campaign_checks:
+        for campaign_key, campaign_info in campaign_checks.items():
+            if isinstance(campaign_info, dict) and not campaign_info.get("mentioned", True):
+                campaign_warnings.append(f"• {campaign_info['name']} firma sahibine belirtilmemiş")
+    
+    # Ciro analizi
+    ciro_2024, ciro_2025 = _extract_turnover_values(kv)
+    
+    # Aktif kampanyalar listesi
+    current_campaigns = get_campaign_summary()
+    
+    # Dinamik kampanya kontrol görevleri oluştur
+    campaign_tasks = []
+    if current_campaigns and current_campaigns != "Aktif kampanya bulunmuyor.":
+        campaign_tasks.append("3. Kampanya kontrolü yap:")
+        campaign_tasks.append("   - Aşağıdaki aktif kampanyalardan hangilerinin firma sahibine belirtildiğini kontrol et")
+        campaign_tasks.append("   - Belirtilmeyen kampanyalar için uyarı ver: 'X kampanyası firma sahibine belirtilmemiş'")
+    else:
+        campaign_tasks.append("3. Kampanya durumu: Aktif kampanya bulunmuyor.")
+    
+    return {
+        "current_campaigns": current_campaigns,
+        "ciro_2024": ciro_2024 if ciro_2024 > 0 else 'Belirtilmemiş',
+        "ciro_2025": ciro_2025 if ciro_2025 > 0 else 'Belirtilmemiş',
+        "campaign_tasks": chr(10).join(campaign_tasks),
+        "campaign_result": '; '.join(campaign_warnings) if campaign_warnings else 'Yukarıdaki aktif kampanyaları metinde kontrol et'
+    }
+
+def llm_fill_and_summarize(kv: Dict[str, Any], raw_notlar: str, declared_keys: List[str], merged: bool = None) -> Dict[str, Any]:
     """PDF-spesifik dinamik alan doldurma"""
+    return asyncio.run(llm_fill_and_summarize_async(kv, raw_notlar, declared_keys, merged))
+
+def llm_fill_many(items: List[Tuple[Dict[str, Any], str, List[str]]], merged: bool = None) -> List[Dict[str, Any]]:
+    """Birden fazla PDF'in (kv, raw_notlar, declared_keys) LLM aşamasını eşzamanlı çalıştırır.
+
+    Hız sınırı paylaşılan istemcinin RPM/TPM bütçesiyle uygulanır; sonuçlar giriş sırasındadır.
+    """
+    async def _run_all():
+        return await asyncio.gather(*(llm_fill_and_summarize_async(kv, notlar, declared, merged)
+                                      for kv, notlar, declared in items))
+    return asyncio.run(_run_all())
+
+async def _fill_and_summarize_merged(client, kv: Dict[str, Any], raw_notlar: str, missing: List[str]) -> Dict[str, Any]:
+    """Eksik alanları ve özeti JSON şemasıyla sınırlandırılmış tek çağrıda ister"""
+    properties = {key: {"type": "string", "nullable": True, "description": _field_description(key)}
+                  for key in missing}
+    properties["ozet"] = {"type": "string", "description": "ziyaret özeti paragrafı"}
+    response_schema = {"type": "object", "properties": properties, "required": ["ozet"]}
+    
+    tasks = _build_summary_tasks(kv, raw_notlar)
+    fields_section = (
+        "A) ALAN ÇIKARIMI: Metinden şu alanları çıkar, emin değilsen null bırak:\n"
+        + "\n".join(f"- {key}: {_field_description(key)}" for key in missing)
+        if missing else "A) ALAN ÇIKARIMI: Eksik alan yok."
+    )
+    
+    prompt_merged = f"""
+Bu ziyaret raporunu analiz et. Yanıtı verilen JSON şemasına uygun tek bir nesne olarak döndür.
+
+ZİYARET METNİ:
+{raw_notlar}
+
+AKTİF KAMPANYALAR:
+{tasks['current_campaigns']}
+
+CİRO BİLGİLERİ:
+2024 Ciro: {tasks['ciro_2024']}
+2025 Ciro: {tasks['ciro_2025']}
+(Ciro belirtilmemişse ve metinde geçiyorsa A adımında çıkardığın değeri kullan)
+
+{fields_section}
+
+B) ÖZET ("ozet" alanı):
+1. Ziyaret özetini yap (kim ile görüşüldü, amaç, sonuç) - 1-2 cümle
+2. Ciro durumunu analiz et:
+   - Eğer her iki ciro da varsa karşılaştır (arttı/azaldı/aynı ve yüzde kaç)
+   - Sadece biri varsa durumu belirt
+   - Hiçbiri yoksa "ciro bilgisi yok" de
+{tasks['campaign_tasks']}
+4. Bir sonraki ziyaret için öneri ver - 1 cümle
+Özeti normal paragraf şeklinde, akıcı ve kısa yaz. Numaralı liste kullanma.
+
+KAMPANYA KONTROL SONUCU:
+{tasks['campaign_result']}
+""".strip()
+    
+    print(f"[DEBUG] Sending merged LLM request (missing={missing})...")
+    resp_text = await client.generate(
+        prompt_merged,
+        generation_config={"response_mime_type": "application/json", "response_schema": response_schema}
+    )
+    
+    try:
+        data = json.loads(resp_text or "{}")
+        if not isinstance(data, dict):
+            raise ValueError("JSON nesnesi bekleniyordu")
+    except ValueError as e:
+        print(f"[DEBUG] Merged JSON parse error: {e}")
+        data = {}
+    
+    data = _validate_merged_response(data, missing)
+    _apply_filled_fields(kv, missing, data)
+    
+    summary = (data.get("ozet") or "").strip()
+    print(f"[DEBUG] DEBUG: Merged summary generated: {summary[:100]}...")
+    if summary:
+        kv["ozet"] = summary
+    return kv
+
+async def llm_fill_and_summarize_async(kv: Dict[str, Any], raw_notlar: str, declared_keys: List[str], merged: bool = None) -> Dict[str, Any]:
+    """llm_fill_and_summarize'ın asenkron sürümü
+
+    merged=True (veya env LLM_MERGED_CALL=1) ise eksik alanlar ve özet tek çağrıda istenir.
+    """
+    if merged is None:
+        merged = _merged_mode_enabled()
     
     print("[DEBUG] Starting LLM fill...")
     print(f"[DEBUG] declared_keys = {declared_keys}")
@@ -78,26 +230,22 @@ def llm_fill_and_summarize(kv: Dict[str, Any], raw_notlar: str, declared_keys: L
     print(f"[DEBUG] Sonda 'girecekler' var mı: {'Evet' if 'girecekler' in genel_yorum else 'Hayır'}")
     
     try:
-        # Import kontrolü
+        # İstemci kontrolü (import ve API key kontrolü backend içinde yapılır)
         try:
-            import google.generativeai as genai
-            print("[DEBUG] google.generativeai imported successfully")
+            client = get_llm_client("gemini-2.5-flash")
+            print(f"[DEBUG] LLM client ready ({client.backend.name})")
         except ImportError as e:
             print(f"[DEBUG] Import error: {e}")
             kv["ozet"] = "google.generativeai kütüphanesi yüklü değil"
             return kv
-        
-        # API key kontrolü
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            print("[DEBUG] No API key found")
+        except RuntimeError as e:
+            print(f"[DEBUG] {e}")
             kv["ozet"] = "GEMINI_API_KEY bulunamadı"
             return kv
-            
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-2.5-flash")
-        
-        print("[DEBUG] Gemini model loaded successfully")
+
+        if merged:
+            missing = _missing_fields(kv, declared_keys) if declared_keys else []
+            return await _fill_and_summarize_merged(client, kv, raw_notlar, missing)
 
         # Declared boş değilse: KV-first mod (sadece declared alanları doldur)
         if declared_keys:
@@ -106,26 +254,10 @@ def llm_fill_and_summarize(kv: Dict[str, Any], raw_notlar: str, declared_keys: L
             
             if missing:
                 # Şema oluştur (sadece eksik alanlar için)
-                schema_properties = {}
-                for key in missing:
-                    if key in ['ciro_2024', 'ciro_2025', 'q2_hedef', 'yaklasik_siparis_tutari']:
-                        schema_properties[key] = {
-                            "type": ["string", "null"],
-                            "description": f"{key} (sayı + para birimi formatında)"
-                        }
-                    else:
-                        field_descriptions = {
-                            'gorusulen_kisi': 'görüşülen kişinin adı',
-                            'pozisyon': 'görüşülen kişinin pozisyonu',
-                            'sunulan_urun_gruplari_kampanyalar': 'sunulan ürün grupları veya kampanyalar',
-                            'rakip_firma_sartlari': 'rakip firma şartları',
-                            'siparis_alindi_mi': 'sipariş alınıp alınmadığı',
-                            'siparis_alinamayan_urunler_ve_nedenleri': 'sipariş alınamayan ürünler ve nedenleri'
-                        }
-                        schema_properties[key] = {
-                            "type": ["string", "null"],
-                            "description": field_descriptions.get(key, key)
-                        }
+                schema_properties = {
+                    key: {"type": ["string", "null"], "description": _field_description(key)}
+                    for key in missing
+                }
 
                 # Genel yorumu öncelikle kullan, yoksa tüm metni
                 source_text = kv.get('genel_yorum') or raw_notlar
@@ -147,13 +279,13 @@ METIN:
                 print("[DEBUG] Sending LLM request for missing fields...")
                 
                 # Rate-limited API call
-                resp = _rate_limited_api_call(model, prompt_kv)
+                resp_text = await client.generate(prompt_kv)
                 
-                print(f"[DEBUG] LLM response received: {resp.text[:200]}...")
+                print(f"[DEBUG] LLM response received: {resp_text[:200]}...")
                 
                 try:
                     # JSON temizleme
-                    txt = (resp.text or "").strip()
+                    txt = (resp_text or "").strip()
                     txt = re.sub(r"^```json|```$", "", txt, flags=re.IGNORECASE|re.MULTILINE).strip()
                     filled = json.loads(txt)
                     print(f"[DEBUG] Parsed JSON: {filled}")
@@ -162,18 +294,7 @@ METIN:
                     filled = {}
 
                 # Para alanlarını özel olarak işle
-                for key in missing:
-                    if key in ['ciro_2024', 'ciro_2025', 'q2_hedef', 'yaklasik_siparis_tutari'] and filled.get(key):
-                        dec, cur = parse_amount(str(filled[key]))
-                        kv[f"{key}_value"] = dec  # setdefault() yerine direkt atama
-                        kv[f"{key}_currency"] = cur
-                        kv[f"{key}_raw"] = str(filled[key])
-                        print(f"[DEBUG] DEBUG: Set money field {key} = {dec} {cur}")
-                    elif key in filled:
-                        # None değeri yerine "—" kullan
-                        value = filled[key] if filled[key] is not None else "—"
-                        kv[key] = value  # Direkt atama
-                        print(f"[DEBUG] DEBUG: Set text field {key} = {value}")
+                _apply_filled_fields(kv, missing, filled)
             
             else:
                 print(f"[DEBUG] DEBUG: No missing fields, skipping LLM fill")
@@ -181,29 +302,7 @@ METIN:
         # Her koşulda özet oluştur - Kampanya kontrolü ve ciro analizi ile
         print(f"[DEBUG] DEBUG: Generating enhanced summary...")
         
-        # Kampanya kontrolü
-        campaign_checks = check_campaign_mentions(raw_notlar)
-        campaign_warnings = []
-        
-        if campaign_checks:
-            for campaign_key, campaign_info in campaign_checks.items():
-                if isinstance(campaign_info, dict) and not campaign_info.get("mentioned", True):
-                    campaign_warnings.append(f"• {campaign_info['name']} firma sahibine belirtilmemiş")
-        
-        # Ciro analizi
-        ciro_2024, ciro_2025 = _extract_turnover_values(kv)
-        
-        # Aktif kampanyalar listesi
-        current_campaigns = get_campaign_summary()
-        
-        # Dinamik kampanya kontrol görevleri oluştur
-        campaign_tasks = []
-        if current_campaigns and current_campaigns != "Aktif kampanya bulunmuyor.":
-            campaign_tasks.append("3. Kampanya kontrolü yap:")
-            campaign_tasks.append("   - Aşağıdaki aktif kampanyalardan hangilerinin firma sahibine belirtildiğini kontrol et")
-            campaign_tasks.append("   - Belirtilmeyen kampanyalar için uyarı ver: 'X kampanyası firma sahibine belirtilmemiş'")
-        else:
-            campaign_tasks.append("3. Kampanya durumu: Aktif kampanya bulunmuyor.")
+        tasks = _build_summary_tasks(kv, raw_notlar)
 
         prompt_sum = f"""
 Bu ziyaret raporunu analiz et ve kapsamlı bir özet oluştur.
@@ -212,11 +311,11 @@ ZİYARET METNİ:
 {raw_notlar}
 
 AKTİF KAMPANYALAR:
-{current_campaigns}
+{tasks['current_campaigns']}
 
 CİRO BİLGİLERİ:
-2024 Ciro: {ciro_2024 if ciro_2024 > 0 else 'Belirtilmemiş'}
-2025 Ciro: {ciro_2025 if ciro_2025 > 0 else 'Belirtilmemiş'}
+2024 Ciro: {tasks['ciro_2024']}
+2025 Ciro: {tasks['ciro_2025']}
 
 GÖREVLER:
 1. Ziyaret özetini yap (kim ile görüşüldü, amaç, sonuç) - 1-2 cümle
@@ -224,19 +323,18 @@ GÖREVLER:
    - Eğer her iki ciro da varsa karşılaştır (arttı/azaldı/aynı ve yüzde kaç)
    - Sadece biri varsa durumu belirt
    - Hiçbiri yoksa "ciro bilgisi yok" de
-{chr(10).join(campaign_tasks)}
+{tasks['campaign_tasks']}
 4. Bir sonraki ziyaret için öneri ver - 1 cümle
 
 ÇIKTI FORMATI:
 Normal paragraf şeklinde, akıcı ve kısa yaz. Numaralı liste kullanma.
 
 KAMPANYA KONTROL SONUCU:
-{'; '.join(campaign_warnings) if campaign_warnings else 'Yukarıdaki aktif kampanyaları metinde kontrol et'}
+{tasks['campaign_result']}
 """.strip()
 
         # Rate-limited API call for summary
-        resp_sum = _rate_limited_api_call(model, prompt_sum)
-        summary = (resp_sum.text or "").strip()
+        summary = (await client.generate(prompt_sum) or "").strip()
         print(f"[DEBUG] DEBUG: Enhanced summary generated: {summary[:100]}...")
         if summary:
             kv["ozet"] = summary
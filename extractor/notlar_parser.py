@@ -1,175 +1,265 @@
 import re
 from .normalize import parse_amount
 
+class _KeywordAutomaton:
+    """Aho-Corasick otomatı - tüm anahtar kelimeleri metin üzerinde tek geçişte bulur"""
+
+    def __init__(self, keywords):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+        
+        for keyword in keywords:
+            state = 0
+            for char in keyword:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                state = next_state
+            self.output[state] += (keyword,)
+        
+        # BFS ile failure link'leri
+        queue = list(self.goto[0].values())
+        while queue:
+            state = queue.pop(0)
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] += self.output[self.fail[next_state]]
+
+    def step(self, state: int, char: str) -> int:
+        while state and char not in self.goto[state]:
+            state = self.fail[state]
+        return self.goto[state].get(char, 0)
+
+# Başlık → kanonik anahtar kuralları: (anahtar, herhangi biri, hepsi gerekli).
+# İlk eşleşen kural kazanır. 2025 kuralı genel 'ciro' kuralından önce gelir;
+# böylece "2025 Cirosu" başlığı ciro_2024'e düşmez.
+DECLARED_KEY_RULES = [
+    ('ciro_2024', ('2024',), ()),
+    ('ciro_2025', ('2025',), ()),
+    ('ciro_2024', ('ciro',), ()),
+    ('q2_hedef', ('q2', 'hedef'), ()),
+    ('gorusulen_kisi', ('görüşülen', 'gorusulen', 'kişi', 'kisi'), ()),
+    ('pozisyon', ('pozisyon', 'position'), ()),
+    ('sunulan_urun_gruplari_kampanyalar', ('sunulan', 'ürün', 'urun', 'grup', 'kampanya'), ()),
+    ('rakip_firma_sartlari', ('rakip', 'firma', 'şart', 'sart'), ()),
+    ('siparis_alindi_mi', ('sipariş', 'siparis', 'alındı', 'alindi'), ('mi',)),
+    ('yaklasik_siparis_tutari', ('yaklaşık', 'yaklasik', 'tutar'), ()),
+    ('siparis_alinamayan_urunler_ve_nedenleri', ('alinamayan', 'ürünler', 'urunler', 'neden'), ()),
+]
+
+_DECLARED_AUTOMATON = _KeywordAutomaton(
+    {keyword for _, any_of, all_of in DECLARED_KEY_RULES for keyword in any_of + all_of}
+)
+
+def _canonical_key(found: set) -> str | None:
+    for canonical, any_of, all_of in DECLARED_KEY_RULES:
+        if any(k in found for k in any_of) and all(k in found for k in all_of):
+            return canonical
+    return None
+
 def declared_keys(notlar_text: str) -> list:
-    """PDF'ten key: başlıklarını toplar ve kanonik isimlere map'ler"""
+    """PDF'ten key: başlıklarını toplar ve kanonik isimlere map'ler.
+
+    Metin küçük harfe çevrilip otomatla tek geçişte taranır; her ':' bir başlığı
+    (önceki ':' sonrasından itibaren) kapatır ve bulunan kelimelerle eşlenir.
+    """
     if not notlar_text:
         return []
     
-    # "KEY:" pattern'ini bul
-    key_patterns = re.findall(r'([^:]*?):', notlar_text, re.IGNORECASE)
-    
+    automaton = _DECLARED_AUTOMATON
     canonical_keys = []
+    found = set()
+    state = 0
     
-    for key in key_patterns:
-        key_clean = key.strip().lower()
-        
-        # Kanonik mapping - TÜM alanları dahil et
-        if any(x in key_clean for x in ['2024', 'ciro']):
-            canonical_keys.append('ciro_2024')
-        elif any(x in key_clean for x in ['2025', 'ciro']):
-            canonical_keys.append('ciro_2025')
-        elif any(x in key_clean for x in ['q2', 'hedef']):
-            canonical_keys.append('q2_hedef')
-        elif any(x in key_clean for x in ['görüşülen', 'gorusulen', 'kişi', 'kisi']):
-            canonical_keys.append('gorusulen_kisi')
-        elif any(x in key_clean for x in ['pozisyon', 'position']):
-            canonical_keys.append('pozisyon')
-        elif any(x in key_clean for x in ['sunulan', 'ürün', 'urun', 'grup', 'kampanya']):
-            canonical_keys.append('sunulan_urun_gruplari_kampanyalar')
-        elif any(x in key_clean for x in ['rakip', 'firma', 'şart', 'sart']):
-            canonical_keys.append('rakip_firma_sartlari')
-        elif any(x in key_clean for x in ['sipariş', 'siparis', 'alındı', 'alindi']) and 'mi' in key_clean:
-            canonical_keys.append('siparis_alindi_mi')
-        elif any(x in key_clean for x in ['yaklaşık', 'yaklasik', 'tutar']):
-            canonical_keys.append('yaklasik_siparis_tutari')
-        elif any(x in key_clean for x in ['alinamayan', 'ürünler', 'urunler', 'neden']):
-            canonical_keys.append('siparis_alinamayan_urunler_ve_nedenleri')
+    for char in notlar_text.lower():
+        if char == ':':
+            if found:
+                canonical = _canonical_key(found)
+                if canonical:
+                    canonical_keys.append(canonical)
+                found = set()
+            state = 0
+            continue
+        state = automaton.step(state, char)
+        if automaton.output[state]:
+            found.update(automaton.output[state])
     
     # Duplicate'leri kaldır ve sırala
     return list(dict.fromkeys(canonical_keys))
 
-def parse_notlar_kv(notlar_text: str) -> dict:
-    """Notlar metninden key-value çiftlerini çıkarır"""
-    if not notlar_text:
-        return {}
-    
-    kv = {}
-    
-    # 2024 Cirosu
-    match = re.search(r'2024\s+[cç]irosu\s+kümülatif\s*:\s*([^€\n]+€?)', notlar_text, re.IGNORECASE)
-    if match:
-        amount_str = match.group(1).strip()
-        value, currency = parse_amount(amount_str)
-        kv["ciro_2024_value"] = value
-        kv["ciro_2024_currency"] = currency
-        kv["ciro_2024_raw"] = amount_str
-    
-    # 2025 Cirosu
-    match = re.search(r'2025\s+[cç]irosu\s+kümülatif\s*:\s*([^€\n]+€?)', notlar_text, re.IGNORECASE)
-    if match:
-        amount_str = match.group(1).strip()
-        value, currency = parse_amount(amount_str)
-        kv["ciro_2025_value"] = value
-        kv["ciro_2025_currency"] = currency
-        kv["ciro_2025_raw"] = amount_str
-    
-    # Q2 Hedef
-    match = re.search(r'q2\s+hedef\s*:\s*([^€\n]+€?)', notlar_text, re.IGNORECASE)
-    if match:
-        amount_str = match.group(1).strip()
-        value, currency = parse_amount(amount_str)
-        kv["q2_hedef_value"] = value
-        kv["q2_hedef_currency"] = currency
-        kv["q2_hedef_raw"] = amount_str
-    
-    # Görüşülen Kişi
-    match = re.search(r'görüşülen\s+kişi\s+ad[ıi]\s*:\s*([^:]+?)(?=\s+pozi[sz]yon|$)', notlar_text, re.IGNORECASE)
-    if match:
-        kv["gorusulen_kisi"] = match.group(1).strip()
-    
-    # Pozisyon
-    match = re.search(r'pozi[sz]yon[uy]*\s*:\s*([^:]+?)(?=\s+sunulan|$)', notlar_text, re.IGNORECASE)
-    if match:
-        kv["pozisyon"] = match.group(1).strip()
-    
-    # Sunulan Ürün Grupları - boş alanları kontrol et
-    match = re.search(r'sunulan\s+ürün\s+gruplari\s*/?\s*kampanyalar\s*:\s*([^:]*?)(?=\s+fi[rı]mada\s+karşilaşilan|$)', notlar_text, re.IGNORECASE)
-    if match:
+def _is_empty_heading(content: str) -> bool:
+    """Değer yerine bir sonraki BÜYÜK HARFLİ başlık yakalanmışsa alan boştur"""
+    return not content or bool(_EMPTY_VALUE_RE.match(content))
+
+def _set_amount(kv: dict, prefix: str, amount_str: str):
+    value, currency = parse_amount(amount_str)
+    kv[f"{prefix}_value"] = value
+    kv[f"{prefix}_currency"] = currency
+    kv[f"{prefix}_raw"] = amount_str
+
+def _amount_field(prefix: str):
+    def handle(kv: dict, match: re.Match):
+        _set_amount(kv, prefix, match.group(1).strip())
+    return handle
+
+def _text_field(key: str):
+    def handle(kv: dict, match: re.Match):
+        kv[key] = match.group(1).strip()
+    return handle
+
+def _optional_text_field(key: str):
+    """Boş bırakılmış alanlar '—' olarak işaretlenir"""
+    def handle(kv: dict, match: re.Match):
         content = match.group(1).strip()
-        if content and not re.match(r'^[A-ZĞÜŞÖÇI\s]+$', content):
-            kv["sunulan_urun_gruplari_kampanyalar"] = content
-        else:
-            kv["sunulan_urun_gruplari_kampanyalar"] = "—"
-    
-    # Rakip Firma Şartları - boş alanları kontrol et
-    match = re.search(r'fi[rı]mada\s+karşilaşilan\s+raki[bp]\s+fi[rı]ma\s+şartlari\s*:\s*([^:]*?)(?=\s+si[bp]ariş\s+alind[ıi]|$)', notlar_text, re.IGNORECASE)
-    if match:
+        kv[key] = "—" if _is_empty_heading(content) else content
+    return handle
+
+def _optional_amount_field(prefix: str):
+    def handle(kv: dict, match: re.Match):
         content = match.group(1).strip()
-        if content and not re.match(r'^[A-ZĞÜŞÖÇI\s]+$', content):
-            kv["rakip_firma_sartlari"] = content
+        if _is_empty_heading(content):
+            kv[f"{prefix}_raw"] = "—"
         else:
-            kv["rakip_firma_sartlari"] = "—"
-    
-    # Sipariş Alındı mı - boş alanları kontrol et
-    match = re.search(r'si[bp]ariş\s+alind[ıi]\s+mi\s*\?\s*([^:]*?)(?=\s+yaklaşik|$)', notlar_text, re.IGNORECASE)
-    if match:
+            _set_amount(kv, prefix, content)
+    return handle
+
+def _combined_text_field(key: str):
+    """İki alan birlikte yazılmış olabilir - sadece dolu ve '?' olmayan değer üzerine yazar"""
+    def handle(kv: dict, match: re.Match):
         content = match.group(1).strip()
-        if content and not re.match(r'^[A-ZĞÜŞÖÇI\s]+$', content):
-            kv["siparis_alindi_mi"] = content
-        else:
-            kv["siparis_alindi_mi"] = "—"
-    
-    # Yaklaşık Sipariş Tutarı
-    match = re.search(r'yaklaşik\s+si[bp]ariş\s+tutari\s*:\s*([^:]*?)(?=\s+si[bp]ariş\s+alinamayan|$)', notlar_text, re.IGNORECASE)
-    if match:
+        if content and content != "?":
+            kv[key] = content
+    return handle
+
+def _combined_amount_field(prefix: str):
+    def handle(kv: dict, match: re.Match):
         content = match.group(1).strip()
-        if content and not re.match(r'^[A-ZĞÜŞÖÇI\s]+$', content):
-            amount_str = content
-            value, currency = parse_amount(amount_str)
-            kv["yaklasik_siparis_tutari_value"] = value
-            kv["yaklasik_siparis_tutari_currency"] = currency
-            kv["yaklasik_siparis_tutari_raw"] = amount_str
-        else:
-            kv["yaklasik_siparis_tutari_raw"] = "—"
-    
-    # Genel Yorum - bir sonraki başlığa kadar al
-    general_comment_match = re.search(r'F[İI]RMA\s+HAKKINDA\s+GENEL\s+YORUM\s*:\s*(.*)', notlar_text, re.IGNORECASE | re.DOTALL)
-    
-    if general_comment_match:
-        comment_start = general_comment_match.start(1)
-        
-        # Sonraki başlığı bul (büyük harfle başlayan ve ":" içeren, veya madde imi olan)
-        next_heading_patterns = [
-            r'\n\s*[A-ZĞÜŞİÖÇ][A-ZĞÜŞİÖÇ\s]+:', # Büyük harfli başlık
-            r'\n\s*MUTABAKAT\s+DURUMU', # Özel olarak bilinen sonraki başlık
-            r'\n\s*[•\-–]', # Madde imleri
-        ]
-        
-        # Her bir pattern için kontrol et
-        end_positions = []
-        for pattern in next_heading_patterns:
-            next_match = re.search(pattern, notlar_text[comment_start:], re.MULTILINE)
-            if next_match:
-                end_positions.append(next_match.start())
-        
-        # En yakın sonlandırıcıyı bul
-        if end_positions:
-            comment_end = comment_start + min(end_positions)
-            comment_text = notlar_text[comment_start:comment_end].strip()
-        else:
-            # Sonlandırıcı bulunamazsa metnin kalanını al
-            comment_text = notlar_text[comment_start:].strip()
-        
-        kv['genel_yorum'] = comment_text
+        if content and content != "?":
+            value, currency = parse_amount(content)
+            kv[f"{prefix}_raw"] = content
+            kv[f"{prefix}_value"] = value
+            kv[f"{prefix}_currency"] = currency
+    return handle
+
+def _general_comment_field(kv: dict, match: re.Match):
+    """Genel yorum - bir sonraki başlığa, MUTABAKAT DURUMU'na veya madde imine kadar"""
+    text = match.string
+    comment_start = match.start(1)
+    next_heading = _NEXT_HEADING_RE.search(text, comment_start)
+    comment_end = next_heading.start() if next_heading else len(text)
+    kv['genel_yorum'] = text[comment_start:comment_end].strip()
+
+_EMPTY_VALUE_RE = re.compile(r'^[A-ZĞÜŞÖÇI\s]+$')
+
+# Genel yorumu sonlandıran başlıklar: büyük harfli başlık, MUTABAKAT DURUMU, madde imi
+_NEXT_HEADING_RE = re.compile(
+    r'\n\s*[A-ZĞÜŞİÖÇ][A-ZĞÜŞİÖÇ\s]+:'
+    r'|\n\s*MUTABAKAT\s+DURUMU'
+    r'|\n\s*[•\-–]',
+    re.MULTILINE,
+)
+
+# Başlık token'ları - metin tek geçişte taranır, alanlar sadece bu konumlarda denenir.
+# Her token, ona bağlı alan desenlerinin ortak önekidir.
+HEADER_TOKENS = {
+    "ciro_2024": r'2024\s+[cç]irosu\s+kümülatif',
+    "ciro_2025": r'2025\s+[cç]irosu\s+kümülatif',
+    "q2_hedef": r'q2\s+hedef',
+    "gorusulen_kisi": r'görüşülen\s+kişi\s+ad[ıi]',
+    "pozisyon": r'pozi[sz]yon',
+    "sunulan_urun": r'sunulan\s+ürün\s+gruplari',
+    "rakip_firma": r'fi[rı]mada\s+karşilaşilan',
+    "siparis_alindi": r'si[bp]ariş\s+alind[ıi]\s+mi|S[İI]PAR[İI]Ş\s+ALINDI\s+M[İI]',
+    "yaklasik_tutar": r'yaklaşik\s+si[bp]ariş\s+tutari|YAKLAŞIK\s+S[İI]PAR[İI]Ş\s+TUTARI',
+    "genel_yorum": r'F[İI]RMA\s+HAKKINDA\s+GENEL\s+YORUM',
+}
+
+# Alan tablosu: (başlık token'ı, tam desen, işleyici). Sıra önemlidir - sonraki
+# kurallar öncekilerin yazdığı değerlerin üzerine yazabilir.
+FIELD_RULES = [
+    ("ciro_2024", r'2024\s+[cç]irosu\s+kümülatif\s*:\s*([^€\n]+€?)', _amount_field("ciro_2024")),
+    ("ciro_2025", r'2025\s+[cç]irosu\s+kümülatif\s*:\s*([^€\n]+€?)', _amount_field("ciro_2025")),
+    ("q2_hedef", r'q2\s+hedef\s*:\s*([^€\n]+€?)', _amount_field("q2_hedef")),
+    ("gorusulen_kisi", r'görüşülen\s+kişi\s+ad[ıi]\s*:\s*([^:]+?)(?=\s+pozi[sz]yon|$)', _text_field("gorusulen_kisi")),
+    ("pozisyon", r'pozi[sz]yon[uy]*\s*:\s*([^:]+?)(?=\s+sunulan|$)', _text_field("pozisyon")),
+    ("sunulan_urun", r'sunulan\s+ürün\s+gruplari\s*/?\s*kampanyalar\s*:\s*([^:]*?)(?=\s+fi[rı]mada\s+karşilaşilan|$)',
+     _optional_text_field("sunulan_urun_gruplari_kampanyalar")),
+    ("rakip_firma", r'fi[rı]mada\s+karşilaşilan\s+raki[bp]\s+fi[rı]ma\s+şartlari\s*:\s*([^:]*?)(?=\s+si[bp]ariş\s+alind[ıi]|$)',
+     _optional_text_field("rakip_firma_sartlari")),
+    ("siparis_alindi", r'si[bp]ariş\s+alind[ıi]\s+mi\s*\?\s*([^:]*?)(?=\s+yaklaşik|$)', _optional_text_field("siparis_alindi_mi")),
+    ("yaklasik_tutar", r'yaklaşik\s+si[bp]ariş\s+tutari\s*:\s*([^:]*?)(?=\s+si[bp]ariş\s+alinamayan|$)',
+     _optional_amount_field("yaklasik_siparis_tutari")),
+    ("genel_yorum", r'F[İI]RMA\s+HAKKINDA\s+GENEL\s+YORUM\s*:\s*(.*)', _general_comment_field),
+    ("siparis_alindi", r'S[İI]PAR[İI]Ş\s+ALINDI\s+M[İI]\?\s*(?:YAKLAŞIK\s+S[İI]PAR[İI]Ş\s+TUTARI\s*)?:\s*([^:]*?)(?=\n\s*[A-ZĞÜŞİÖÇ]|$)',
+     _combined_text_field("siparis_alindi_mi")),
+    ("yaklasik_tutar", r'YAKLAŞIK\s+S[İI]PAR[İI]Ş\s+TUTARI\s*:\s*([^:]*?)(?=\n\s*[A-ZĞÜŞİÖÇ]|$)',
+     _combined_amount_field("yaklasik_siparis_tutari")),
+]
+
+def _leading_chars(pattern: str) -> set:
+    """Desenin her '|' alternatifinin başlayabileceği karakterler.
+
+    Alternatif düz bir harf/rakam ya da basit bir karakter sınıfıyla ([cç]) başlamalıdır;
+    aksi halde ValueError - yeni token kapıyı sessizce atlatamaz.
+    """
+    chars = set()
+    for alternative in pattern.split('|'):
+        if alternative[:1] == '[' and ']' in alternative:
+            body = alternative[1:alternative.index(']')]
+            if body and not body.startswith('^') and '-' not in body and '\\' not in body:
+                chars.update(body)
+                continue
+        elif alternative[:1].isalnum():
+            chars.add(alternative[0])
+            continue
+        raise ValueError(f"Başlık token'ı düz bir karakterle başlamalı: {alternative!r}")
+    return chars
+
+
+# Token'ların ilk harfleri import sırasında HEADER_TOKENS'tan çıkarılır. Lookahead kapısı
+# sayesinde alternation sadece bu harflerde denenir (IGNORECASE büyük harfleri de kapsar).
+_TOKEN_LEADING_CHARS = "".join(sorted({char for pattern in HEADER_TOKENS.values() for char in _leading_chars(pattern)}))
+
+# Import sırasında bir kez derlenir
+_HEADER_SCANNER = re.compile(
+    f"(?=[{re.escape(_TOKEN_LEADING_CHARS)}])(?:"
+    + "|".join(f"(?P<{name}>{pattern})" for name, pattern in HEADER_TOKENS.items())
+    + ")",
+    re.IGNORECASE,
+)
+_COMPILED_RULES = [
+    (token, re.compile(pattern, re.IGNORECASE | (re.DOTALL if token == "genel_yorum" else 0)), handler)
+    for token, pattern, handler in FIELD_RULES
+]
+
+def parse_notlar_kv(notlar_text: str) -> dict:
+    """Notlar metninden key-value çiftlerini çıkarır.
+
+    Metin tek geçişte başlık token'ları için taranır; her alanın deseni yalnızca
+    kendi başlığının geçtiği konumlarda (anchored match) denenir.
+    """
+    if not notlar_text:
+        return {}
     
-    # Sipariş Alındı mı? ve Yaklaşık Sipariş Tutarı - iki alan birlikte yazılmış olabilir
-    order_match = re.search(r'S[İI]PAR[İI]Ş\s+ALINDI\s+M[İI]\?\s*(?:YAKLAŞIK\s+S[İI]PAR[İI]Ş\s+TUTARI\s*)?:\s*([^:]*?)(?=\n\s*[A-ZĞÜŞİÖÇ]|$)', notlar_text, re.IGNORECASE)
-    if order_match:
-        order_text = order_match.group(1).strip()
-        if order_text and order_text != "?":
-            kv['siparis_alindi_mi'] = order_text
+    positions = {}
+    for token in _HEADER_SCANNER.finditer(notlar_text):
+        positions.setdefault(token.lastgroup, []).append(token.start())
     
-    # Yaklaşık Sipariş Tutarı - ayrıca yazılmışsa
-    amount_match = re.search(r'YAKLAŞIK\s+S[İI]PAR[İI]Ş\s+TUTARI\s*:\s*([^:]*?)(?=\n\s*[A-ZĞÜŞİÖÇ]|$)', notlar_text, re.IGNORECASE)
-    if amount_match:
-        amount_text = amount_match.group(1).strip()
-        if amount_text and amount_text != "?":
-            raw_amount = amount_text
-            amount_value, amount_currency = parse_amount(raw_amount)
-            
-            kv['yaklasik_siparis_tutari_raw'] = raw_amount
-            kv['yaklasik_siparis_tutari_value'] = amount_value
-            kv['yaklasik_siparis_tutari_currency'] = amount_currency
+    kv = {}
+    for token, pattern, handler in _COMPILED_RULES:
+        for pos in positions.get(token, ()):
+            match = pattern.match(notlar_text, pos)
+            if match:
+                handler(kv, match)
+                break
     
     return kv
@@ -1,147 +1,428 @@
 import pdfplumber
 import re
 import os
-import tempfile
 import subprocess
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing
+from typing import Callable, Iterator
 from pdfminer.layout import LAParams
+from .text_cache import get_text_cache
 
-def read_pdf_text(path: str) -> str:
+# Çıkarım mantığı değiştiğinde artırılmalı - önbellek anahtarının parçasıdır
+EXTRACTOR_VERSION = "5"
+
+# OCR ayarları - sayfalar tek tek rasterize edilir, bellek kullanımı sayfa sayısından bağımsızdır
+OCR_DPI = 300
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", "1"))
+
+# pdftotext: aynı anda çalışan subprocess sayısı (sayfa aralıkları paralel okunur)
+PDFTOTEXT_WORKERS = int(os.getenv("PDFTOTEXT_WORKERS", "4"))
+
+# Erken çıkış: gerekli bölümler tamamlanınca kalan sayfalar okunmaz (0 = kapalı)
+PDF_EARLY_EXIT = os.getenv("PDF_EARLY_EXIT", "1").lower() not in ("0", "false", "no")
+
+# Optimize LAParams
+LAPARAMS_CONFIG = {
+    "char_margin": 1.0,
+    "line_margin": 0.3,
+    "word_margin": 0.1,
+    "boxes_flow": 0.5,
+    "detect_vertical": True,
+    "all_texts": True
+}
+
+def read_pdf_text(path: str, use_cache: bool = True) -> str:
     """
-    PDF metin okuma (4 aşamalı) - chunks ile:
+    PDF metin okuma (4 aşamalı, sayfa bazında):
     1. pdfplumber (optimize LAParams)
     2. PyMuPDF (fitz) 
     3. pdftotext (xpdf-utils)
     4. OCR (pytesseract)
+
+    Kalitesiz sayfalar tek tek bir sonraki motora aktarılır; iyi sayfalar tekrar okunmaz.
+
+    Sonuç, PDF içerik özeti + EXTRACTOR_VERSION + LAParams anahtarıyla
+    disk önbelleğinde tutulur; aynı PDF tekrar okunduğunda ayrıştırma yapılmaz.
     """
+    return _read_pdf_text_cached(path, use_cache)[0]
+
+def _read_pdf_text_cached(path: str, use_cache: bool = True) -> tuple[str, str | None]:
+    """Önbellek + tam okuma zinciri - (metin, motor) döndürür"""
+    cache, cache_key, cached = _lookup_text_cache(path, use_cache)
+    if cached is not None:
+        return cached["text"], cached.get("engine")
+    
+    text, engine = _read_pdf_text_uncached(path)
+    
+    # Başarısız okumalar (ör. eksik OCR modülü) önbelleğe alınmaz
+    if cache and cache_key and engine:
+        cache.put(cache_key, text, engine)
+    
+    return text, engine
+
+def _lookup_text_cache(path: str, use_cache: bool = True, params: dict = None):
+    """(önbellek, anahtar, kayıt) döndürür - kayıt yoksa None"""
+    cache = get_text_cache() if use_cache else None
+    if not cache:
+        return None, None, None
+    
+    try:
+        cache_key = cache.make_key(path, EXTRACTOR_VERSION, params or LAPARAMS_CONFIG)
+    except OSError as e:
+        print(f"[!] Önbellek anahtarı üretilemedi: {e}")
+        return cache, None, None
+    
+    cached = cache.get(cache_key)
+    if cached is not None:
+        print(f"[CACHE] Önbellekten okundu ({cached.get('engine')}): {os.path.basename(path)}")
+    return cache, cache_key, cached
+
+def read_pdf_text_until(path: str, is_complete: Callable[[str], bool], until_key: str,
+                        use_cache: bool = True) -> str:
+    """
+    Sayfaları sırayla okur, is_complete(metin) True döndüğü anda durur.
+
+    Sonuç, çağıranın verdiği until_key ile ayrı bir önbellek anahtarında tutulur; until_key
+    durma koşulunu tanımlamalı (ör. bitiş başlıkları + sürüm, bkz. sections.NOTLAR_UNTIL_KEY)
+    ve koşulun mantığı değiştiğinde değişmelidir. Akışta kalitesiz kalan sayfalar
+    (ör. taranmış başlık sayfası) tam zincirdeki gibi tek tek pdftotext ve OCR'a aktarılır;
+    metin yine de kalitesiz kalırsa tam okuma zincirine düşülür.
+    """
+    if not PDF_EARLY_EXIT:
+        return read_pdf_text(path, use_cache)
+    
+    params = {**LAPARAMS_CONFIG, "until": until_key}
+    cache, cache_key, cached = _lookup_text_cache(path, use_cache, params)
+    if cached is not None:
+        return cached["text"]
     
-    # 1️⃣ pdfplumber ile optimize extraction
     chunks = []
+    text = ""
+    try:
+        with closing(iter_page_texts(path)) as page_texts:
+            for page_text in page_texts:
+                chunks.append(page_text)
+                text = clean_text("\n".join(chunks))
+                if is_complete(text):
+                    print(f"[EARLY-EXIT] {len(chunks)}. sayfada gerekli bölümler tamamlandı")
+                    break
+    except Exception as e:
+        print(f"[!] Akışlı okuma hatası: {e}")
+        chunks = []
+    
+    engine = None
+    if chunks:
+        engines = ["stream" if is_page_text_good(chunk) else None for chunk in chunks]
+        engine = f"stream:{len(chunks)}"
+        if None in engines:
+            # Taranmış sayfalar (ör. firma/KONU başlığı) akışta denenmeyen motorlara aktarılır;
+            # PyMuPDF iter_page_texts içinde zaten denendi
+            _escalate_pages(path, chunks, engines, (("pdftotext", _pdftotext_pages),))
+            text = clean_text("\n".join(chunks))
+            engine = f"stream:{len(chunks)}:{_engine_summary(engines)}"
+        if None in engines and not is_text_quality_good(text, len(chunks)):
+            engine = None
+    
+    if engine is None:
+        text, engine = _read_pdf_text_cached(path, use_cache)
+    
+    if cache and cache_key and engine:
+        cache.put(cache_key, text, engine)
+    
+    return text
+
+def iter_page_texts(path: str) -> Iterator[str]:
+    """Sayfa metinlerini tembel üretir: pdfplumber, kalitesiz sayfada PyMuPDF denenir.
+
+    Tüketici durduğunda kalan sayfalar hiç ayrıştırılmaz.
+    """
+    custom_laparams = LAParams(**LAPARAMS_CONFIG)
+    fitz_doc = None
+    
     try:
-        # Optimize LAParams
-        custom_laparams = LAParams(
-            char_margin=1.0,
-            line_margin=0.3,
-            word_margin=0.1,
-            boxes_flow=0.5,
-            detect_vertical=True,
-            all_texts=True
-        )
-        
         with pdfplumber.open(path) as pdf:
-            print(f"[1] pdfplumber deneniyor... ({len(pdf.pages)} sayfa)")
-            
             for i, page in enumerate(pdf.pages):
-                try:
-                    # LAParams ile extraction
-                    text = page.extract_text(laparams=custom_laparams) or ""
-                    if not text:
-                        # Fallback - normal extraction
-                        text = page.extract_text(
-                            x_tolerance=5,
-                            y_tolerance=8,
-                            layout=False,
-                            keep_blank_chars=True,
-                            horizontal_ltr=True
-                        ) or ""
-                except (TypeError, Exception):
-                    # Son fallback
-                    text = page.extract_text() or ""
-                
-                chunks.append(text)
+                text = _extract_plumber_page(page, custom_laparams)
                 
-        full_text = "\n".join(chunks)
-        
-        # Kalite kontrolü
-        if is_text_quality_good(full_text, len(chunks)):
-            return clean_text(full_text)
-            
+                if not is_page_text_good(text):
+                    try:
+                        import fitz
+                        if fitz_doc is None:
+                            fitz_doc = fitz.open(path)
+                        fitz_text = _extract_fitz_page(fitz_doc[i])
+                        if len(fitz_text.strip()) > len(text.strip()):
+                            text = fitz_text
+                    except ImportError:
+                        pass
+                        
+                yield text
+    finally:
+        if fitz_doc is not None:
+            fitz_doc.close()
+
+def _read_pdf_text_uncached(path: str) -> tuple[str, str | None]:
+    """Sayfa bazlı motor zinciri - (temiz metin, motor özeti) döndürür.
+
+    Her sayfa ayrı puanlanır; yalnızca kalitesiz sayfalar bir sonraki (daha pahalı)
+    motora aktarılır: pdfplumber → PyMuPDF → pdftotext → OCR. Sonuç sayfa sırasıyla
+    birleştirilir.
+    """
+    pages = []    # Sayfa başına şimdiye kadarki en iyi metin
+    engines = []  # Sayfa başına kabul eden motor (None = henüz kalitesiz)
+    
+    # 1️⃣ pdfplumber ile optimize extraction
+    try:
+        _apply_page_results(pages, engines, _pdfplumber_pages(path), "pdfplumber")
     except Exception as e:
         print(f"[!] pdfplumber error: {e}")
 
-    # 2️⃣ PyMuPDF fallback
-    try:
-        import fitz
-        print("[2] PyMuPDF (fitz) deneniyor...")
-        
-        chunks = []
-        doc = fitz.open(path)
-        
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            # Daha iyi text extraction flags
-            text = page.get_text("text", 
-                               flags=fitz.TEXT_PRESERVE_LIGATURES | 
-                                     fitz.TEXT_PRESERVE_WHITESPACE | 
-                                     fitz.TEXT_DEHYPHENATE) or ""
-            chunks.append(text)
+    # 2️⃣ PyMuPDF, 3️⃣ pdftotext ve 4️⃣ OCR - sadece kalitesiz sayfalar
+    _escalate_pages(path, pages, engines, (("pymupdf", _pymupdf_pages), ("pdftotext", _pdftotext_pages)))
+
+    full_text = "\n".join(pages)
+    if not full_text.strip():
+        # Hiçbiri çalışmazsa boş döndür
+        print("[!] Tüm PDF okuma yöntemleri başarısız!")
+        return "", None
+    
+    engine = _engine_summary(engines)
+    if None in engines and not is_text_quality_good(full_text, len(pages)):
+        # Kısmi sonuç döner ama önbelleğe alınmaz (ör. OCR sonradan kurulabilir)
+        print(f"[!] {engines.count(None)} sayfa okunamadı - kısmi metin döndürülüyor")
+        engine = None
+    
+    return clean_text(full_text), engine
+
+def _escalate_pages(path: str, pages: list, engines: list, readers: tuple):
+    """Kabul edilmemiş sayfaları verilen motorlara, en son OCR'a sırayla aktarır (yerinde günceller)"""
+    for engine, reader in readers:
+        pending = _pending_pages(engines)
+        if pending == []:
+            return
+        try:
+            _apply_page_results(pages, engines, reader(path, pending), engine)
+        except ImportError:
+            print(f"[!] {engine} yüklü değil - atlanıyor")
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            print(f"[!] {engine} bulunamadı - atlanıyor")
+        except Exception as e:
+            print(f"[!] {engine} error: {e}")
+
+    # OCR fallback (son çare) - kalan kalitesiz sayfalar
+    pending = _pending_pages(engines)
+    if pending != []:
+        try:
+            import pytesseract  # noqa: F401 - eksikse OCR aşaması atlanır
+            from pdf2image import pdfinfo_from_path
             
-        doc.close()
-        full_text = "\n".join(chunks)
-        
-        if is_text_quality_good(full_text, len(chunks)):
-            return clean_text(full_text)
+            if pending is None:
+                page_count = int(pdfinfo_from_path(path)["Pages"])
+                pages.extend([""] * page_count)
+                engines.extend([None] * page_count)
+                pending = list(range(page_count))
             
-    except ImportError:
-        print("[!] PyMuPDF (fitz) yüklü değil - atlanıyor")
-    except Exception as e:
-        print(f"[!] PyMuPDF error: {e}")
+            print(f"[4] OCR (pytesseract) deneniyor... ({len(pending)}/{len(pages)} sayfa)")
+            
+            for page_no, text in _ocr_pages(path, [i + 1 for i in pending]):
+                pages[page_no - 1] = text
+                engines[page_no - 1] = "ocr"
+                
+        except ImportError:
+            print("[!] OCR modülleri yüklü değil - atlanıyor")
+        except Exception as e:
+            print(f"[!] OCR error: {e}")
 
-    # 3️⃣ pdftotext fallback
-    try:
-        print("[3] pdftotext deneniyor...")
+def _pending_pages(engines: list):
+    """Henüz kabul edilmemiş sayfa indeksleri (sayfa sayısı bilinmiyorsa None = tümü)"""
+    if not engines:
+        return None
+    return [i for i, engine in enumerate(engines) if engine is None]
+
+def _apply_page_results(pages: list, engines: list, results: dict, engine: str):
+    """Motor sonuçlarını sayfalara işler - kaliteli sayfalar kabul edilir,
+    diğerlerinde daha uzun metin bir sonraki motor için aday olarak tutulur."""
+    for i, text in sorted(results.items()):
+        while len(pages) <= i:
+            pages.append("")
+            engines.append(None)
+        if engines[i] is not None:
+            continue
+        if is_page_text_good(text):
+            pages[i] = text
+            engines[i] = engine
+        elif len(text.strip()) > len(pages[i].strip()):
+            pages[i] = text
+    
+    accepted = sum(1 for i in results if engines[i] == engine)
+    print(f"  {engine}: {accepted}/{len(results)} sayfa kabul edildi")
+
+def _engine_summary(engines: list) -> str:
+    """Sayfa motorlarının özeti: tek motor ise adı, değilse 'mixed(pdfplumber:3,ocr:1)'"""
+    counts = {}
+    for engine in engines:
+        name = engine or "none"
+        counts[name] = counts.get(name, 0) + 1
+    if len(counts) == 1:
+        return next(iter(counts))
+    return "mixed(" + ",".join(f"{name}:{count}" for name, count in counts.items()) + ")"
+
+def _pdfplumber_pages(path: str) -> dict:
+    """Tüm sayfaları optimize LAParams ile okur - {sayfa_indeksi: metin}"""
+    custom_laparams = LAParams(**LAPARAMS_CONFIG)
+    results = {}
+    
+    with pdfplumber.open(path) as pdf:
+        print(f"[1] pdfplumber deneniyor... ({len(pdf.pages)} sayfa)")
         
-        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as temp:
-            temp_filename = temp.name
-
-        subprocess.run(
-            ["pdftotext", "-layout", path, temp_filename],
-            check=True, 
-            stdout=subprocess.PIPE, 
-            stderr=subprocess.PIPE
-        )
-
-        with open(temp_filename, "r", encoding="utf-8", errors="ignore") as f:
-            full_text = f.read()
-            
-        # Cleanup
-        if os.path.exists(temp_filename):
-            os.remove(temp_filename)
-            
-        if is_text_quality_good(full_text, 1):  # pdftotext tüm sayfaları birleştirir
-            return clean_text(full_text)
+        for i, page in enumerate(pdf.pages):
+            results[i] = _extract_plumber_page(page, custom_laparams)
             
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("[!] pdftotext bulunamadı - atlanıyor")
-    except Exception as e:
-        print(f"[!] pdftotext error: {e}")
+    return results
 
-    # 4️⃣ OCR fallback (son çare)
+def _extract_plumber_page(page, laparams: LAParams) -> str:
+    """Tek pdfplumber sayfası - LAParams, olmazsa toleranslı/normal extraction"""
     try:
-        import pytesseract
-        from pdf2image import convert_from_path
-        
-        print("[4] OCR (pytesseract) deneniyor...")
-        
-        # PDF'i görüntülere çevir
-        images = convert_from_path(path, dpi=300)
-        chunks = []
+        # LAParams ile extraction
+        text = page.extract_text(laparams=laparams) or ""
+        if not text:
+            # Fallback - normal extraction
+            text = page.extract_text(
+                x_tolerance=5,
+                y_tolerance=8,
+                layout=False,
+                keep_blank_chars=True,
+                horizontal_ltr=True
+            ) or ""
+    except (TypeError, Exception):
+        # Son fallback
+        text = page.extract_text() or ""
+    return text
+
+def _pymupdf_pages(path: str, page_indices: list = None) -> dict:
+    """PyMuPDF ile verilen sayfaları okur (None = tümü) - {sayfa_indeksi: metin}"""
+    import fitz
+    
+    results = {}
+    doc = fitz.open(path)
+    try:
+        if page_indices is None:
+            page_indices = range(len(doc))
+        print(f"[2] PyMuPDF (fitz) deneniyor... ({len(page_indices)} sayfa)")
         
-        for i, img in enumerate(images):
-            print(f"  Sayfa {i+1}/{len(images)} OCR yapılıyor...")
-            text = pytesseract.image_to_string(img, lang="tur+eng")
-            chunks.append(text)
-            
-        full_text = "\n".join(chunks)
-        return clean_text(full_text)
+        for i in page_indices:
+            results[i] = _extract_fitz_page(doc[i])
+    finally:
+        doc.close()
         
-    except ImportError:
-        print("[!] OCR modülleri yüklü değil - atlanıyor")
-    except Exception as e:
-        print(f"[!] OCR error: {e}")
+    return results
 
-    # Hiçbiri çalışmazsa boş döndür
-    print("[!] Tüm PDF okuma yöntemleri başarısız!")
-    return ""
+def _extract_fitz_page(page) -> str:
+    """Tek PyMuPDF sayfası"""
+    import fitz
+    
+    # Daha iyi text extraction flags
+    return page.get_text("text",
+                         flags=fitz.TEXT_PRESERVE_LIGATURES |
+                               fitz.TEXT_PRESERVE_WHITESPACE |
+                               fitz.TEXT_DEHYPHENATE) or ""
+
+def _pdftotext_pages(path: str, page_indices: list = None) -> dict:
+    """pdftotext -layout ile verilen sayfaları okur (None = tümü) - {sayfa_indeksi: metin}
+
+    Çıktı geçici dosya yerine stdout'tan okunur. Ardışık sayfalar -f/-l aralıklarına
+    gruplanır, aralıklar ayrı subprocess'lerde eşzamanlı çalışır.
+    """
+    if page_indices is None:
+        print("[3] pdftotext deneniyor...")
+        page_chunks = _run_pdftotext(path)
+        return dict(enumerate(page_chunks))
+    
+    ranges = _page_ranges(page_indices)
+    print(f"[3] pdftotext deneniyor... ({len(page_indices)} sayfa, {len(ranges)} aralık)")
+    
+    results = {}
+    workers = min(PDFTOTEXT_WORKERS, len(ranges))
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        chunk_lists = executor.map(lambda r: _run_pdftotext(path, r[0] + 1, r[1] + 1), ranges)
+        for (first, _), page_chunks in zip(ranges, chunk_lists):
+            for offset, text in enumerate(page_chunks):
+                results[first + offset] = text
+    return results
+
+def _page_ranges(page_indices: list) -> list:
+    """[0, 1, 2, 5, 7, 8] -> [(0, 2), (5, 5), (7, 8)]"""
+    ranges = []
+    for i in sorted(page_indices):
+        if ranges and i == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], i)
+        else:
+            ranges.append((i, i))
+    return ranges
+
+def _run_pdftotext(path: str, first_page: int = None, last_page: int = None) -> list:
+    """pdftotext çıktısını stdout'tan okur ve form feed'den sayfalara böler"""
+    cmd = ["pdftotext", "-layout"]
+    if first_page is not None:
+        cmd += ["-f", str(first_page), "-l", str(last_page)]
+    cmd += [path, "-"]
+    
+    completed = subprocess.run(
+        cmd,
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    full_text = completed.stdout.decode("utf-8", errors="ignore")
+    
+    # pdftotext her sayfanın sonuna \f koyar
+    page_chunks = full_text.split("\f")
+    if page_chunks and not page_chunks[-1].strip():
+        page_chunks.pop()
+    return page_chunks
+
+def _ocr_page(path: str, page_no: int) -> str:
+    """Tek sayfayı rasterize edip OCR yapar - görüntü iş bitince serbest bırakılır"""
+    import pytesseract
+    from pdf2image import convert_from_path
+    
+    images = convert_from_path(path, dpi=OCR_DPI, first_page=page_no, last_page=page_no)
+    try:
+        return "\n".join(pytesseract.image_to_string(img, lang="tur+eng") for img in images)
+    finally:
+        for img in images:
+            img.close()
+
+def _ocr_pages(path: str, page_numbers: list, workers: int = None):
+    """Sayfaları sırayla (veya process havuzunda) OCR yapar, (sayfa_no, metin) üretir.
+
+    Bellekte aynı anda en fazla worker sayısı kadar sayfa görüntüsü bulunur.
+    """
+    workers = workers or OCR_WORKERS
+    total = len(page_numbers)
+    
+    if workers <= 1 or total <= 1:
+        for i, page_no in enumerate(page_numbers, 1):
+            print(f"  Sayfa {page_no} OCR yapılıyor... ({i}/{total})")
+            yield page_no, _ocr_page(path, page_no)
+        return
+    
+    print(f"  {total} sayfa {min(workers, total)} process ile OCR yapılıyor...")
+    with ProcessPoolExecutor(max_workers=min(workers, total)) as executor:
+        for page_no, text in zip(page_numbers, executor.map(_ocr_page, [path] * total, page_numbers)):
+            yield page_no, text
+
+def read_pdf_header_text(path: str, max_pages: int = 1) -> str:
+    """Sadece ilk sayfa(lar)ı hızlıca okur - tarih/başlık ön filtresi için.
+
+    LAParams düzen analizi ve fallback zinciri çalıştırılmaz; hata durumunda boş döner.
+    """
+    try:
+        with pdfplumber.open(path) as pdf:
+            chunks = [page.extract_text() or "" for page in pdf.pages[:max_pages]]
+        return clean_text("\n".join(chunks))
+    except Exception as e:
+        print(f"[!] Başlık okunamadı: {e}")
+        return ""
 
 def is_text_quality_good(text: str, page_count: int) -> bool:
     """Metin kalitesini değerlendir - gelişmiş kriterler"""
@@ -177,6 +458,33 @@ def is_text_quality_good(text: str, page_count: int) -> bool:
     # Varsayılan: yeterli uzunluk varsa kabul et
     return avg_chars_per_page >= 200
 
+# Sayfa bazlı kalite: kısa ama gerçek metin katmanı olan sayfalar (imza, kapak) kabul edilir
+PAGE_MIN_ALNUM_CHARS = 3
+PAGE_MAX_GARBAGE_RATIO = 0.2
+PAGE_MIN_ALNUM_RATIO = 0.3
+_CID_PATTERN = re.compile(r"\(cid:\d+\)")
+
+def is_page_text_good(text: str) -> bool:
+    """Tek sayfanın metin katmanı kullanılabilir mi? (boş veya bozuk sayfalar sonraki motora)
+
+    Belge geneli eşikleri (is_text_quality_good) sayfaya uygulanmaz: kısa dijital sayfalar
+    kabul edilir; sadece boş sayfalar ve çözülemeyen glifler ((cid:N), U+FFFD, kontrol
+    karakterleri) ağırlıklı sayfalar reddedilir.
+    """
+    compact = "".join((text or "").split())
+    if not compact:
+        return False
+    
+    without_cid = _CID_PATTERN.sub("", compact)
+    garbage = (len(compact) - len(without_cid)) + sum(
+        1 for c in without_cid if c == "\ufffd" or not c.isprintable()
+    )
+    if garbage / len(compact) > PAGE_MAX_GARBAGE_RATIO:
+        return False
+    
+    alnum = sum(1 for c in without_cid if c.isalnum())
+    return alnum >= PAGE_MIN_ALNUM_CHARS and alnum / len(compact) >= PAGE_MIN_ALNUM_RATIO
+
 def clean_text(text: str) -> str:
     """Metni temizle ve normalize et"""
     if not text:
@@ -27,6 +27,21 @@ def extract_firma_adi(text: str) -> str | None:
     
     return None
 
+# Akışlı okumanın durma başlıkları. extract_notlar_block MUTABAKAT DURUMU'nu nerede olursa
+# olsun tercih eder; Görevler/Ekler'den sonra da not devam edebileceği için onlarda durulmaz
+NOTLAR_END_MARKERS = ('MUTABAKAT DURUMU',)
+
+# Durma koşulunun önbellek anahtarı (read_pdf_text_until) - koşul değişince sürümü artırın
+NOTLAR_UNTIL_KEY = f"notlar-v2:{'|'.join(NOTLAR_END_MARKERS)}"
+
+def is_notlar_complete(text: str) -> bool:
+    """Notlar başlığı ve ardından bir bitiş başlığı görüldü mü? (akışlı okuma için durma koşulu)"""
+    notlar_start = re.search(r'\bNotlar\b', text, re.IGNORECASE)
+    if not notlar_start:
+        return False
+    text_after_notlar = text[notlar_start.end():]
+    return any(marker in text_after_notlar for marker in NOTLAR_END_MARKERS)
+
 def extract_notlar_block(text: str) -> str:
     """PDF'den NOTLAR bölümünü çıkarır"""
     
@@ -0,0 +1,126 @@
+"""
+PDF metin çıkarımı için içerik adresli disk önbelleği.
+
+Anahtar: PDF içeriğinin SHA-256 özeti + extractor sürümü + LAParams.
+Değer: temizlenmiş metin ve motor özeti (pdfplumber/pymupdf/pdftotext/ocr veya
+sayfa bazında karışık ise "mixed(pdfplumber:3,ocr:1)").
+Boyut sınırı aşılınca en az kullanılan (mtime'a göre) kayıtlar silinir. Klasör her
+put'ta taranmaz: toplam boyut bellekte izlenir, tam tarama yalnızca ilk yazımda ve
+izlenen toplam sınırı aştığında yapılır.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / ".cache" / "pdf_text"
+DEFAULT_MAX_MB = 512
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Dosya içeriğinin SHA-256 özetini parça parça hesaplar"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PDFTextCache:
+    """Çıkarılmış PDF metinlerini saklayan, boyut sınırlı LRU disk önbelleği"""
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        """
+        Args:
+            cache_dir: Önbellek klasörü (varsayılan: env PDF_TEXT_CACHE_DIR veya .cache/pdf_text)
+            max_bytes: Toplam boyut sınırı (varsayılan: env PDF_TEXT_CACHE_MAX_MB, 512 MB)
+        """
+        self.cache_dir = Path(cache_dir or os.getenv("PDF_TEXT_CACHE_DIR", str(DEFAULT_CACHE_DIR)))
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("PDF_TEXT_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        # Son taramadan beri bu süreçte yazılanlarla güncellenen yaklaşık toplam boyut
+        self._tracked_bytes = None
+
+    def make_key(self, pdf_path: str, version: str, params: Dict[str, Any]) -> str:
+        """PDF içeriği + extractor sürümü + parametrelerden önbellek anahtarı üretir"""
+        params_json = json.dumps(params, sort_keys=True, default=str)
+        key_source = f"{file_sha256(pdf_path)}|{version}|{params_json}"
+        return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Kayıt varsa {'text', 'engine'} döndürür ve LRU için erişim zamanını günceller"""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(entry_path, None)
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, text: str, engine: str):
+        """Kaydı atomik olarak yazar, ardından boyut sınırını uygular"""
+        entry_path = self._entry_path(key)
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            # Paralel worker'lar için: önce geçici dosyaya yaz, sonra yer değiştir
+            fd, temp_path = tempfile.mkstemp(dir=entry_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"text": text, "engine": engine}, f, ensure_ascii=False)
+            os.replace(temp_path, entry_path)
+            size = entry_path.stat().st_size
+        except OSError as e:
+            print(f"[WARNING] PDF metin önbelleğine yazılamadı: {e}")
+            return
+
+        if self._tracked_bytes is not None:
+            self._tracked_bytes += size
+            if self._tracked_bytes <= self.max_bytes:
+                return
+        self._evict()
+
+    def _evict(self):
+        """Klasörü tarar, sınır aşıldıysa en eski erişilen kayıtları siler ve izlenen toplamı yeniler"""
+        entries = []
+        total = 0
+        for entry_path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+            total += stat.st_size
+
+        self._tracked_bytes = total
+        if total <= self.max_bytes:
+            return
+
+        for _, size, entry_path in sorted(entries):
+            try:
+                entry_path.unlink()
+            except OSError:
+                continue
+            total -= size
+            self._tracked_bytes = total
+            if total <= self.max_bytes:
+                break
+
+
+_default_cache = None
+
+
+def get_text_cache() -> Optional[PDFTextCache]:
+    """Paylaşılan önbellek örneği (PDF_TEXT_CACHE=0 ise None)"""
+    global _default_cache
+    if os.getenv("PDF_TEXT_CACHE", "1").lower() in ("0", "false", "no"):
+        return None
+    if _default_cache is None:
+        _default_cache = PDFTextCache()
+    return _default_cache
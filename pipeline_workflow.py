@@ -11,6 +11,22 @@ Bu modül tüm sistemi baştan sona otomatik çalıştırır:
 
 ÖNEMLI: Seçilen ay parametresi tüm modüllerde tutarlı kullanılır.
 
+Adımlar bağımlılık grafiği olarak çalışır: 1 ve 2 birbirinden bağımsızdır ve aynı anda
+başlar; 3, 2'yi; 4, 1 ve 3'ü bekler (bkz. PIPELINE_GRAPH).
+
+Artımlı çalıştırma: Her adım girdilerini (PDF seti, Excel dosyaları, campaigns.py), kod
+dosyalarını ve çıktılarını bildirir. Parmak izi son başarılı çalıştırmayla aynıysa ve
+çıktılar aynı içerikle duruyorsa adım atlanır (bkz. utils/build_manifest.py). --force hepsini yeniden çalıştırır.
+
+Çok şirket × çok ay modu (--months 7-9 --companies all, bkz. PipelineFanout): PDF'ler bir kez
+çıkarılır, ziyaretler şirket ve aya göre bölünür, satış küpü ve finansal kayıtlar bir kez
+hazırlanır; her şirket-ay için KPI ve final rapor sınırlı bir iş havuzunda eşzamanlı üretilir.
+
+Çalıştırma modları (--execution veya env PIPELINE_EXECUTION):
+- inprocess (varsayılan): Adımlar aynı interpreter'da main() çağrısı olarak çalışır;
+  import'lar, .env, LLM istemcisi ve Excel/PDF önbellekleri adımlar arasında paylaşılır
+- subprocess: Her adım ayrı Python süreci (eski davranış, 10 dk timeout)
+
 Author: System Designer
 Date: 2025-09-09
 """
@@ -18,29 +34,68 @@ Date: 2025-09-09
 import os
 import sys
 import time
+import json
 import argparse
+import importlib
 import subprocess
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 
 # Ana dizin referansı
 BASE_DIR = Path(__file__).parent
 PROJECT_ROOT = Path(r"C:\Users\acer\Desktop\NORM HOLDING")
 
+sys.path.append(str(BASE_DIR))
+from utils.build_manifest import BuildManifest
+
+EXECUTION_MODES = ("inprocess", "subprocess")
+
+MONTH_NAMES = {
+    1: "Ocak", 2: "Şubat", 3: "Mart", 4: "Nisan", 5: "Mayıs", 6: "Haziran",
+    7: "Temmuz", 8: "Ağustos", 9: "Eylül", 10: "Ekim", 11: "Kasım", 12: "Aralık"
+}
+
+# PDF klasörü adayları (ilk PDF içeren klasör kullanılır)
+PDF_DIR_CANDIDATES = [
+    PROJECT_ROOT / "crmyapayzekamodlrnekdataset" / "pdfs",
+    PROJECT_ROOT / "PDFs",
+    PROJECT_ROOT / "Documents",
+    BASE_DIR / "pdfs"
+]
+
+# Adım bağımlılık grafiği (topolojik sırada): adım -> (açıklama, metod, bağımlılıklar)
+# runner_monthly ∥ sales_performance → financial_analysis → final_assembler
+PIPELINE_GRAPH = {
+    "runner_monthly": ("1️⃣ PDF Analizi", "step1_runner_monthly", ()),
+    "sales_performance": ("2️⃣ Satış Analizi", "step2_sales_performance", ()),
+    "financial_analysis": ("3️⃣ Finansal Analiz", "step3_financial_analysis", ("sales_performance",)),
+    "final_assembler": ("4️⃣ Final Birleştirme", "step4_final_assembler", ("runner_monthly", "financial_analysis")),
+}
+
 class PipelineWorkflow:
     """Tüm sistemi baştan sona çalıştıran pipeline sınıfı"""
     
-    def __init__(self, month: int, year: int = 2025, company_name: Optional[str] = None):
+    def __init__(self, month: int, year: int = 2025, company_name: Optional[str] = None,
+                 execution: Optional[str] = None, force: bool = False):
         """
         Args:
             month: Hedef ay (1-12, ZORUNLU)
             year: Hedef yıl (varsayılan: 2025)
             company_name: Şirket adı (opsiyonel, otomatik tespit edilir)
+            execution: inprocess veya subprocess (varsayılan: env PIPELINE_EXECUTION, inprocess)
+            force: Girdiler değişmemiş olsa bile tüm adımları yeniden çalıştır
         """
         self.month = month
         self.year = year
         self.company_name = company_name
+        self.execution = (execution or os.getenv("PIPELINE_EXECUTION", "inprocess")).lower()
+        if self.execution not in EXECUTION_MODES:
+            raise ValueError(f"Geçersiz çalıştırma modu: {self.execution} ({', '.join(EXECUTION_MODES)})")
+        self.force = force
+        self.manifest = BuildManifest()
+        self.fingerprints = {}
         self.start_time = time.time()
         
         # Ay isimlerini tanımla
@@ -64,6 +119,7 @@ class PipelineWorkflow:
         print(f"{'='*80}")
         print(f"[DATE] Hedef Dönem: {self.month_name} {self.year} (Ay: {self.month})")
         print(f"[COMPANY] Şirket: {self.company_name or 'Otomatik Tespit'}")
+        print(f"[TOOL] Çalıştırma Modu: {self.execution}")
         print(f"[TIME] Başlangıç: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"{'='*80}\n")
     
@@ -71,7 +127,7 @@ class PipelineWorkflow:
         """Alt işlem çalıştır ve sonucu kaydet"""
         step_start = time.time()
         
-        print(f"\n[STEP] ADIM {len([r for r in self.results.values() if r['success']]) + 1}: {step_name.upper()}")
+        print(f"\n[STEP] ADIM {list(PIPELINE_GRAPH).index(step_name) + 1}: {step_name.upper()}")
         print(f"[TOOL] Komut: {' '.join(command)}")
         print(f"[FOLDER] Dizin: {cwd or 'Mevcut'}")
         print("-" * 60)
@@ -133,31 +189,140 @@ class PipelineWorkflow:
             print(f"[FAILED] {step_name} EXCEPTION ({duration:.1f}s): {e}")
             return False
     
-    def step1_runner_monthly(self) -> bool:
-        """Adım 1: PDF analizi ve KPI JSON oluşturma"""
+    def _run_step(self, step_name: str, module_name: str, argv: List[str], script: str = None) -> bool:
+        """Adımı seçili modda çalıştır: modül main(argv) çağrısı veya ayrı süreç"""
+        if self.execution == "subprocess":
+            target = [script] if script else ["-m", module_name]
+            return self._run_command(step_name, [sys.executable, *target, *argv])
+        return self._run_inprocess(step_name, module_name, argv)
+    
+    def _run_inprocess(self, step_name: str, module_name: str, argv: List[str]) -> bool:
+        """Modülün main(argv) fonksiyonunu aynı interpreter'da çalıştır ve sonucu kaydet
         
-        # PDF klasörü otomatik tespit
-        pdf_dirs = [
-            PROJECT_ROOT / "crmyapayzekamodlrnekdataset" / "pdfs",
-            PROJECT_ROOT / "PDFs",
-            PROJECT_ROOT / "Documents",
-            BASE_DIR / "pdfs"
-        ]
+        Hatalar (SystemExit dahil) adım içinde yakalanır; sonraki adımlar ve süreç etkilenmez.
+        """
+        step_start = time.time()
+        
+        print(f"\n[STEP] ADIM {list(PIPELINE_GRAPH).index(step_name) + 1}: {step_name.upper()}")
+        print(f"[TOOL] Çağrı: {module_name}.main({argv})")
+        print("-" * 60)
+        
+        try:
+            if str(BASE_DIR) not in sys.path:
+                sys.path.insert(0, str(BASE_DIR))
+            module = importlib.import_module(module_name)
+            module.main(argv)
+            exit_code = 0
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception as e:
+            duration = time.time() - step_start
+            self.results[step_name]["success"] = False
+            self.results[step_name]["duration"] = duration
+            self.results[step_name]["message"] = f"Exception: {str(e)}"
+            print(f"[FAILED] {step_name} EXCEPTION ({duration:.1f}s): {e}")
+            return False
+        
+        duration = time.time() - step_start
+        self.results[step_name]["duration"] = duration
         
-        pdf_dir = None
-        for pd in pdf_dirs:
+        if exit_code == 0:
+            self.results[step_name]["success"] = True
+            self.results[step_name]["message"] = "Başarılı"
+            print(f"[SUCCESS] {step_name} BAŞARILI ({duration:.1f}s)")
+            return True
+        
+        self.results[step_name]["success"] = False
+        self.results[step_name]["message"] = f"Hata (kod: {exit_code})"
+        print(f"[ERROR] {step_name} BAŞARISIZ ({duration:.1f}s)")
+        return False
+    
+    @staticmethod
+    def _find_pdf_dir() -> Optional[str]:
+        """PDF klasörü otomatik tespit (PDF içeren ilk aday klasör)"""
+        for pd in PDF_DIR_CANDIDATES:
             if pd.exists() and any(pd.glob("*.pdf")):
-                pdf_dir = str(pd)
-                break
+                return str(pd)
+        return None
+    
+    def _step_spec(self, step_name: str) -> Dict[str, Any]:
+        """Adımın girdileri, kod dosyaları, parametreleri ve çıktı desenleri (artımlı çalıştırma için)"""
+        datas_base = Path(os.getenv('DATAS_BASE', r"c:\Users\acer\Desktop\NORM HOLDING\datasforfinalblock"))
+        reports_base = Path(os.getenv('REPORTS_BASE', str(BASE_DIR.parent / "Reports" / "Monthly")))
+        campaigns = [BASE_DIR / "extractor" / "campaigns.py"]
+        excel_code = [BASE_DIR / "analyzer" / "excel_reader.py", BASE_DIR / "analyzer" / "workbook_cache.py"]
+        params = {"month": self.month, "year": self.year, "company_name": self.company_name}
+        
+        if step_name == "runner_monthly":
+            pdf_dir = self._find_pdf_dir()
+            pdfs = [p for ext in ("*.pdf", "*.PDF") for p in Path(pdf_dir).glob(ext)] if pdf_dir else []
+            return {
+                "inputs": pdfs + campaigns,
+                "code": [BASE_DIR / "runners" / "runner_monthly.py",
+                         *(BASE_DIR / "extractor").glob("*.py"), *(BASE_DIR / "utils").glob("*.py")],
+                "params": {**params, "pdf_dir": pdf_dir, "llm": True},
+                "outputs": [(reports_base, f"*/{self.month:02d}-{self.month_name}/"
+                                           f"NormVision_KPI_*_{self.month_name}_{self.year}_*.json")],
+            }
+        if step_name == "sales_performance":
+            return {
+                "inputs": [datas_base / "Musteri_Ciro_Raporu.xlsx",
+                           *datas_base.glob("Şirinler Bağlantı El. * Gerçekleşen .xlsx")],
+                "code": [BASE_DIR / "analyzer" / "sales_performance.py", *excel_code],
+                "params": params,
+                "outputs": [(datas_base, "LLM_Input_Satis_Analizi.json"), (datas_base, "Satis_Analizi_Detay.xlsx")],
+            }
+        if step_name == "financial_analysis":
+            # Satış JSON'u yerinde zenginleştirildiği için içeriği değil, satış adımının parmak izi girdidir
+            return {
+                "inputs": [datas_base / "Musteri_Ortalama_Vade_Raporu.xlsx",
+                           datas_base / "Yuruyen_Bakiyeli_Musteri_Ekstresi.xlsx"],
+                "code": [BASE_DIR / "analyzer" / "financial_analysis.py", *excel_code,
+                         BASE_DIR / "utils" / "amount_utils.py", BASE_DIR / "utils" / "company_name_utils.py"],
+                "params": params,
+                "outputs": [(datas_base, "LLM_Input_Satis_Analizi.json")],
+            }
+        return {
+            "inputs": campaigns,
+            "code": [*(BASE_DIR / "bridge").glob("*.py"), BASE_DIR / "utils" / "company_name_utils.py"],
+            "params": params,
+            "outputs": [(datas_base, "Final_Report_*.json"), (datas_base, "*/Final_Report_*.json")],
+        }
+    
+    def _step_id(self, step_name: str) -> str:
+        return f"{self.year}-{self.month:02d}/{self.company_name or 'auto'}/{step_name}"
+    
+    def _fingerprint(self, step_name: str) -> str:
+        """Adım parmak izi; bağımlı adımların bu çalıştırmadaki parmak izlerini içerir"""
+        spec = self._step_spec(step_name)
+        deps = PIPELINE_GRAPH[step_name][2]
+        return self.manifest.fingerprint(
+            [str(p) for p in spec["inputs"]], [str(p) for p in spec["code"]], spec["params"],
+            {dep: self.fingerprints[dep] for dep in deps}
+        )
+    
+    def _collect_outputs(self, step_name: str, started_at: float) -> List[str]:
+        """Adımın çalıştırma sırasında yazdığı çıktı dosyaları"""
+        outputs = []
+        for base, pattern in self._step_spec(step_name)["outputs"]:
+            for path in Path(base).glob(pattern):
+                # Dosya sistemi zaman çözünürlüğü için 1 sn tolerans
+                if path.stat().st_mtime >= started_at - 1:
+                    outputs.append(str(path))
+        return outputs
+    
+    def step1_runner_monthly(self) -> bool:
+        """Adım 1: PDF analizi ve KPI JSON oluşturma"""
+        
+        pdf_dir = self._find_pdf_dir()
         
         if not pdf_dir:
             print(f"[ERROR] PDF klasörü bulunamadı. Kontrol edilen yerler:")
-            for pd in pdf_dirs:
+            for pd in PDF_DIR_CANDIDATES:
                 print(f"   - {pd}")
             return False
         
-        command = [
-            sys.executable, "runners/runner_monthly.py",
+        argv = [
             "--input-dir", pdf_dir,
             "--month", str(self.month),
             "--year", str(self.year),
@@ -165,25 +330,17 @@ class PipelineWorkflow:
             "--llm"
         ]
         
-        return self._run_command("runner_monthly", command)
+        return self._run_step("runner_monthly", "runners.runner_monthly", argv, script="runners/runner_monthly.py")
     
     def step2_sales_performance(self) -> bool:
         """Adım 2: Excel analizi ve satış JSON oluşturma"""
         
-        command = [
-            sys.executable, "-m", "analyzer.sales_performance"
-        ]
-        
-        return self._run_command("sales_performance", command)
+        return self._run_step("sales_performance", "analyzer.sales_performance", [])
     
     def step3_financial_analysis(self) -> bool:
         """Adım 3: Finansal zenginleştirme"""
         
-        command = [
-            sys.executable, "-m", "analyzer.financial_analysis"
-        ]
-        
-        return self._run_command("financial_analysis", command)
+        return self._run_step("financial_analysis", "analyzer.financial_analysis", [])
     
     def step4_final_assembler(self) -> bool:
         """Adım 4: Final rapor birleştirme (AY PARAMETRESİ TUTARLI)"""
@@ -240,37 +397,88 @@ class PipelineWorkflow:
             return False
     
     def run_complete_pipeline(self) -> bool:
-        """Tüm pipeline'ı baştan sona çalıştır"""
+        """Tüm pipeline'ı bağımlılık grafiğine göre çalıştır - hazır adımlar eşzamanlı başlar"""
         
-        steps = [
-            ("1️⃣ PDF Analizi", self.step1_runner_monthly),
-            ("2️⃣ Satış Analizi", self.step2_sales_performance), 
-            ("3️⃣ Finansal Analiz", self.step3_financial_analysis),
-            ("4️⃣ Final Birleştirme", self.step4_final_assembler)
-        ]
+        pending = dict(PIPELINE_GRAPH)
+        finished = {}  # adım -> başarı durumu
+        running = {}   # future -> adım
+        started_at = {}
         
-        overall_success = True
+        with ThreadPoolExecutor(max_workers=len(PIPELINE_GRAPH)) as executor:
+            while pending or running:
+                for step_name, (step_desc, method_name, deps) in list(pending.items()):
+                    if any(finished.get(dep) is False for dep in deps):
+                        # Başarısız adıma bağlı adımlar çalıştırılmaz
+                        del pending[step_name]
+                        finished[step_name] = False
+                        self.results[step_name]["message"] = "Atlandı (bağımlı adım başarısız)"
+                        print(f"\n[WARNING] {step_desc} atlandı: bağımlı olduğu adım başarısız.")
+                    elif all(finished.get(dep) for dep in deps):
+                        del pending[step_name]
+                        self.fingerprints[step_name] = self._fingerprint(step_name)
+                        if not self.force and self.manifest.is_fresh(self._step_id(step_name), self.fingerprints[step_name]):
+                            finished[step_name] = True
+                            self.results[step_name]["success"] = True
+                            self.results[step_name]["message"] = "Güncel - atlandı (girdiler değişmedi)"
+                            print(f"\n[SKIP] {step_desc} güncel, atlandı.")
+                            continue
+                        print(f"\n[PROCESS] {step_desc} başlatılıyor...")
+                        started_at[step_name] = time.time()
+                        running[executor.submit(getattr(self, method_name))] = step_name
+                
+                if not running:
+                    continue
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step_name = running.pop(future)
+                    step_desc = PIPELINE_GRAPH[step_name][0]
+                    try:
+                        step_success = bool(future.result())
+                    except Exception as e:
+                        step_success = False
+                        self.results[step_name]["message"] = f"Exception: {str(e)}"
+                    finished[step_name] = step_success
+                    
+                    if step_success:
+                        outputs = self._collect_outputs(step_name, started_at[step_name])
+                        self.manifest.record(self._step_id(step_name), self.fingerprints[step_name], outputs)
+                        self.manifest.save()
+                        print(f"[SUCCESS] {step_desc} tamamlandı.")
+                    else:
+                        print(f"\n[WARNING] {step_desc} başarısız oldu. Bağımlı adımlar çalıştırılmayacak.")
         
-        for step_desc, step_func in steps:
-            print(f"\n[PROCESS] {step_desc} başlatılıyor...")
-            
-            step_success = step_func()
-            
-            if not step_success:
-                print(f"\n[WARNING] {step_desc} başarısız oldu. Pipeline durduruluyor.")
-                overall_success = False
-                break
-            
-            print(f"[SUCCESS] {step_desc} tamamlandı.")
-            
-            # Adımlar arası kısa bekleme
-            time.sleep(1)
+        overall_success = all(finished.get(step_name) for step_name in PIPELINE_GRAPH)
+        
+        # Sonraki adımlar çıktıları yerinde değiştirmiş olabilir (satış JSON'u): kayıtlı özetleri
+        # çalıştırma sonundaki içerikle eşitle, başka şirket/ay yazarsa adım bayat sayılır
+        for step_name in PIPELINE_GRAPH:
+            if finished.get(step_name):
+                self.manifest.refresh_outputs(self._step_id(step_name))
+        self.manifest.save()
         
         # Sonuç raporu
         self._print_final_report(overall_success)
         
         return overall_success
     
+    def _critical_path(self) -> Tuple[List[str], float]:
+        """Adım sürelerine göre grafikteki en uzun (kritik) yol ve süresi"""
+        finish = {}
+        previous = {}
+        for step_name, (_, _, deps) in PIPELINE_GRAPH.items():
+            slowest_dep = max(deps, key=lambda dep: finish[dep], default=None)
+            finish[step_name] = self.results[step_name]["duration"] + (finish[slowest_dep] if slowest_dep else 0)
+            previous[step_name] = slowest_dep
+        
+        step_name = max(finish, key=finish.get)
+        total = finish[step_name]
+        path = []
+        while step_name:
+            path.append(step_name)
+            step_name = previous[step_name]
+        return path[::-1], total
+    
     def _print_final_report(self, overall_success: bool):
         """Pipeline sonuç raporunu yazdır"""
         
@@ -289,6 +497,13 @@ class PipelineWorkflow:
             print(f"{status} {step_name.replace('_', ' ').title():20} | "
                   f"{result['duration']:6.1f}s | {result['message']}")
         
+        critical_path, critical_duration = self._critical_path()
+        sequential_duration = sum(result["duration"] for result in self.results.values())
+        print(f"-" * 80)
+        print(f"[TIMER] Kritik Yol: {' → '.join(step.replace('_', ' ').title() for step in critical_path)} "
+              f"| {critical_duration:.1f}s (sıralı toplam: {sequential_duration:.1f}s)")
+        _print_excel_throughput()
+        
         print(f"{'='*80}")
         
         if overall_success:
@@ -303,6 +518,281 @@ class PipelineWorkflow:
         print(f"{'='*80}\n")
 
 
+def _print_excel_throughput():
+    """Bu süreçte okunan Excel dosyalarının toplam satır/sn özeti (subprocess modunda adımlar ayrı süreçte okur)"""
+    from analyzer.workbook_cache import get_workbook_cache
+    
+    summary = get_workbook_cache().reader.summary()
+    print(f"[EXCEL] Okuma hızı: {summary or 'bu süreçte Excel okunmadı (önbellekten veya ayrı süreçte)'}")
+
+
+def parse_months(value: str) -> List[int]:
+    """Ay seçimi: aralık ("7-9"), liste ("7,9") veya tek ay ("8")"""
+    months = set()
+    for part in value.split(","):
+        part = part.strip()
+        try:
+            if "-" in part:
+                first, last = (int(v) for v in part.split("-", 1))
+                months.update(range(first, last + 1))
+            else:
+                months.add(int(part))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Geçersiz ay seçimi: {value}")
+    if not months or not all(1 <= m <= 12 for m in months):
+        raise argparse.ArgumentTypeError(f"Aylar 1-12 arası olmalıdır: {value}")
+    return sorted(months)
+
+
+def _extract_visit(item: Tuple[str, str]) -> Dict:
+    """Process havuzu işçisi: tek PDF'nin aylık rapor çıkarımı (pickle için modül seviyesinde)"""
+    from runners.runner_monthly import process_single_pdf_for_monthly
+    pdf_path, visit_date = item
+    return process_single_pdf_for_monthly(pdf_path, visit_date)
+
+
+class PipelineFanout:
+    """Çok şirket × çok ay modu
+    
+    PDF'ler bir kez çıkarılır ve ziyaretler (normalize şirket adı, ay) bölümlerine ayrılır.
+    Paylaşılan işler bir kez yapılır: satış küpü + ay başına satış analizi, tüm müşterilerin
+    finansal kayıtları (toplu mod). Her bölümün KPI JSON'u ve final raporu sınırlı bir iş
+    havuzunda eşzamanlı üretilir; bir bölümün hatası diğerlerini etkilemez.
+    """
+    
+    def __init__(self, months: List[int], year: int = 2025, companies: Optional[List[str]] = None,
+                 workers: Optional[int] = None):
+        """
+        Args:
+            months: Hedef aylar (1-12)
+            year: Hedef yıl (varsayılan: 2025)
+            companies: Şirket adları (None = PDF'lerdeki tüm şirketler)
+            workers: Eşzamanlı iş sayısı (varsayılan: env PIPELINE_FANOUT_WORKERS veya 4)
+        """
+        sys.path.append(str(BASE_DIR))
+        from utils.company_name_utils import normalize_company_name
+        
+        self.months = sorted(set(months))
+        self.year = year
+        self.companies = {normalize_company_name(c) for c in companies} if companies else None
+        self.workers = max(1, int(workers or os.getenv("PIPELINE_FANOUT_WORKERS", "4")))
+        self.datas_base = Path(os.getenv('DATAS_BASE', r"c:\Users\acer\Desktop\NORM HOLDING\datasforfinalblock"))
+        self.start_time = time.time()
+        
+        # (şirket, ay) -> {"success", "duration", "message", "visits"}
+        self.results = {}
+        
+        print(f"\n{'='*80}")
+        print(f"[START] NORM HOLDING PIPELINE FAN-OUT BAŞLATILIYOR")
+        print(f"{'='*80}")
+        print(f"[DATE] Hedef Aylar: {', '.join(str(m) for m in self.months)} / {self.year}")
+        print(f"[COMPANY] Şirketler: {', '.join(sorted(self.companies)) if self.companies else 'Tümü'}")
+        print(f"[TOOL] Eşzamanlı İş: {self.workers}")
+        print(f"{'='*80}\n")
+    
+    def extract_visits(self, pdf_dir: str) -> List[Dict]:
+        """Hedef aylara ait PDF'leri tek geçişte tarihler ve havuzda bir kez çıkarır"""
+        from runners.runner_monthly import resolve_visit_date
+        
+        pdf_files = sorted({p for ext in ("*.pdf", "*.PDF") for p in Path(pdf_dir).glob(ext)})
+        selected = []
+        for pdf_path in pdf_files:
+            visit_date = resolve_visit_date(pdf_path)
+            if visit_date == "Tarih Bulunamadı":
+                print(f"[DEBUG] Tarih bulunamadı, atlanıyor: {pdf_path.name}")
+                continue
+            date_obj = datetime.strptime(visit_date, '%Y-%m-%d')
+            if date_obj.year == self.year and date_obj.month in self.months:
+                selected.append((pdf_path, visit_date))
+        
+        print(f"[PROCESS] Ön filtre: {len(selected)}/{len(pdf_files)} PDF hedef aylara ait, çıkarılıyor...")
+        items = [(str(pdf_path), visit_date) for pdf_path, visit_date in selected]
+        if self.workers <= 1 or len(items) <= 1:
+            return [_extract_visit(item) for item in items]
+        
+        # Çıkarım CPU-bound: GIL'e takılmamak için process havuzu. Bir worker çökerse
+        # (ör. BrokenProcessPool) ilgili PDF'ler ERROR satırı olarak döner.
+        visits = []
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(_extract_visit, item) for item in items]
+            for (pdf_path, _), future in zip(items, futures):
+                try:
+                    visits.append(future.result())
+                except Exception as e:
+                    visits.append({
+                        'status': 'ERROR',
+                        'error_message': f"Worker hatası: {e}",
+                        'pdf_path': pdf_path,
+                        'elapsed_seconds': 0,
+                        'processed_at': datetime.now().isoformat()
+                    })
+        return visits
+    
+    def partition_visits(self, visits: List[Dict]) -> Dict[Tuple[str, int], List[Dict]]:
+        """Başarılı ziyaretleri (normalize şirket adı, ay) bölümlerine ayırır, şirket filtresini uygular"""
+        from runners.runner_monthly import visit_company_name
+        
+        partitions = {}
+        for visit in visits:
+            if visit['status'] != 'SUCCESS':
+                continue
+            try:
+                month = datetime.strptime(visit['data'].get('visit_date', ''), '%Y-%m-%d').month
+            except ValueError:
+                continue
+            company_name = visit_company_name(visit)
+            if self.companies and company_name not in self.companies:
+                continue
+            partitions.setdefault((company_name, month), []).append(visit)
+        
+        for partition_visits in partitions.values():
+            partition_visits.sort(key=lambda v: v['data']['visit_date'])
+        return dict(sorted(partitions.items()))
+    
+    def load_shared_data(self) -> Tuple[Dict[int, Dict], Dict[str, Dict]]:
+        """Tüm bölümlerin ortak girdileri (bir kez)
+        
+        Returns:
+            tuple: (ay -> satış analizi, normalize müşteri adı -> finansal kayıt)
+        """
+        from analyzer.sales_cube import SalesCube
+        from analyzer.sales_performance import create_llm_input_data
+        from analyzer.financial_analysis import FinancialAnalyzer
+        from utils.company_name_utils import normalize_company_name
+        
+        sales = {}
+        cube = SalesCube.load(str(self.datas_base), self.year)
+        for month in self.months:
+            month_name = MONTH_NAMES[month]
+            if month_name not in cube.available_months:
+                print(f"[WARNING] {month_name} {self.year} için gerçekleşen satış verisi yok")
+                continue
+            sales[month] = create_llm_input_data(cube.month(month_name), month_name, self.year)
+        
+        financial = {}
+        try:
+            for record in FinancialAnalyzer().generate_all_customers_financial_records():
+                financial.setdefault(normalize_company_name(str(record["musteri_adi"])), record)
+        except Exception as e:
+            print(f"[WARNING] Finansal kayıtlar oluşturulamadı, satış verisiyle devam ediliyor: {e}")
+        
+        print(f"[STATS] Paylaşılan veri: {len(sales)} ay satış analizi, {len(financial)} müşteri finansal kaydı")
+        return sales, financial
+    
+    def run_partition(self, company_name: str, month: int, visits: List[Dict],
+                      sales: Dict[int, Dict], financial: Dict[str, Dict]) -> bool:
+        """Tek şirket-ay bölümü: KPI JSON -> satış/finansal JSON -> final rapor"""
+        from runners.runner_monthly import write_monthly_company_report
+        from bridge.final_assembler import run_complete_final_assembly
+        
+        key = (company_name, month)
+        month_name = MONTH_NAMES[month]
+        
+        if month not in sales:
+            self.results[key]["message"] = "Satış verisi yok"
+            return False
+        
+        _, kpi_path = write_monthly_company_report(visits, company_name, month, self.year,
+                                                   str(BASE_DIR.parent), use_llm=True)
+        
+        # financial_analysis'in zenginleştirmesiyle aynı şekil: satış analizi + müşterinin finansal alanları
+        company_dir = self.datas_base / company_name
+        company_dir.mkdir(parents=True, exist_ok=True)
+        sales_financial_path = company_dir / f"LLM_Input_Satis_Analizi_{month_name}_{self.year}.json"
+        with open(sales_financial_path, 'w', encoding='utf-8') as f:
+            json.dump({**sales[month], "musteri_adi": company_name, **financial.get(company_name, {})},
+                      f, ensure_ascii=False, indent=2)
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        final_report, success = run_complete_final_assembly(
+            sales_financial_path=str(sales_financial_path),
+            kpi_path=str(kpi_path),
+            output_path=str(company_dir / f"Final_Report_{month_name}_{self.year}_{timestamp}.json"),
+            base_directory=str(BASE_DIR),
+            company_name=company_name,
+            month=month,
+            year=self.year
+        )
+        self.results[key]["message"] = "Başarılı" if success and final_report else "Final rapor oluşturulamadı"
+        return bool(success and final_report)
+    
+    def _run_partition_safe(self, company_name: str, month: int, visits: List[Dict],
+                            sales: Dict[int, Dict], financial: Dict[str, Dict]) -> bool:
+        """Bölümü çalıştır; hatalar bölüm içinde yakalanır ve süre kaydedilir"""
+        key = (company_name, month)
+        step_start = time.time()
+        try:
+            success = self.run_partition(company_name, month, visits, sales, financial)
+        except Exception as e:
+            success = False
+            self.results[key]["message"] = f"Exception: {str(e)}"
+        self.results[key]["success"] = success
+        self.results[key]["duration"] = time.time() - step_start
+        return success
+    
+    def run(self, pdf_dir: Optional[str] = None) -> bool:
+        """Çıkarım -> bölümleme -> paylaşılan veri -> bölümler (eşzamanlı) -> sonuç raporu"""
+        pdf_dir = pdf_dir or PipelineWorkflow._find_pdf_dir()
+        if not pdf_dir:
+            print(f"[ERROR] PDF klasörü bulunamadı. Kontrol edilen yerler:")
+            for pd in PDF_DIR_CANDIDATES:
+                print(f"   - {pd}")
+            return False
+        
+        partitions = self.partition_visits(self.extract_visits(pdf_dir))
+        if not partitions:
+            print(f"[ERROR] Seçilen şirket ve aylara ait ziyaret bulunamadı")
+            return False
+        print(f"[STATS] {len(partitions)} şirket-ay bölümü bulundu")
+        
+        sales, financial = self.load_shared_data()
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {}
+            for (company_name, month), visits in partitions.items():
+                self.results[(company_name, month)] = {"success": False, "duration": 0, "message": "",
+                                                       "visits": len(visits)}
+                future = executor.submit(self._run_partition_safe, company_name, month, visits, sales, financial)
+                futures[future] = (company_name, month)
+            
+            for future in as_completed(futures):
+                company_name, month = futures[future]
+                status = "[SUCCESS]" if future.result() else "[ERROR]"
+                print(f"{status} {company_name} / {MONTH_NAMES[month]}: {self.results[(company_name, month)]['message']}")
+        
+        overall_success = all(result["success"] for result in self.results.values())
+        self._print_final_report(overall_success)
+        return overall_success
+    
+    def _print_final_report(self, overall_success: bool):
+        """Fan-out sonuç raporunu yazdır"""
+        
+        total_duration = time.time() - self.start_time
+        succeeded = sum(1 for result in self.results.values() if result["success"])
+        
+        print(f"\n{'='*80}")
+        print(f"[STATS] PIPELINE FAN-OUT SONUÇ RAPORU")
+        print(f"{'='*80}")
+        print(f"[DATE] Aylar: {', '.join(MONTH_NAMES[m] for m in self.months)} {self.year}")
+        print(f"[TIMER] Toplam Süre: {total_duration:.1f} saniye "
+              f"(bölümlerin sıralı toplamı: {sum(r['duration'] for r in self.results.values()):.1f}s)")
+        print(f"[RESULT] Genel Sonuç: {succeeded}/{len(self.results)} bölüm başarılı")
+        print(f"-" * 80)
+        
+        for (company_name, month), result in self.results.items():
+            status = "[SUCCESS]" if result["success"] else "[ERROR]"
+            print(f"{status} {company_name[:30]:30} | {MONTH_NAMES[month]:8} | {result['visits']:3} ziyaret | "
+                  f"{result['duration']:6.1f}s | {result['message']}")
+        
+        print(f"-" * 80)
+        _print_excel_throughput()
+        
+        print(f"{'='*80}")
+        if overall_success:
+            print(f"[FOLDER] Sonuç dosyaları: datasforfinalblock/{{şirket}}/Final_Report_{{ay}}_{self.year}_*.json")
+        print(f"{'='*80}\n")
+
+
 def main():
     """Ana terminal arayüzü"""
     
@@ -314,21 +804,28 @@ KULLANIM ÖRNEKLERİ:
   python pipeline_workflow.py --month 9                    # Eylül ayı için
   python pipeline_workflow.py --month 7 --year 2025       # Temmuz 2025 için
   python pipeline_workflow.py --month 8 --company "Şirinler Bağlantı Elem"
+  python pipeline_workflow.py --months 7-9 --companies all   # Q3, tüm şirketler
+  python pipeline_workflow.py --months 7,8 --companies "A Ltd,B A.Ş." --workers 8
 
-ADIMLAR:
+ADIMLAR (1 ve 2 paralel çalışır):
   1. runner_monthly.py    - PDF analizi ve KPI JSON
   2. sales_performance.py - Excel analizi ve satış JSON  
-  3. financial_analysis.py - Finansal zenginleştirme
-  4. final_assembler.py   - Final rapor birleştirme
+  3. financial_analysis.py - Finansal zenginleştirme (2'den sonra)
+  4. final_assembler.py   - Final rapor birleştirme (1 ve 3'ten sonra)
         """
     )
     
-    parser.add_argument(
+    period = parser.add_mutually_exclusive_group(required=True)
+    period.add_argument(
         "--month", "-m", 
         type=int, 
-        required=True,
         choices=range(1, 13),
-        help="Hedef ay (1-12, ZORUNLU)"
+        help="Hedef ay (1-12)"
+    )
+    period.add_argument(
+        "--months",
+        type=parse_months,
+        help="Çok ay modu: aralık (7-9) veya liste (7,8,9); şirket-ay bölümleri eşzamanlı işlenir"
     )
     
     parser.add_argument(
@@ -344,6 +841,30 @@ ADIMLAR:
         help="Şirket adı (opsiyonel, otomatik tespit edilir)"
     )
     
+    parser.add_argument(
+        "--companies",
+        default="all",
+        help="Çok ay modu: virgülle ayrılmış şirket adları veya all (varsayılan: all)"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Çok ay modu: eşzamanlı iş sayısı (varsayılan: env PIPELINE_FANOUT_WORKERS veya 4)"
+    )
+    
+    parser.add_argument(
+        "--execution",
+        choices=EXECUTION_MODES,
+        help="Adım çalıştırma modu (varsayılan: env PIPELINE_EXECUTION veya inprocess)"
+    )
+    
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Girdiler değişmemiş olsa bile tüm adımları yeniden çalıştır"
+    )
+    
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -352,19 +873,43 @@ ADIMLAR:
     
     args = parser.parse_args()
     
+    companies = None
+    if args.companies.strip().lower() != "all":
+        companies = [c.strip() for c in args.companies.split(",") if c.strip()]
+    
+    if args.dry_run and args.months:
+        print(f"[DEBUG] DRY RUN MODU (çok ay)")
+        print(f"[DATE] Aylar: {', '.join(str(m) for m in args.months)}")
+        print(f"[DATE] Yıl: {args.year}")
+        print(f"[COMPANY] Şirketler: {', '.join(companies) if companies else 'Tümü'}")
+        print(f"[TOOL] Eşzamanlı İş: {args.workers or os.getenv('PIPELINE_FANOUT_WORKERS', '4')}")
+        return
+    
     if args.dry_run:
         print(f"[DEBUG] DRY RUN MODU")
         print(f"[DATE] Ay: {args.month}")
         print(f"[DATE] Yıl: {args.year}")
         print(f"[COMPANY] Şirket: {args.company or 'Otomatik tespit'}")
+        print(f"[TOOL] Çalıştırma Modu: {args.execution or os.getenv('PIPELINE_EXECUTION', 'inprocess')}")
         print(f"[START] Pipeline çalıştır: python pipeline_workflow.py --month {args.month}")
         return
     
+    if args.months:
+        fanout = PipelineFanout(
+            months=args.months,
+            year=args.year,
+            companies=companies,
+            workers=args.workers
+        )
+        sys.exit(0 if fanout.run() else 1)
+    
     # Ana pipeline'ı başlat
     pipeline = PipelineWorkflow(
         month=args.month,
         year=args.year,
-        company_name=args.company
+        company_name=args.company,
+        execution=args.execution,
+        force=args.force
     )
     
     success = pipeline.run_complete_pipeline()
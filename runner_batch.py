@@ -1,4 +1,4 @@
-# python runner_batch.py --input-dir "<PDF_DIR>" [--llm] [--firm-filter "regex"] [--markdown]
+# python runner_batch.py --input-dir "<PDF_DIR>" [--llm] [--firm-filter "regex"] [--markdown] [--workers N]
 import argparse
 import os
 import sys
@@ -8,40 +8,88 @@ import re
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dotenv import load_dotenv
 
 load_dotenv()  # .env dosyasını yükle
 
-from extractor.pdf_reader import read_pdf_text
-from extractor.sections import extract_notlar_block, extract_firma_adi
+from extractor.pdf_reader import read_pdf_text_until
+from extractor.sections import extract_notlar_block, extract_firma_adi, is_notlar_complete, NOTLAR_UNTIL_KEY
 from extractor.notlar_parser import parse_notlar_kv, declared_keys
-from extractor.llm_fill import llm_fill_and_summarize
+from extractor.llm_fill import llm_fill_and_summarize, llm_fill_many
 from extractor.normalize import format_amount
 
 
-def process_single_pdf(pdf_path: str, use_llm: bool = False) -> dict:
-    """Tek bir PDF'i işler ve sonuçları döndürür"""
+def extract_pdf_fields(pdf_path: str) -> dict:
+    """PDF'in LLM'siz aşamasını çalıştırır (okuma → firma → notlar → kv → declared).
+
+    Process pool içinde çalışabilmesi için modül seviyesinde tanımlıdır ve
+    sadece pickle edilebilir değerler döndürür.
+    """
     start_time = time.time()
     
+    # PDF'i oku
+    text = read_pdf_text_until(pdf_path, is_notlar_complete, NOTLAR_UNTIL_KEY)
+    
+    # Firma adını çıkar
+    firma_adi = extract_firma_adi(text)
+    
+    # Notlar bloğunu çıkar
+    notlar = extract_notlar_block(text)
+    
+    # Regex ile parse et
+    kv = parse_notlar_kv(notlar)
+    
+    # Declared keys'leri bul
+    declared = declared_keys(notlar)
+    
+    return {
+        'pdf_path': pdf_path,
+        'firma_adi': firma_adi,
+        'notlar': notlar,
+        'kv': kv,
+        'declared': declared,
+        'elapsed_seconds': time.time() - start_time
+    }
+
+
+def extract_pdf_fields_safe(pdf_path: str) -> dict:
+    """extract_pdf_fields'in hata yakalayan sürümü - worker hataları ERROR satırına dönüşür"""
     try:
-        # PDF'i oku
-        text = read_pdf_text(pdf_path)
-        
-        # Firma adını çıkar
-        firma_adi = extract_firma_adi(text)
-        
-        # Notlar bloğunu çıkar
-        notlar = extract_notlar_block(text)
-        
-        # Regex ile parse et
-        kv = parse_notlar_kv(notlar)
-        
-        # Declared keys'leri bul
-        declared = declared_keys(notlar)
+        return extract_pdf_fields(pdf_path)
+    except Exception as e:
+        return {'pdf_path': pdf_path, 'error': str(e), 'elapsed_seconds': 0}
+
+
+def _error_result(pdf_path: str, error_message: str, use_llm: bool, elapsed: float) -> dict:
+    """ERROR durumundaki sonuç satırını oluşturur"""
+    return {
+        'pdf_path': pdf_path,
+        'pdf_name': os.path.basename(pdf_path),
+        'status': 'ERROR',
+        'error_message': error_message,
+        'firma_adi': "—",
+        'llm_used': use_llm,
+        'elapsed_seconds': round(elapsed, 2),
+        'processed_at': datetime.now().isoformat()
+    }
+
+
+def build_result(extracted: dict, use_llm: bool = False) -> dict:
+    """Çıkarılmış alanlardan (isteğe bağlı LLM ile) sonuç satırını oluşturur"""
+    pdf_path = extracted['pdf_path']
+    start_time = time.time() - extracted.get('elapsed_seconds', 0)
+    
+    if 'error' in extracted:
+        return _error_result(pdf_path, extracted['error'], use_llm, time.time() - start_time)
+    
+    try:
+        kv = extracted['kv']
+        firma_adi = extracted['firma_adi']
         
-        # LLM ile eksik alanları doldur (isteğe bağlı)
-        if use_llm:
-            kv = llm_fill_and_summarize(kv, notlar, declared)
+        # LLM ile eksik alanları doldur (isteğe bağlı, toplu doldurulmadıysa)
+        if use_llm and not extracted.get('llm_filled'):
+            kv = llm_fill_and_summarize(kv, extracted['notlar'], extracted['declared'])
         
         def get_amt(prefix):
             return format_amount(kv.get(f"{prefix}_value"), kv.get(f"{prefix}_currency"), kv.get(f"{prefix}_raw"))
@@ -72,17 +120,52 @@ def process_single_pdf(pdf_path: str, use_llm: bool = False) -> dict:
         return result
         
     except Exception as e:
-        elapsed = time.time() - start_time
-        return {
-            'pdf_path': pdf_path,
-            'pdf_name': os.path.basename(pdf_path),
-            'status': 'ERROR',
-            'error_message': str(e),
-            'firma_adi': "—",
-            'llm_used': use_llm,
-            'elapsed_seconds': round(elapsed, 2),
-            'processed_at': datetime.now().isoformat()
-        }
+        return _error_result(pdf_path, str(e), use_llm, time.time() - start_time)
+
+
+def process_single_pdf(pdf_path: str, use_llm: bool = False) -> dict:
+    """Tek bir PDF'i işler ve sonuçları döndürür"""
+    return build_result(extract_pdf_fields_safe(pdf_path), use_llm)
+
+
+def iter_extracted(pdf_files: list, workers: int = 1):
+    """PDF'lerin LLM'siz aşamasını çalıştırır, sonuçları giriş sırasıyla döndürür.
+
+    workers > 1 ise çıkarım process pool'da yapılır. Bir worker çökerse
+    (ör. BrokenProcessPool) ilgili PDF'ler ERROR satırı olarak döner.
+    """
+    paths = [str(p) for p in pdf_files]
+    
+    if workers <= 1:
+        for path in paths:
+            yield extract_pdf_fields_safe(path)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(extract_pdf_fields_safe, path) for path in paths]
+        for path, future in zip(paths, futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {'pdf_path': path, 'error': f"Worker hatası: {e}", 'elapsed_seconds': 0}
+
+
+def fill_llm_concurrently(extracted_items: list):
+    """Başarılı çıkarımların LLM doldurma + özet aşamasını toplu ve eşzamanlı çalıştırır"""
+    pending = [ex for ex in extracted_items if 'error' not in ex]
+    if not pending:
+        return
+    
+    print(f"[PROCESS] {len(pending)} PDF için LLM aşaması eşzamanlı çalıştırılıyor...")
+    llm_start = time.time()
+    filled = llm_fill_many([(ex['kv'], ex['notlar'], ex['declared']) for ex in pending])
+    
+    # Toplam LLM süresi PDF'lere eşit paylaştırılır (istekler eşzamanlı uçuşta)
+    llm_share = (time.time() - llm_start) / len(pending)
+    for ex, kv in zip(pending, filled):
+        ex['kv'] = kv
+        ex['llm_filled'] = True
+        ex['elapsed_seconds'] += llm_share
 
 
 def write_batch_logs(results: list, output_path: str):
@@ -277,6 +360,7 @@ def main():
     parser.add_argument('--firm-filter', help='Firma adı regex filtresi')
     parser.add_argument('--output-dir', default='.', help='Çıktı dosyalarının kaydedileceği klasör')
     parser.add_argument('--markdown', action='store_true', help='Markdown raporu da oluştur')
+    parser.add_argument('--workers', type=int, default=1, help='LLM\'siz PDF çıkarımı için paralel process sayısı (varsayılan: 1)')
     
     args = parser.parse_args()
     
@@ -328,32 +412,21 @@ def main():
     
     total_files = len(pdf_files)
     
-    for i, pdf_path in enumerate(pdf_files, 1):
+    if args.workers > 1:
+        print(f"[PROCESS] LLM'siz aşama {args.workers} worker ile paralel çalıştırılıyor...")
+    
+    extracted_items = iter_extracted(pdf_files, args.workers)
+    
+    if args.llm:
+        # LLM aşaması sağlayıcı kotası dahilinde eşzamanlı çalışır
+        extracted_items = list(extracted_items)
+        fill_llm_concurrently(extracted_items)
+    
+    for i, (pdf_path, extracted) in enumerate(zip(pdf_files, extracted_items), 1):
         print(f"\n📄 [{i}/{total_files}] İşleniyor: {pdf_path.name}")
         
-        # LLM rate limit hatası için basit retry mekanizması
-        max_retries = 3
-        retry_delay = 30  # saniye
-        for attempt in range(max_retries):
-            try:
-                result = process_single_pdf(str(pdf_path), args.llm)
-                break
-            except Exception as e:
-                if "ResourceExhausted" in str(e) and attempt < max_retries - 1:
-                    print(f"   [WARNING] API rate limit aşıldı. {retry_delay} saniye bekleniyor... ({attempt+1}/{max_retries})")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
-                else:
-                    result = {
-                        'pdf_path': str(pdf_path),
-                        'pdf_name': pdf_path.name,
-                        'status': 'ERROR',
-                        'error_message': str(e),
-                        'firma_adi': "—",
-                        'llm_used': args.llm,
-                        'elapsed_seconds': 0,
-                        'processed_at': datetime.now().isoformat()
-                    }
+        # Rate limit tekrarları AsyncLLMClient.generate içinde yapılır; hatalar ERROR satırına dönüşür
+        result = build_result(extracted, args.llm)
         
         # Firma filtresi kontrolü
         if firm_filter_regex and result['status'] == 'SUCCESS':
@@ -2,8 +2,8 @@
 from dotenv import load_dotenv
 load_dotenv()  # .env dosyasını yükle
 import sys
-from extractor.pdf_reader import read_pdf_text
-from extractor.sections import extract_notlar_block, extract_firma_adi
+from extractor.pdf_reader import read_pdf_text_until
+from extractor.sections import extract_notlar_block, extract_firma_adi, is_notlar_complete, NOTLAR_UNTIL_KEY
 from extractor.notlar_parser import parse_notlar_kv, declared_keys
 from extractor.llm_fill import llm_fill_and_summarize
 from extractor.normalize import format_amount
@@ -13,7 +13,7 @@ if __name__ == "__main__":
         raise SystemExit("Kullanım: python runner_step1.py <PDF_PATH>")
 
     pdf_path = sys.argv[1]
-    text = read_pdf_text(pdf_path)
+    text = read_pdf_text_until(pdf_path, is_notlar_complete, NOTLAR_UNTIL_KEY)
     
     # Firma adını çıkar
     firma_adi = extract_firma_adi(text)
@@ -11,8 +11,8 @@ from dotenv import load_dotenv
 
 load_dotenv()  # .env dosyasını yükle
 
-from extractor.pdf_reader import read_pdf_text
-from extractor.sections import extract_notlar_block, extract_firma_adi
+from extractor.pdf_reader import read_pdf_text_until
+from extractor.sections import extract_notlar_block, extract_firma_adi, is_notlar_complete, NOTLAR_UNTIL_KEY
 from extractor.notlar_parser import parse_notlar_kv, declared_keys
 from extractor.llm_fill import llm_fill_and_summarize
 from extractor.normalize import format_amount
@@ -71,7 +71,7 @@ def process_pdfs_with_dates(input_dir: Path, use_llm: bool = False) -> tuple[dic
         
         try:
             # PDF'i işle
-            text = read_pdf_text(str(pdf_path))
+            text = read_pdf_text_until(str(pdf_path), is_notlar_complete, NOTLAR_UNTIL_KEY)
             firma_adi = extract_firma_adi(text)
             notlar = extract_notlar_block(text)
             kv = parse_notlar_kv(notlar)
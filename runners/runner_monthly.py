@@ -2,6 +2,8 @@
 """
 NormVision - Monthly Report Generator
 Aylık ziyaret raporlarını analiz ederek kapsamlı aylık özet ve öneriler oluşturur.
+Ziyaretler normalize firma adına göre gruplanır; her şirketin raporu ve KPI JSON'u
+ayrı (şirket başına tek LLM çağrısı ile) ve paralel üretilir.
 """
 
 import sys
@@ -11,9 +13,9 @@ import json
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any
-import google.generativeai as genai
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 # Windows için UTF-8 fix
@@ -56,11 +58,13 @@ load_dotenv()
 
 # Extractor modüllerini import et
 sys.path.append(str(Path(__file__).parent.parent))
-from extractor.pdf_reader import read_pdf_text
-from extractor.sections import extract_notlar_block, extract_firma_adi
+from extractor.pdf_reader import read_pdf_text_until, read_pdf_header_text
+from extractor.sections import extract_notlar_block, extract_firma_adi, is_notlar_complete, NOTLAR_UNTIL_KEY
 from utils.company_name_utils import normalize_company_name, normalize_for_filename
+from utils.kpi_index import get_kpi_index
 from extractor.notlar_parser import parse_notlar_kv, declared_keys
 from extractor.llm_fill import llm_fill_and_summarize
+from extractor.llm_client import get_llm_client
 from extractor.normalize import format_amount
 from extractor.campaigns import check_campaign_mentions, get_current_campaigns
 
@@ -70,13 +74,18 @@ try:
 except NameError:
     pass  # load_dotenv tanımlı değil, devam et
 
-def process_single_pdf_for_monthly(pdf_path: str) -> Dict[str, Any]:
-    """Tek bir PDF'yi aylık rapor için işler"""
+def process_single_pdf_for_monthly(pdf_path: str, visit_date: str = None) -> Dict[str, Any]:
+    """Tek bir PDF'yi aylık rapor için işler
+
+    Args:
+        pdf_path: PDF dosya yolu
+        visit_date: Ön filtrede bulunmuş ziyaret tarihi (YYYY-MM-DD, opsiyonel)
+    """
     start_time = time.time()
     
     try:
         # PDF'yi oku
-        text = read_pdf_text(pdf_path)
+        text = read_pdf_text_until(pdf_path, is_notlar_complete, NOTLAR_UNTIL_KEY)
         
         # Firma adını çıkar
         firma_adi = extract_firma_adi(text)
@@ -97,7 +106,8 @@ def process_single_pdf_for_monthly(pdf_path: str) -> Dict[str, Any]:
             return format_amount(kv.get(f"{prefix}_value"), kv.get(f"{prefix}_currency"), kv.get(f"{prefix}_raw"))
         
         # Ziyaret tarihini çıkar
-        visit_date = extract_visit_date_from_filename(Path(pdf_path).name)
+        if not visit_date:
+            visit_date = extract_visit_date_from_filename(Path(pdf_path).name)
         
         elapsed_seconds = round(time.time() - start_time, 2)
         
@@ -153,6 +163,50 @@ def extract_visit_date_from_filename(filename: str) -> str:
     
     return "Tarih Bulunamadı"
 
+def extract_visit_date_from_text(text: str) -> str:
+    """PDF başlık metninden ziyaret tarihini çıkarır (önce 'Tarih' etiketli, sonra ilk tarih)"""
+    date_patterns = [
+        r'tarih[^\d\n]{0,20}(\d{1,2})[./-](\d{1,2})[./-](\d{4})',
+        r'\b(\d{1,2})[./-](\d{1,2})[./-](\d{4})\b',
+    ]
+    
+    for pattern in date_patterns:
+        for match in re.finditer(pattern, text or "", re.IGNORECASE):
+            day, month, year = match.groups()
+            try:
+                return datetime(int(year), int(month), int(day)).strftime('%Y-%m-%d')
+            except ValueError:
+                continue
+    
+    return "Tarih Bulunamadı"
+
+def resolve_visit_date(pdf_path: Path) -> str:
+    """Ziyaret tarihini önce dosya adından, bulunamazsa sadece ilk sayfayı okuyarak bulur"""
+    visit_date = extract_visit_date_from_filename(pdf_path.name)
+    if visit_date != "Tarih Bulunamadı":
+        return visit_date
+    
+    return extract_visit_date_from_text(read_pdf_header_text(str(pdf_path)))
+
+def prefilter_pdfs_by_month(pdf_files: List[Path], target_month: int, target_year: int) -> List[tuple]:
+    """Ağır çıkarım ve LLM aşamasından önce PDF'leri ziyaret tarihine göre eler
+
+    Returns:
+        list: Hedef döneme ait (pdf_path, visit_date) çiftleri
+    """
+    selected = []
+    for pdf_path in pdf_files:
+        visit_date = resolve_visit_date(pdf_path)
+        if visit_date == "Tarih Bulunamadı":
+            print(f"[DEBUG] Tarih bulunamadı, atlanıyor: {pdf_path.name}")
+            continue
+        
+        date_obj = datetime.strptime(visit_date, '%Y-%m-%d')
+        if date_obj.month == target_month and date_obj.year == target_year:
+            selected.append((pdf_path, visit_date))
+    
+    return selected
+
 def sanitize_company_name_for_filename(company_name: str) -> str:
     """
     Şirket adını dosya adı için güvenli hale getirir
@@ -234,9 +288,8 @@ def generate_monthly_analysis_with_llm(visits: List[Dict], month: int, year: int
         return "LLM analizi için GEMINI_API_KEY gerekli", "{}"
     
     try:
-        genai.configure(api_key=api_key)
-        # Fix script'te başarılı olan model kullan
-        model = genai.GenerativeModel('gemini-2.5-flash')
+        # Fix script'te başarılı olan model kullan (paylaşılan istemci: rate limit + yanıt önbelleği)
+        client = get_llm_client('gemini-2.5-flash')
         
         
         # Veri özetini hazırla (fix script'teki gibi)
@@ -336,11 +389,7 @@ LÜTFEN AŞAĞIDA BELİRTİLEN BAŞLIKLARDA DETAYLI ANALİZ YAP:
 ANALİZİ TÜRKÇE, DETAYLI VE PROFESYONEL ANALİZ YAP!"""
 
         print("[PROCESS] LLM ile gelişmiş analiz oluşturuluyor...")
-        # Rate limiting için bekleme
-        time.sleep(2)
-        
-        response = model.generate_content(prompt)
-        full_response = response.text
+        full_response = client.generate_sync(prompt)
         
         print(f"[DEBUG] LLM response length: {len(full_response)} characters")
         print(f"[DEBUG] Response contains 'json': {'json' in full_response.lower()}")
@@ -530,103 +579,60 @@ Aşağıdaki JSON verileri dashboard entegrasyonu ve KPI takibi için kullanıla
     with open(output_path, 'w', encoding='utf-8') as f:
         f.write(report_content)
 
-def main():
-    parser = argparse.ArgumentParser(description='NormVision - Aylık Rapor Oluşturucu')
-    parser.add_argument('--input-dir', required=True, help='PDF dosyalarının bulunduğu klasör')
-    parser.add_argument('--month', type=int, choices=range(1, 13), required=True, help='Rapor ayı (1-12)')
-    parser.add_argument('--year', type=int, required=True, help='Rapor yılı (örn: 2025)')
-    parser.add_argument('--output-dir', default='.', help='Çıktı klasörü (varsayılan: mevcut klasör)')
-    parser.add_argument('--llm', action='store_true', help='LLM analizi kullan')
-    
-    args = parser.parse_args()
-    
-    # Giriş kontrolü
-    input_dir = Path(args.input_dir)
-    output_dir = Path(args.output_dir)
-    
-    if not input_dir.exists():
-        print(f"Hata: Giriş klasörü bulunamadı: {input_dir}")
-        sys.exit(1)
-    
-    # PDF dosyalarını bul (unique paths için set kullan)
-    pdf_files = set()
-    for ext in ['*.pdf', '*.PDF']:
-        pdf_files.update(input_dir.glob(ext))
-    
-    pdf_files = list(pdf_files)  # Set'i list'e çevir
-    
-    if not pdf_files:
-        print(f"Hata: {input_dir} klasöründe PDF dosyası bulunamadı")
-        sys.exit(1)
-    
-    print(f"Toplam {len(pdf_files)} UNIQUE PDF dosyası bulundu")
-    print(f"Hedef dönem: {args.month}/{args.year}")
-    
-    # PDF'leri işle
-    all_visits = []
-    for pdf_path in pdf_files:
-        print(f"İşleniyor: {pdf_path.name}")
-        result = process_single_pdf_for_monthly(str(pdf_path))
-        all_visits.append(result)
-    
-    # Ay ve yıla göre filtrele
-    filtered_visits = filter_visits_by_month(all_visits, args.month, args.year)
-    
-    if not filtered_visits:
-        print(f"Hata: {args.month}/{args.year} dönemine ait ziyaret bulunamadı")
-        sys.exit(1)
-    
-    print(f"{args.month}/{args.year} döneminde {len(filtered_visits)} ziyaret bulundu")
-    
-    # Şirket adını belirle (ilk başarılı ziyaretten al)
-    company_name = "UNKNOWN_COMPANY"
-    for visit in filtered_visits:
+MONTH_NAMES = {
+    1: 'Ocak', 2: 'Şubat', 3: 'Mart', 4: 'Nisan',
+    5: 'Mayıs', 6: 'Haziran', 7: 'Temmuz', 8: 'Ağustos',
+    9: 'Eylül', 10: 'Ekim', 11: 'Kasım', 12: 'Aralık'
+}
+
+def visit_company_name(visit: Dict[str, Any]) -> str:
+    """Ziyaretin normalize edilmiş firma adı (firma adı yoksa UNKNOWN_COMPANY)"""
+    raw_company_name = visit['data'].get('firma_adi', '')
+    if raw_company_name and raw_company_name not in ['—', 'Belirtilmemiş']:
+        return normalize_company_name(raw_company_name)  # Ortak normalizasyon
+    return "UNKNOWN_COMPANY"
+
+def group_visits_by_company(visits: List[Dict]) -> Dict[str, List[Dict]]:
+    """Başarılı ziyaretleri normalize firma adına göre tek geçişte gruplar (ziyaret sırası korunur)"""
+    visits_by_company = {}
+    for visit in visits:
         if visit['status'] == 'SUCCESS':
-            raw_company_name = visit['data'].get('firma_adi', '')
-            if raw_company_name and raw_company_name not in ['—', 'Belirtilmemiş']:
-                company_name = normalize_company_name(raw_company_name)  # Ortak normalizasyon
-                break
-    
-    # Şirket adını güvenli encoding ile yazdır
-    try:
-        print(f"Sirket adi dosya adlandirmasi icin: {company_name}")
-    except UnicodeEncodeError:
-        # Türkçe karakterleri ASCII'ye dönüştür
-        import unicodedata
-        company_name_ascii = unicodedata.normalize('NFKD', company_name).encode('ascii', 'ignore').decode('ascii')
-        print(f"Sirket adi dosya adlandirmasi icin: {company_name_ascii}")
-    
+            visits_by_company.setdefault(visit_company_name(visit), []).append(visit)
+    return visits_by_company
+
+def write_monthly_company_report(visits: List[Dict], company_name: str, month: int, year: int,
+                                 output_dir: str, use_llm: bool = False) -> tuple:
+    """Tek şirketin aylık ziyaretlerinden markdown rapor ve KPI JSON'u üretir
+
+    Returns:
+        tuple: (rapor yolu, KPI JSON yolu)
+    """
     # LLM analizi
     analysis = ""
     json_summary = "{}"
-    if args.llm:
+    if use_llm:
         print("LLM ile aylık analiz oluşturuluyor...")
-        analysis, json_summary = generate_monthly_analysis_with_llm(filtered_visits, args.month, args.year)
+        analysis, json_summary = generate_monthly_analysis_with_llm(visits, month, year)
     else:
         analysis = "LLM analizi kullanılmadı. --llm parametresi ile detaylı analiz alabilirsiniz."
         json_summary = '{"mesaj": "LLM analizi kullanılmadı"}'
     
     # Rapor oluştur
-    month_names = {
-        1: 'Ocak', 2: 'Şubat', 3: 'Mart', 4: 'Nisan',
-        5: 'Mayıs', 6: 'Haziran', 7: 'Temmuz', 8: 'Ağustos',
-        9: 'Eylül', 10: 'Ekim', 11: 'Kasım', 12: 'Aralık'
-    }
-    month_name = month_names.get(args.month, str(args.month))
+    month_name = MONTH_NAMES.get(month, str(month))
     
     # Standart Reports klasörünü kullan (.env'den)
-    reports_base = os.getenv('REPORTS_BASE', str(output_dir / "Reports" / "Monthly"))
-    reports_dir = Path(reports_base) / company_name / f"{args.month:02d}-{month_name}"
+    reports_base = os.getenv('REPORTS_BASE', str(Path(output_dir) / "Reports" / "Monthly"))
+    reports_dir = Path(reports_base) / company_name / f"{month:02d}-{month_name}"
     reports_dir.mkdir(parents=True, exist_ok=True)
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    report_filename = f"NormVision_Aylik_Rapor_{company_name}_{month_name}_{args.year}_{timestamp}.md"
+    report_filename = f"NormVision_Aylik_Rapor_{company_name}_{month_name}_{year}_{timestamp}.md"
     report_path = reports_dir / report_filename
     
-    create_monthly_markdown_report(filtered_visits, analysis, json_summary, args.month, args.year, str(report_path))
+    create_monthly_markdown_report(visits, analysis, json_summary, month, year, str(report_path))
     
     # KPI JSON'unu ayrı dosya olarak kaydet - Şirket adını dahil et
-    json_filename = f"NormVision_KPI_{company_name}_{month_name}_{args.year}_{timestamp}.json"
+    json_filename = f"NormVision_KPI_{company_name}_{month_name}_{year}_{timestamp}.json"
     json_path = reports_dir / json_filename
     
     try:
@@ -661,9 +667,100 @@ def main():
     except Exception as e:
         safe_print(f"JSON dosyasi olusturulurken hata: {str(e)}")
     
-    print(f"\nAylik rapor olusturuldu: {report_path}")
-    print(f"Rapor donemi: {month_name} {args.year}")
+    # KPI indeksine ekle: final assembler dizin taramadan bulur
+    kpi_index = get_kpi_index(reports_base)
+    if kpi_index and json_path.exists():
+        try:
+            kpi_index.record(str(json_path), company_name, year, month)
+        except Exception as e:
+            safe_print(f"[WARNING] KPI indeksi guncellenemedi: {str(e)}")
+    
+    return report_path, json_path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='NormVision - Aylık Rapor Oluşturucu')
+    parser.add_argument('--input-dir', required=True, help='PDF dosyalarının bulunduğu klasör')
+    parser.add_argument('--month', type=int, choices=range(1, 13), required=True, help='Rapor ayı (1-12)')
+    parser.add_argument('--year', type=int, required=True, help='Rapor yılı (örn: 2025)')
+    parser.add_argument('--output-dir', default='.', help='Çıktı klasörü (varsayılan: mevcut klasör)')
+    parser.add_argument('--llm', action='store_true', help='LLM analizi kullan')
+    parser.add_argument('--workers', type=int, help='Paralel işlenecek şirket sayısı (varsayılan: env RUNNER_COMPANY_WORKERS veya 4)')
+    
+    args = parser.parse_args(argv)
+    
+    # Giriş kontrolü
+    input_dir = Path(args.input_dir)
+    output_dir = Path(args.output_dir)
+    
+    if not input_dir.exists():
+        print(f"Hata: Giriş klasörü bulunamadı: {input_dir}")
+        sys.exit(1)
+    
+    # PDF dosyalarını bul (unique paths için set kullan)
+    pdf_files = set()
+    for ext in ['*.pdf', '*.PDF']:
+        pdf_files.update(input_dir.glob(ext))
+    
+    pdf_files = list(pdf_files)  # Set'i list'e çevir
+    
+    if not pdf_files:
+        print(f"Hata: {input_dir} klasöründe PDF dosyası bulunamadı")
+        sys.exit(1)
+    
+    print(f"Toplam {len(pdf_files)} UNIQUE PDF dosyası bulundu")
+    print(f"Hedef dönem: {args.month}/{args.year}")
+    
+    # Dönem dışı PDF'leri çıkarım ve LLM maliyetinden önce ele
+    period_pdfs = prefilter_pdfs_by_month(sorted(pdf_files), args.month, args.year)
+    print(f"Ön filtre: {len(period_pdfs)}/{len(pdf_files)} PDF hedef döneme ait")
+    
+    # PDF'leri işle
+    all_visits = []
+    for pdf_path, visit_date in period_pdfs:
+        print(f"İşleniyor: {pdf_path.name}")
+        result = process_single_pdf_for_monthly(str(pdf_path), visit_date)
+        all_visits.append(result)
+    
+    # Ay ve yıla göre filtrele
+    filtered_visits = filter_visits_by_month(all_visits, args.month, args.year)
+    
+    if not filtered_visits:
+        print(f"Hata: {args.month}/{args.year} dönemine ait ziyaret bulunamadı")
+        sys.exit(1)
+    
+    print(f"{args.month}/{args.year} döneminde {len(filtered_visits)} ziyaret bulundu")
+    
+    # Ziyaretleri şirkete göre tek geçişte grupla; her şirketin raporu ve KPI JSON'u ayrı üretilir
+    visits_by_company = group_visits_by_company(filtered_visits)
+    print(f"{len(visits_by_company)} şirket bulundu: "
+          + ", ".join(f"{name} ({len(visits)})" for name, visits in visits_by_company.items()))
+    
+    # Şirketler paralel işlenir (şirket başına bir LLM çağrısı)
+    workers = max(1, min(args.workers or int(os.getenv('RUNNER_COMPANY_WORKERS', '4')), len(visits_by_company)))
+    month_name = MONTH_NAMES.get(args.month, str(args.month))
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(write_monthly_company_report, visits, company_name,
+                            args.month, args.year, str(output_dir), args.llm): company_name
+            for company_name, visits in visits_by_company.items()
+        }
+        for future in as_completed(futures):
+            company_name = futures[future]
+            try:
+                report_path, json_path = future.result()
+            except Exception as e:
+                safe_print(f"[ERROR] {company_name} raporu olusturulamadi: {str(e)}")
+                failed.append(company_name)
+                continue
+            safe_print(f"\n[{company_name}] Aylik rapor olusturuldu: {report_path}")
+            safe_print(f"[{company_name}] Analiz edilen ziyaret sayisi: {len(visits_by_company[company_name])}")
+    
+    print(f"\nRapor donemi: {month_name} {args.year}")
     print(f"Analiz edilen ziyaret sayisi: {len(filtered_visits)}")
+    print(f"Olusturulan sirket raporu: {len(visits_by_company) - len(failed)}/{len(visits_by_company)}")
+    if failed:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
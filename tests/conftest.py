@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Testler proje kökünden import eder (extractor, analyzer, utils, bridge)
+sys.path.insert(0, str(Path(__file__).parent.parent))
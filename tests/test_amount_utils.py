@@ -0,0 +1,48 @@
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from extractor.normalize import parse_amount
+from utils.amount_utils import parse_amounts
+
+CASES = [
+    ("1,250 TL", Decimal("1.250"), "₺"),
+    ("1.250 TL", Decimal("1250"), "₺"),
+    ("1.250,50 TL", Decimal("1250.50"), "₺"),
+    ("-1.000 €", Decimal("-1000"), "€"),
+    ("12,5", Decimal("12.5"), None),
+    ("12.5 EUR", Decimal("12.5"), "€"),
+    ("751.594 €", Decimal("751594"), "€"),
+    ("1.250.000", Decimal("1250000"), None),
+    ("1,000.50", Decimal("1000.50"), None),
+    ("25.435.852,83 - 02.07.2025", Decimal("25435852.83"), None),
+    # Boşlukla ayrılmış tire madde işaretidir, işaret değil
+    ("- 50.000 TL", Decimal("50000"), "₺"),
+    ("Ciro: - 1.200.000", Decimal("1200000"), None),
+    ("• - 750 €", Decimal("750"), "€"),
+    ("€ -500", Decimal("-500"), "€"),
+    ("(1.250,00) TL", Decimal("-1250.00"), "₺"),
+    ("1.250,00-", Decimal("-1250.00"), None),
+    ("Ciro (1.200.000 TL) arttı", Decimal("1200000"), "₺"),
+]
+
+
+@pytest.mark.parametrize("text, value, currency", CASES)
+def test_parse_amount(text, value, currency):
+    assert parse_amount(text) == (value, currency)
+
+
+def test_batch_path_matches_scalar_path():
+    values, currencies = parse_amounts([text for text, _, _ in CASES])
+
+    np.testing.assert_allclose(values, [float(value) for _, value, _ in CASES])
+    assert list(currencies) == [currency for _, _, currency in CASES]
+
+
+def test_unparseable_and_numeric_inputs():
+    assert parse_amount("") == (None, None)
+    assert parse_amount("TL") == (None, "₺")
+    values, _ = parse_amounts(["yok", 1500, 2.5, None])
+    assert np.isnan(values[0]) and np.isnan(values[3])
+    assert list(values[1:3]) == [1500.0, 2.5]
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from analyzer.financial_analysis import BALANCE_LABELS, BalanceSheetIndex
+from utils.amount_utils import parse_amounts
+
+
+def parse_values(values):
+    amounts, _ = parse_amounts(values)
+    return np.nan_to_num(amounts, nan=0.0)
+
+
+def row_by_row(balance_df):
+    """Reference: the original if/elif scan over the statement rows"""
+    values = {}
+    for _, row in balance_df.iterrows():
+        alan = str(row['Alan'])
+        for field, label in BALANCE_LABELS.items():
+            if label in alan:
+                values[field] = float(parse_values([row['Değer']])[0])
+                break
+    return values
+
+
+BALANCE = pd.DataFrame({
+    'Alan': ['Cari Limiti', 'Cari Riski', 'Cari Limiti / Cari Riski', 'Kendi Çek Riski', 'Açıklama', 'Cari Riski'],
+    'Değer': ['100.000,00 TRY', '10.000 TRY', '250.000,00 TRY', '5.000,50 TRY', '1', '20.000,00 TRY'],
+})
+
+
+def test_first_label_in_order_wins_within_a_row():
+    index = BalanceSheetIndex(BALANCE.iloc[[2]], parse_values)
+
+    assert index.get('credit_limit') == 250000.0
+    assert index.get('current_risk') is None
+
+
+def test_later_rows_override_earlier_rows():
+    index = BalanceSheetIndex(BALANCE, parse_values)
+
+    assert index.get('credit_limit') == 250000.0
+    assert index.get('current_risk') == 20000.0
+    assert index.get('check_risk') == 5000.5
+    assert index.get('promissory_note_risk') is None
+
+
+def test_matches_row_by_row_scan():
+    index = BalanceSheetIndex(BALANCE, parse_values)
+
+    assert {field: index.get(field) for field in BALANCE_LABELS if index.get(field) is not None} == row_by_row(BALANCE)
+
+
+def test_customer_indexed_statement():
+    statement = pd.DataFrame({
+        'Ad': ['A', 'A', 'B', 'B'],
+        'Alan': ['Cari Limiti', 'Cari Riski', 'Cari Riski', 'Cari Riski'],
+        'Değer': ['1.000 TRY', '500 TRY', '7.000 TRY', '8.000 TRY'],
+    })
+
+    index = BalanceSheetIndex(statement, parse_values, customer_column='Ad')
+
+    assert index.customers() == ['A', 'B']
+    assert index.get('current_risk', 'B') == 8000.0
+    wide = index.to_wide()
+    assert list(wide.columns) == list(BALANCE_LABELS)
+    assert wide.loc['A', 'credit_limit'] == 1000.0
+    assert np.isnan(wide.loc['B', 'credit_limit'])
+
+
+def test_empty_statement():
+    index = BalanceSheetIndex(pd.DataFrame(columns=['Alan', 'Değer']), parse_values)
+
+    assert index.get('credit_limit') is None
+    assert index.to_wide().empty
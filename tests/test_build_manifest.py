@@ -0,0 +1,135 @@
+import os
+
+import pytest
+
+from utils.build_manifest import BuildManifest
+
+
+@pytest.fixture
+def step_files(tmp_path):
+    source = tmp_path / "input.xlsx"
+    code = tmp_path / "step.py"
+    output = tmp_path / "out.json"
+    source.write_text("v1")
+    code.write_text("print(1)")
+    output.write_text("{}")
+    return source, code, output
+
+
+def _fingerprint(manifest, source, code, params=None):
+    return manifest.fingerprint([str(source)], [str(code)], params or {"month": 8})
+
+
+def test_unchanged_step_is_fresh_after_reload(tmp_path, step_files):
+    source, code, output = step_files
+    manifest = BuildManifest(str(tmp_path / "manifest.json"))
+    manifest.record("step", _fingerprint(manifest, source, code), [str(output)])
+    manifest.save()
+
+    reloaded = BuildManifest(str(tmp_path / "manifest.json"))
+
+    assert reloaded.is_fresh("step", _fingerprint(reloaded, source, code))
+
+
+@pytest.mark.parametrize("change", ["input", "code", "params"])
+def test_changes_invalidate_the_step(tmp_path, step_files, change):
+    source, code, output = step_files
+    manifest = BuildManifest(str(tmp_path / "manifest.json"))
+    manifest.record("step", _fingerprint(manifest, source, code), [str(output)])
+
+    params = None
+    if change == "input":
+        source.write_text("v2 - farklı boyut")
+    elif change == "code":
+        code.write_text("print(2)")
+    else:
+        params = {"month": 9}
+
+    assert not manifest.is_fresh("step", _fingerprint(manifest, source, code, params))
+
+
+def test_same_size_edit_is_detected_through_mtime(tmp_path, step_files):
+    source, code, output = step_files
+    manifest = BuildManifest(str(tmp_path / "manifest.json"))
+    fingerprint = _fingerprint(manifest, source, code)
+
+    source.write_text("v9")
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert _fingerprint(manifest, source, code) != fingerprint
+
+
+def test_dependency_fingerprint_propagates(tmp_path, step_files):
+    source, code, _ = step_files
+    manifest = BuildManifest(str(tmp_path / "manifest.json"))
+
+    first = manifest.fingerprint([str(source)], [str(code)], dependencies={"upstream": "a"})
+    second = manifest.fingerprint([str(source)], [str(code)], dependencies={"upstream": "b"})
+
+    assert first != second
+
+
+def test_missing_output_makes_step_stale(tmp_path, step_files):
+    source, code, output = step_files
+    manifest = BuildManifest(str(tmp_path / "manifest.json"))
+    fingerprint = _fingerprint(manifest, source, code)
+    manifest.record("step", fingerprint, [str(output)])
+
+    output.unlink()
+
+    assert not manifest.is_fresh("step", fingerprint)
+
+
+def test_step_without_outputs_is_never_fresh(tmp_path, step_files):
+    source, code, _ = step_files
+    manifest = BuildManifest(str(tmp_path / "manifest.json"))
+    fingerprint = _fingerprint(manifest, source, code)
+    manifest.record("step", fingerprint, [])
+
+    assert not manifest.is_fresh("step", fingerprint)
+
+
+def test_corrupt_manifest_starts_empty(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text("{bozuk")
+
+    assert not BuildManifest(str(path)).is_fresh("step", "x")
+
+
+def test_shared_output_rewritten_by_other_step_id_is_stale(tmp_path, step_files):
+    source, code, _ = step_files
+    shared = tmp_path / "LLM_Input_Satis_Analizi.json"
+    manifest = BuildManifest(str(tmp_path / "manifest.json"))
+    fingerprint_a = manifest.fingerprint([str(source)], [str(code)], {"company_name": "A"})
+    fingerprint_b = manifest.fingerprint([str(source)], [str(code)], {"company_name": "B"})
+
+    shared.write_text('{"musteri": "A"}')
+    manifest.record("2025-08/A/sales_performance", fingerprint_a, [str(shared)])
+    shared.write_text('{"musteri": "B", "uzun": 1}')
+    manifest.record("2025-08/B/sales_performance", fingerprint_b, [str(shared)])
+
+    assert not manifest.is_fresh("2025-08/A/sales_performance", fingerprint_a)
+    assert manifest.is_fresh("2025-08/B/sales_performance", fingerprint_b)
+
+
+def test_refresh_outputs_accepts_in_place_enrichment(tmp_path, step_files):
+    source, code, output = step_files
+    manifest = BuildManifest(str(tmp_path / "manifest.json"))
+    fingerprint = _fingerprint(manifest, source, code)
+    manifest.record("step", fingerprint, [str(output)])
+
+    output.write_text('{"zenginlestirildi": true}')
+    assert not manifest.is_fresh("step", fingerprint)
+
+    manifest.refresh_outputs("step")
+    assert manifest.is_fresh("step", fingerprint)
+
+
+def test_legacy_output_list_is_stale(tmp_path, step_files):
+    source, code, output = step_files
+    manifest = BuildManifest(str(tmp_path / "manifest.json"))
+    fingerprint = _fingerprint(manifest, source, code)
+    manifest._steps["step"] = {"fingerprint": fingerprint, "outputs": [str(output)]}
+
+    assert not manifest.is_fresh("step", fingerprint)
@@ -0,0 +1,54 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from analyzer.excel_reader import ExcelReader, column_matcher
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Ad", "Tutar", "Tutar", None, "Kod", "Tarih", "Flag", "Karışık", "NA metin", 2024, "Hata"])
+    ws.append(["a", 1, 1.5, None, "001", datetime.datetime(2025, 1, 2), True, "x", "NA", 5, "#DIV/0!"])
+    ws.append(["b", 2.0, "2", None, "002", datetime.datetime(2025, 1, 3), False, 3, "null", 6.5, 1])
+    ws.append([None] * 11)
+    ws.append(["c", 3, 4, "z", "abc", None, True, 4.5, "n/a", None, 2])
+    ws.append([None] * 11)
+    path = tmp_path / "edge.xlsx"
+    wb.save(path)
+    return str(path)
+
+
+@pytest.mark.parametrize("columns", [None, ["Ad", "*Tutar*", "Unnamed: 3", "Kod"], ["Yok"]])
+def test_openpyxl_engine_matches_read_excel(workbook, columns):
+    expected = pd.read_excel(workbook, usecols=column_matcher(columns), engine="openpyxl")
+
+    result = ExcelReader(engine="openpyxl").read(workbook, columns=columns)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_report_is_opt_in(workbook, capsys, monkeypatch):
+    monkeypatch.delenv("EXCEL_READER_REPORT", raising=False)
+    reader = ExcelReader(engine="openpyxl")
+    reader.read(workbook)
+    assert capsys.readouterr().out == ""
+    assert reader.stats[0].rows == 4
+
+    ExcelReader(engine="openpyxl", report=True).read(workbook)
+    assert "rows/s" in capsys.readouterr().out
+
+
+def test_summary_totals_every_read(workbook):
+    reader = ExcelReader(engine="openpyxl")
+    assert reader.summary() is None
+
+    reader.read(workbook)
+    reader.read(workbook, columns=["Ad"])
+
+    assert reader.summary().startswith("2 reads, 8 rows in ")
+    assert "rows/s, openpyxl" in reader.summary()
@@ -0,0 +1,94 @@
+import os
+import time
+
+import pytest
+
+from utils.kpi_index import KPIReportIndex, get_kpi_index
+
+
+def write_kpi(base, company, stamp, month=8):
+    folder = base / company / f"{month:02d}-Ağustos"
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / f"NormVision_KPI_{company}_Ağustos_2025_{stamp}.json"
+    path.write_text("{}")
+    return path
+
+
+def bump_mtime(folder):
+    stat = os.stat(folder)
+    os.utime(folder, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def reports(tmp_path):
+    return tmp_path / "Monthly"
+
+
+def test_recorded_file_is_returned(reports):
+    path = write_kpi(reports, "ACME", "20250901_100000")
+    index = KPIReportIndex(str(reports))
+    index.record(str(path), "ACME", 2025, 8)
+
+    assert index.latest("ACME", 2025, 8) == str(path)
+    assert index.latest("ACME", 2025, 7) is None
+
+
+def test_latest_prefers_newest_file(reports):
+    index = KPIReportIndex(str(reports))
+    older = write_kpi(reports, "ACME", "20250901_100000")
+    index.record(str(older), "ACME", 2025, 8)
+    time.sleep(0.01)
+    newer = write_kpi(reports, "ACME", "20250902_100000")
+    index.record(str(newer), "ACME", 2025, 8)
+
+    assert index.latest("ACME", 2025, 8) == str(newer)
+
+
+def test_externally_added_file_makes_index_stale(reports):
+    path = write_kpi(reports, "ACME", "20250901_100000")
+    index = KPIReportIndex(str(reports))
+    index.record(str(path), "ACME", 2025, 8)
+
+    write_kpi(reports, "ACME", "20250902_100000")
+    bump_mtime(path.parent)
+
+    assert index.latest("ACME", 2025, 8) is None
+
+
+def test_deleted_file_is_stale_and_rescan_drops_it(reports):
+    keep = write_kpi(reports, "ACME", "20250901_100000")
+    gone = write_kpi(reports, "ACME", "20250902_100000")
+    index = KPIReportIndex(str(reports))
+    index.index_files([str(keep), str(gone)])
+
+    gone.unlink()
+    bump_mtime(gone.parent)
+    assert index.latest("ACME", 2025, 8) is None
+
+    assert index.index_files([str(keep)]) == 1
+    assert index.latest("ACME", 2025, 8) == str(keep)
+
+
+def test_alias_resolves_to_scanned_company(reports):
+    path = write_kpi(reports, "ACME_GIDA", "20250901_100000")
+    index = KPIReportIndex(str(reports))
+    index.index_files([str(path)], alias="ACME")
+
+    assert index.latest("ACME", 2025, 8) == str(path)
+
+
+def test_index_files_skips_paths_outside_reports(reports, tmp_path):
+    outside = write_kpi(tmp_path / "Other", "ACME", "20250901_100000")
+    index = KPIReportIndex(str(reports))
+
+    assert index.index_files([str(outside)]) == 0
+
+
+def test_index_is_persistent_and_can_be_disabled(reports, monkeypatch):
+    path = write_kpi(reports, "ACME", "20250901_100000")
+    KPIReportIndex(str(reports)).record(str(path), "ACME", 2025, 8)
+
+    assert KPIReportIndex(str(reports)).latest("ACME", 2025, 8) == str(path)
+
+    monkeypatch.setenv("KPI_INDEX", "0")
+    assert get_kpi_index(str(reports)) is None
@@ -0,0 +1,157 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from extractor.llm_cache import LLMResponseCache
+from extractor.llm_client import AsyncLLMClient, StubBackend, is_rate_limit_error
+
+
+class ResourceExhausted(Exception):
+    """google.api_core.exceptions.ResourceExhausted yerine geçen test hatası"""
+
+
+class FlakyBackend(StubBackend):
+    """İlk `failures` çağrıda verilen hatayı fırlatan stub"""
+
+    def __init__(self, failures, error=ResourceExhausted("429 Quota exceeded")):
+        super().__init__("ok")
+        self.failures = failures
+        self.error = error
+
+    async def generate(self, prompt, **kwargs):
+        self.calls.append(prompt)
+        if len(self.calls) <= self.failures:
+            raise self.error
+        return self.responder
+
+
+def _client(backend, max_retries=3):
+    return AsyncLLMClient(backend, requests_per_minute=6000, tokens_per_minute=10 ** 9,
+                          use_cache=False, max_retries=max_retries, retry_base_delay=0.001)
+
+
+def test_rate_limit_is_retried_until_success():
+    backend = FlakyBackend(failures=2)
+
+    assert asyncio.run(_client(backend).generate("p")) == "ok"
+    assert len(backend.calls) == 3
+
+
+def test_rate_limit_retries_are_bounded():
+    backend = FlakyBackend(failures=10)
+
+    with pytest.raises(ResourceExhausted):
+        asyncio.run(_client(backend, max_retries=2).generate("p"))
+    assert len(backend.calls) == 3
+
+
+def test_other_errors_are_not_retried():
+    backend = FlakyBackend(failures=1, error=ValueError("bad request"))
+
+    with pytest.raises(ValueError):
+        asyncio.run(_client(backend).generate("p"))
+    assert len(backend.calls) == 1
+
+
+@pytest.mark.parametrize("error, expected", [
+    (ResourceExhausted("quota"), True),
+    (RuntimeError("429 Too Many Requests"), True),
+    (RuntimeError("google.api_core.exceptions.ResourceExhausted: quota"), True),
+    (ValueError("invalid argument"), False),
+])
+def test_is_rate_limit_error(error, expected):
+    assert is_rate_limit_error(error) is expected
+
+
+class BrokenCache:
+    """get/put çağrılarında hata fırlatan önbellek"""
+
+    make_key = staticmethod(LLMResponseCache.make_key)
+
+    def get(self, key):
+        raise sqlite3.OperationalError("database is locked")
+
+    def put(self, key, model_name, response):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_cache_errors_do_not_fail_the_request():
+    backend = StubBackend("ok")
+    client = AsyncLLMClient(backend, requests_per_minute=6000, cache=BrokenCache())
+
+    assert asyncio.run(client.generate("p")) == "ok"
+    assert backend.calls == ["p"]
+
+
+def test_response_cache_treats_database_errors_as_miss(tmp_path):
+    cache = LLMResponseCache(db_path=str(tmp_path / "llm.sqlite"))
+    cache.put("k", "model", "yanıt")
+    assert cache.get("k") == "yanıt"
+
+    with sqlite3.connect(str(cache.db_path)) as conn:
+        conn.execute("DROP TABLE responses")
+
+    assert cache.get("k") is None
+    cache.put("k", "model", "yanıt")  # hata fırlatmaz
+
+
+class InFlightBackend(StubBackend):
+    """Thread'ler arası eşzamanlı uçuştaki istek sayısının tepe değerini ölçer"""
+
+    def __init__(self, latency=0.05):
+        super().__init__("ok", latency=latency)
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    async def generate(self, prompt, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            return await super().generate(prompt, **kwargs)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_concurrency_limit_is_shared_across_threads():
+    backend = InFlightBackend()
+    client = AsyncLLMClient(backend, requests_per_minute=60000, tokens_per_minute=10 ** 9,
+                            max_concurrency=2, use_cache=False)
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(lambda i: client.generate_sync(f"p{i}"), range(12)))
+
+    assert results == ["ok"] * 12
+    assert backend.peak == 2
+
+
+def test_backoff_sleep_releases_the_slot():
+    class RateLimitedOnce(StubBackend):
+        async def generate(self, prompt, **kwargs):
+            self.calls.append(prompt)
+            if prompt == "kota" and self.calls.count("kota") == 1:
+                raise ResourceExhausted("429")
+            return prompt
+
+    client = AsyncLLMClient(RateLimitedOnce(), requests_per_minute=60000, tokens_per_minute=10 ** 9,
+                            max_concurrency=1, use_cache=False, retry_base_delay=0.3)
+    finished = []
+
+    async def run(prompt):
+        finished.append((await client.generate(prompt), time.monotonic()))
+
+    async def main():
+        start = time.monotonic()
+        await asyncio.gather(run("kota"), run("saglikli"))
+        return start
+
+    start = asyncio.run(main())
+
+    assert [prompt for prompt, _ in finished] == ["saglikli", "kota"]
+    assert finished[0][1] - start < 0.2
@@ -0,0 +1,83 @@
+import re
+
+import pytest
+
+from extractor.notlar_parser import HEADER_TOKENS, _HEADER_SCANNER, _leading_chars, declared_keys, parse_notlar_kv
+
+# Her başlık token'ı için PDF'lerde görülen yazımlar (yeni token eklenirse buraya da eklenmeli)
+TOKEN_SAMPLES = {
+    "ciro_2024": ["2024 Cirosu Kümülatif", "2024 çirosu kümülatif"],
+    "ciro_2025": ["2025 Cirosu Kümülatif"],
+    "q2_hedef": ["Q2 Hedef", "q2  hedef"],
+    "gorusulen_kisi": ["Görüşülen Kişi Adı", "görüşülen kişi adi"],
+    "pozisyon": ["Pozisyon", "POZIZYON"],
+    "sunulan_urun": ["Sunulan Ürün Gruplari"],
+    "rakip_firma": ["Firmada Karşilaşilan", "Fırmada karşilaşilan"],
+    "siparis_alindi": ["Sipariş Alındı mı", "sibariş alindi mi", "SİPARİŞ ALINDI MI"],
+    "yaklasik_tutar": ["Yaklaşik Sipariş Tutari", "YAKLAŞIK SİPARİŞ TUTARI"],
+    "genel_yorum": ["FİRMA HAKKINDA GENEL YORUM", "Firma Hakkinda Genel Yorum"],
+}
+
+
+def test_every_header_token_has_a_sample():
+    assert set(TOKEN_SAMPLES) == set(HEADER_TOKENS)
+
+
+@pytest.mark.parametrize("name, sample", [
+    (name, sample) for name, samples in TOKEN_SAMPLES.items() for sample in samples
+])
+def test_every_header_token_is_detected(name, sample):
+    text = f"Notlar:\nönceki satır\n{sample}: değer\n"
+
+    tokens = [(m.lastgroup, m.group()) for m in _HEADER_SCANNER.finditer(text)]
+
+    assert (name, sample) in tokens
+
+
+def test_leading_chars_cover_all_alternatives():
+    assert _leading_chars(r'si[bp]ariş\s+alind[ıi]\s+mi|S[İI]PAR[İI]Ş') == {"s", "S"}
+    assert _leading_chars(r'[cç]iro') == {"c", "ç"}
+
+
+@pytest.mark.parametrize("pattern", [r'(?:a|b)c', r'\s+ciro', r'.ciro', r'[^a]ciro'])
+def test_leading_chars_rejects_ungated_patterns(pattern):
+    with pytest.raises(ValueError):
+        _leading_chars(pattern)
+
+
+def test_gated_scanner_matches_plain_alternation():
+    plain = re.compile(
+        "|".join(f"(?P<{name}>{pattern})" for name, pattern in HEADER_TOKENS.items()), re.IGNORECASE
+    )
+    text = "\n".join(f"{sample}: x" for samples in TOKEN_SAMPLES.values() for sample in samples)
+
+    assert [m.span() for m in _HEADER_SCANNER.finditer(text)] == [m.span() for m in plain.finditer(text)]
+
+
+def test_parse_notlar_kv_reads_fields():
+    kv = parse_notlar_kv("Q2 Hedef: 1.000 €\nGörüşülen Kişi Adı: Ali Veli Pozisyon: Müdür Sunulan Ürün Gruplari")
+
+    assert kv["gorusulen_kisi"] == "Ali Veli"
+    assert kv["pozisyon"] == "Müdür"
+    assert kv["q2_hedef_value"] == 1000
+
+
+def test_declared_keys_maps_headers_in_order():
+    text = (
+        "2024 Cirosu Kümülatif: 1.000 €\n2025 Cirosu Kümülatif: 2.000 €\nQ2 Hedef: 3.000 €\n"
+        "Görüşülen Kişi Adı: Ali\nPozisyon: Müdür\nSipariş Alındı mi: Evet\nYaklaşık Sipariş Tutarı: 5 €\n"
+    )
+
+    assert declared_keys(text) == [
+        "ciro_2024", "ciro_2025", "q2_hedef", "gorusulen_kisi", "pozisyon",
+        "siparis_alindi_mi", "yaklasik_siparis_tutari",
+    ]
+
+
+def test_declared_keys_rule_details():
+    # 2025 kuralı genel 'ciro' kuralından önce gelir; 'mi' olmadan sipariş başlığı sayılmaz
+    assert declared_keys("2025 Cirosu: x") == ["ciro_2025"]
+    assert declared_keys("Sipariş durumu: x") == []
+    assert declared_keys("Sipariş alındı mı: x") == []  # noktasız 'mı' eski kuralda da eşleşmez
+    assert declared_keys("Ciro: 1\nciro: 2") == ["ciro_2024"]
+    assert declared_keys("") == []
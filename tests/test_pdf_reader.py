@@ -0,0 +1,138 @@
+import pytest
+
+from extractor import pdf_reader
+from extractor.text_cache import PDFTextCache
+
+PAGES = [
+    "Ziyaret Raporu - Firma: ABC Ltd. Görüşülen kişi ve ciro hedef bilgileri " * 3,
+    "Notlar: sipariş alındı, ikinci sayfa içeriği ziyaret özeti " * 3,
+    "MUTABAKAT DURUMU - üçüncü sayfa, firma ciro hedef tablosu " * 3,
+]
+
+
+@pytest.fixture
+def streamed_pdf(tmp_path, monkeypatch):
+    """Sahte sayfa akışı + geçici metin önbelleği; okunan sayfa sayısını sayar"""
+    pdf_path = tmp_path / "ziyaret.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 test")
+    cache = PDFTextCache(cache_dir=str(tmp_path / "cache"))
+    reads = []
+
+    def fake_pages(path):
+        for page in PAGES:
+            reads.append(page)
+            yield page
+
+    monkeypatch.setattr(pdf_reader, "PDF_EARLY_EXIT", True)
+    monkeypatch.setattr(pdf_reader, "get_text_cache", lambda: cache)
+    monkeypatch.setattr(pdf_reader, "iter_page_texts", fake_pages)
+    return str(pdf_path), reads
+
+
+def _stop_at(marker):
+    def is_complete(text):
+        return marker in text
+    return is_complete
+
+
+def test_until_key_separates_predicates_with_same_name(streamed_pdf):
+    path, reads = streamed_pdf
+
+    first = pdf_reader.read_pdf_text_until(path, _stop_at("Notlar"), until_key="notlar")
+    second = pdf_reader.read_pdf_text_until(path, _stop_at("MUTABAKAT"), until_key="mutabakat")
+
+    assert "Notlar" in first and "MUTABAKAT" not in first
+    assert "MUTABAKAT" in second
+    assert len(reads) == 2 + 3
+
+
+def test_same_until_key_is_served_from_cache(streamed_pdf):
+    path, reads = streamed_pdf
+
+    first = pdf_reader.read_pdf_text_until(path, _stop_at("Notlar"), until_key="notlar")
+    again = pdf_reader.read_pdf_text_until(path, lambda text: True, until_key="notlar")
+
+    assert again == first
+    assert len(reads) == 2
+
+
+@pytest.mark.parametrize("text", [
+    "Ziyaret Raporu\nTarih: 01.08.2025\nFirma: X A.Ş.",
+    "İmza",
+    "Sayfa 2 / 2",
+])
+def test_short_digital_page_is_accepted(text):
+    assert pdf_reader.is_page_text_good(text)
+
+
+@pytest.mark.parametrize("text", ["", "   \n\t\n", "\x0c"])
+def test_blank_page_goes_to_next_extractor(text):
+    assert not pdf_reader.is_page_text_good(text)
+
+
+@pytest.mark.parametrize("text", [
+    "(cid:12)(cid:45)(cid:3)(cid:77) (cid:9)(cid:18)",
+    "��� a ��",
+    "---- .... ____ ||||",
+])
+def test_garbled_page_goes_to_next_extractor(text):
+    assert not pdf_reader.is_page_text_good(text)
+
+
+def test_short_pages_are_not_escalated():
+    pages, engines = [], []
+    pdf_reader._apply_page_results(pages, engines, {0: "Ziyaret Raporu\nFirma: X", 1: ""}, "pdfplumber")
+
+    assert engines == ["pdfplumber", None]
+    assert pdf_reader._pending_pages(engines) == [1]
+
+
+@pytest.fixture
+def scanned_header_pdf(streamed_pdf, monkeypatch):
+    """İlk sayfası sadece görüntü olan (metin katmanı boş) karışık PDF"""
+    path, reads = streamed_pdf
+
+    def fake_pages(path):
+        for page in ["", PAGES[1], PAGES[2]]:
+            reads.append(page)
+            yield page
+
+    monkeypatch.setattr(pdf_reader, "iter_page_texts", fake_pages)
+    return path
+
+
+def test_image_only_page_is_escalated_in_stream(scanned_header_pdf, monkeypatch):
+    escalated = []
+
+    def fake_pdftotext(path, page_indices=None):
+        escalated.append(page_indices)
+        return {0: "Firma: ABC Ltd.\nKONU: Ziyaret Raporu - taranmış başlık sayfası"}
+
+    monkeypatch.setattr(pdf_reader, "_pdftotext_pages", fake_pdftotext)
+    monkeypatch.setattr(pdf_reader, "_read_pdf_text_cached", lambda *a, **k: pytest.fail("tam zincire düşmemeli"))
+
+    text = pdf_reader.read_pdf_text_until(scanned_header_pdf, _stop_at("MUTABAKAT"), until_key="m")
+
+    assert escalated == [[0]]
+    assert text.startswith("Firma: ABC Ltd.")
+    assert "MUTABAKAT" in text
+
+
+def test_unrecoverable_stream_falls_back_to_full_chain(scanned_header_pdf, monkeypatch):
+    def missing_pdftotext(path, page_indices=None):
+        raise FileNotFoundError("pdftotext")
+
+    monkeypatch.setattr(pdf_reader, "_pdftotext_pages", missing_pdftotext)
+    monkeypatch.setattr(pdf_reader, "is_text_quality_good", lambda text, page_count: False)
+    monkeypatch.setattr(pdf_reader, "_read_pdf_text_cached", lambda path, use_cache=True: ("tam zincir", "ocr"))
+
+    text = pdf_reader.read_pdf_text_until(scanned_header_pdf, _stop_at("MUTABAKAT"), until_key="m")
+
+    assert text == "tam zincir"
+
+
+def test_good_stream_does_not_escalate(streamed_pdf, monkeypatch):
+    path, _ = streamed_pdf
+    monkeypatch.setattr(pdf_reader, "_pdftotext_pages", lambda *a, **k: pytest.fail("yükseltme gereksiz"))
+
+    assert "MUTABAKAT" in pdf_reader.read_pdf_text_until(path, _stop_at("MUTABAKAT"), until_key="m")
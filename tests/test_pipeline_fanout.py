@@ -0,0 +1,64 @@
+import sys
+import types
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import pipeline_workflow
+from pipeline_workflow import PipelineFanout
+
+
+class BrokenExecutor:
+    """İlk işi tamamlayıp sonrakilerde BrokenProcessPool veren sahte havuz"""
+
+    def __init__(self, max_workers=None):
+        self.submitted = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, item):
+        self.submitted.append(item)
+        future = Future()
+        if len(self.submitted) == 1:
+            future.set_result(fn(item))
+        else:
+            future.set_exception(BrokenProcessPool("worker öldü"))
+        return future
+
+
+@pytest.fixture
+def fanout_pdfs(tmp_path, monkeypatch):
+    for name in ("a.pdf", "b.pdf", "c.pdf"):
+        (tmp_path / name).write_bytes(b"%PDF")
+
+    runner_monthly = types.ModuleType("runners.runner_monthly")
+    runner_monthly.resolve_visit_date = lambda path: "2025-08-01"
+    runner_monthly.process_single_pdf_for_monthly = lambda path, visit_date: {
+        'status': 'SUCCESS', 'pdf_path': path, 'data': {'visit_date': visit_date}
+    }
+    monkeypatch.setitem(sys.modules, "runners.runner_monthly", runner_monthly)
+    return tmp_path
+
+
+def test_extract_visits_maps_broken_pool_to_error_rows(fanout_pdfs, monkeypatch):
+    monkeypatch.setattr(pipeline_workflow, "ProcessPoolExecutor", BrokenExecutor)
+
+    visits = PipelineFanout([8], workers=2).extract_visits(str(fanout_pdfs))
+
+    assert [v['status'] for v in visits] == ['SUCCESS', 'ERROR', 'ERROR']
+    assert [v['pdf_path'] for v in visits] == [str(fanout_pdfs / n) for n in ("a.pdf", "b.pdf", "c.pdf")]
+    assert "worker öldü" in visits[1]['error_message']
+    assert visits[1]['elapsed_seconds'] == 0
+
+
+def test_extract_visits_single_worker_runs_inline(fanout_pdfs, monkeypatch):
+    monkeypatch.setattr(pipeline_workflow, "ProcessPoolExecutor", None)
+
+    visits = PipelineFanout([8], workers=1).extract_visits(str(fanout_pdfs))
+
+    assert [v['status'] for v in visits] == ['SUCCESS'] * 3
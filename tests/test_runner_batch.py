@@ -0,0 +1,64 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import runner_batch
+
+
+class BrokenExecutor:
+    """İkinci işten itibaren BrokenProcessPool veren sahte process havuzu"""
+
+    def __init__(self, max_workers=None):
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, path):
+        self.count += 1
+        future = Future()
+        if self.count == 1:
+            future.set_result(fn(path))
+        else:
+            future.set_exception(BrokenProcessPool("worker öldü"))
+        return future
+
+
+def fake_extract(path):
+    return {'pdf_path': path, 'kv': {}, 'elapsed_seconds': 0.1}
+
+
+def test_iter_extracted_keeps_input_order_and_maps_broken_pool(monkeypatch):
+    monkeypatch.setattr(runner_batch, "extract_pdf_fields_safe", fake_extract)
+    monkeypatch.setattr(runner_batch, "ProcessPoolExecutor", BrokenExecutor)
+
+    items = list(runner_batch.iter_extracted(["a.pdf", "b.pdf", "c.pdf"], workers=2))
+
+    assert [item['pdf_path'] for item in items] == ["a.pdf", "b.pdf", "c.pdf"]
+    assert 'error' not in items[0]
+    assert items[1]['error'].startswith("Worker hatası")
+    assert items[2]['elapsed_seconds'] == 0
+
+
+def test_iter_extracted_sequential(monkeypatch):
+    monkeypatch.setattr(runner_batch, "extract_pdf_fields_safe", fake_extract)
+    monkeypatch.setattr(runner_batch, "ProcessPoolExecutor", None)
+
+    items = list(runner_batch.iter_extracted(["a.pdf", "b.pdf"], workers=1))
+
+    assert [item['pdf_path'] for item in items] == ["a.pdf", "b.pdf"]
+
+
+def test_extraction_error_becomes_error_result(monkeypatch):
+    def boom(path):
+        raise RuntimeError("okunamadı")
+
+    monkeypatch.setattr(runner_batch, "extract_pdf_fields", boom)
+
+    extracted = runner_batch.extract_pdf_fields_safe("a.pdf")
+    result = runner_batch.build_result(extracted, use_llm=False)
+
+    assert result['status'] == 'ERROR'
+    assert "okunamadı" in result['error_message']
@@ -0,0 +1,97 @@
+import pandas as pd
+import pytest
+
+from analyzer.sales_cube import SalesCube
+from analyzer.sales_performance import compare_material_series
+
+
+def test_compare_material_series():
+    hedef = pd.Series({"A": 100.0, "B": 0.0, "C": 50.0})
+    gerceklesen = pd.Series({"B": 10.0, "A": 150.0, "X": 5.0})
+
+    result = compare_material_series(hedef, gerceklesen)
+
+    assert list(result['malzeme_analizi']) == ["B", "A"]
+    assert result['malzeme_analizi']["A"] == {'hedef': 100.0, 'gerceklesen': 150.0, 'fark': 50.0, 'buyume_orani': 50.0}
+    assert result['malzeme_analizi']["B"]['buyume_orani'] == 0
+    assert result['eksik_malzemeler'] == ["C"]
+    assert result['genel_ozet'] == {
+        'toplam_hedef': 100.0, 'toplam_gerceklesen': 160.0, 'toplam_fark': 60.0, 'genel_buyume_orani': 60.0
+    }
+
+
+@pytest.fixture
+def cube():
+    rows = []
+    for ay, hedef, gercek in [("Temmuz", 100, 80), ("Ağustos", 100, 120), ("Eylül", 100, None)]:
+        rows.append(("hedef", "A", ay, hedef))
+        if gercek is not None:
+            rows.append(("gerceklesen", "A", ay, gercek))
+    return SalesCube(pd.DataFrame(rows, columns=['kaynak', 'malzeme', 'ay', 'deger']))
+
+
+def test_month(cube):
+    result = cube.month("Ağustos")
+
+    assert result['ay'] == "Ağustos"
+    assert result['genel_ozet']['toplam_fark'] == 20.0
+
+
+def test_quarter_skips_months_without_actuals(cube):
+    result = cube.quarter(3)
+
+    assert result['ay'] == "Q3"
+    assert result['aylar'] == ["Temmuz", "Ağustos"]
+    assert result['genel_ozet']['toplam_hedef'] == 200.0
+    assert result['genel_ozet']['toplam_gerceklesen'] == 200.0
+
+
+def test_ytd_defaults_to_last_available_month(cube):
+    result = cube.ytd()
+
+    assert result['ay'] == "YTD-Ağustos"
+    assert result['aylar'] == ["Temmuz", "Ağustos"]
+
+
+def test_invalid_periods(cube):
+    with pytest.raises(ValueError):
+        cube.month("Agustos")
+    with pytest.raises(ValueError):
+        cube.quarter(5)
+    with pytest.raises(FileNotFoundError):
+        cube.month("Eylül")
+
+
+@pytest.fixture
+def datas_2024(tmp_path, monkeypatch):
+    """2024 hedef kolonları ve Ağustos gerçekleşeni olan veri klasörü"""
+    openpyxl = pytest.importorskip("openpyxl")
+    from analyzer import sales_performance
+    from analyzer.workbook_cache import WorkbookCache
+
+    monkeypatch.setattr(sales_performance, "_workbooks", WorkbookCache(persist=False))
+
+    wb = openpyxl.Workbook()
+    wb.active.append(["Malzeme Tipi", "Temmuz 2024 Ciro", "Ağustos 2024 Ciro"])
+    wb.active.append(["..Boya", 100, 200])
+    wb.active.append(["Total", 100, 200])
+    wb.save(tmp_path / "Musteri_Ciro_Raporu.xlsx")
+
+    wb = openpyxl.Workbook()
+    wb.active.append(["Malzeme Tipi", "Ağustos Ciro"])
+    wb.active.append(["..Boya", 250])
+    wb.save(tmp_path / sales_performance.GERCEKLESEN_FILE_TEMPLATE.format(month_name="Ağustos"))
+    return str(tmp_path)
+
+
+def test_build_uses_target_columns_of_the_cube_year(datas_2024):
+    result = SalesCube.build(datas_2024, year=2024).month("Ağustos")
+
+    assert result['yil'] == 2024
+    assert result['genel_ozet']['toplam_hedef'] == 200.0
+    assert result['malzeme_analizi']["Boya"]['fark'] == 50.0
+
+
+def test_build_rejects_year_without_target_columns(datas_2024):
+    with pytest.raises(ValueError, match="2025"):
+        SalesCube.build(datas_2024, year=2025)
@@ -0,0 +1,29 @@
+from extractor.sections import extract_notlar_block, is_notlar_complete
+
+
+def _stream_until_complete(lines):
+    """read_pdf_text_until gibi: her 'sayfa' eklendikten sonra durma koşulunu kontrol eder"""
+    chunks = []
+    for line in lines:
+        chunks.append(line)
+        text = "\n".join(chunks)
+        if is_notlar_complete(text):
+            break
+    return "\n".join(chunks)
+
+
+def test_gorevler_before_mutabakat_does_not_stop_stream():
+    text = "Notlar:\nA\nGörevler: x\nB devam\nMUTABAKAT DURUMU\n"
+    streamed = _stream_until_complete(text.split("\n"))
+
+    assert extract_notlar_block(streamed) == extract_notlar_block(text) == ":\nA\nGörevler: x\nB devam"
+
+
+def test_complete_only_after_mutabakat():
+    assert not is_notlar_complete("Notlar:\nA\nGörevler: x\nEkler: y")
+    assert is_notlar_complete("Notlar:\nA\nMUTABAKAT DURUMU")
+    assert not is_notlar_complete("MUTABAKAT DURUMU\nNotlar: A")
+
+
+def test_without_mutabakat_falls_back_to_gorevler():
+    assert extract_notlar_block("Notlar:\nA\nGörevler: x\nEkler: y") == ":\nA"
@@ -0,0 +1,64 @@
+import os
+
+from extractor.text_cache import PDFTextCache
+
+
+def test_key_follows_content_version_and_params(tmp_path):
+    cache = PDFTextCache(cache_dir=str(tmp_path / "cache"))
+    pdf = tmp_path / "a.pdf"
+    copy = tmp_path / "kopya.pdf"
+    pdf.write_bytes(b"%PDF-1 a")
+    copy.write_bytes(b"%PDF-1 a")
+
+    key = cache.make_key(str(pdf), "4", {"line_margin": 0.5})
+
+    assert cache.make_key(str(copy), "4", {"line_margin": 0.5}) == key
+    assert cache.make_key(str(pdf), "5", {"line_margin": 0.5}) != key
+    assert cache.make_key(str(pdf), "4", {"line_margin": 0.3}) != key
+    pdf.write_bytes(b"%PDF-1 b")
+    assert cache.make_key(str(pdf), "4", {"line_margin": 0.5}) != key
+
+
+def test_put_get_roundtrip(tmp_path):
+    cache = PDFTextCache(cache_dir=str(tmp_path))
+
+    assert cache.get("ab" * 32) is None
+    cache.put("ab" * 32, "Notlar: metin", "mixed(pdfplumber:1,ocr:1)")
+
+    assert cache.get("ab" * 32) == {"text": "Notlar: metin", "engine": "mixed(pdfplumber:1,ocr:1)"}
+
+
+def test_size_limit_evicts_least_recently_used(tmp_path):
+    cache = PDFTextCache(cache_dir=str(tmp_path), max_bytes=10 ** 9)
+    keys = [c * 64 for c in "abc"]
+    for age, key in enumerate(keys):
+        cache.put(key, "x" * 100, "pdfplumber")
+        os.utime(cache._entry_path(key), (1000 + age, 1000 + age))
+    cache.get(keys[0])  # en eski kayıt yeniden kullanıldı
+
+    cache.max_bytes = 2 * os.path.getsize(cache._entry_path(keys[0]))
+    cache._evict()
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+
+
+def test_put_scans_directory_only_when_tracked_size_exceeds_limit(tmp_path, monkeypatch):
+    cache = PDFTextCache(cache_dir=str(tmp_path), max_bytes=10 ** 9)
+    scans = []
+    full_scan = cache._evict
+    monkeypatch.setattr(cache, "_evict", lambda: scans.append(1) or full_scan())
+
+    keys = [c * 64 for c in "abcd"]
+    for age, key in enumerate(keys[:3]):
+        cache.put(key, "x" * 100, "pdfplumber")
+        os.utime(cache._entry_path(key), (1000 + age, 1000 + age))
+    assert len(scans) == 1  # yalnızca ilk yazımda toplam boyut öğrenilir
+
+    cache.max_bytes = 3 * os.path.getsize(cache._entry_path(keys[0]))
+    cache.put(keys[3], "x" * 100, "pdfplumber")
+
+    assert len(scans) == 2
+    assert cache.get(keys[0]) is None
+    assert all(cache.get(key) is not None for key in keys[1:])
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Ortak tutar ayrıştırma motoru
+Extractor (parse_amount) ve FinancialAnalyzer (clean_currency_value) aynı kuralları kullanacak
+
+Kurallar:
+- Sondaki tarih eki atılır: "25.435.852,83 - 02.07.2025" -> "25.435.852,83"
+- Para birimi: €/EUR/Euro -> '€', TL/₺/TRY -> '₺'
+- Negatif yazımlar: ilk rakamın bitişiğinde '-' ("-1.250 TL", "€ -500"), muhasebe
+  parantezi ("(1.250,00) TL") veya sonda eksi ("1.250,00-"). Rakamdan boşlukla ayrılmış
+  tire madde işareti/ayraçtır, işaret sayılmaz ("- 50.000 TL", "Ciro: - 1.200.000")
+- Hem ',' hem '.' varsa son görülen ondalık ayracıdır
+- Tek tür ayraç birden fazla geçiyorsa binlik ayracıdır ("1.250.000")
+- Tek virgül her zaman ondalıktır (Türkçe yazım: "1,250" -> 1.250, "12,5" -> 12.5)
+- Tek nokta ve ardından tam 3 rakam varsa binlik, aksi halde ondalıktır ("751.594", "12.5")
+- Sayısal girdiler (int/float/Decimal) olduğu gibi kabul edilir
+
+İki yol aynı sonucu üretir:
+- parse_amount_parts: tekil değerler için LRU önbellekli skaler yol
+- parse_amounts: liste/pandas Series için vektörel (pandas str) toplu yol
+"""
+
+import re
+import math
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Sıra önemli: ilk bulunan token para birimini belirler
+CURRENCY_TOKENS = [("€", "€"), ("tl", "₺"), ("₺", "₺"), ("try", "₺"), ("eur", "€"), ("euro", "€")]
+
+DATE_SUFFIX_RE = re.compile(r'\s*-\s*\d{2}\.\d{2}\.\d{4}.*$', re.DOTALL)
+_CURRENCY_RE = r'(?:€|₺|tl|try|eur|euro)?'
+# Desen string olarak vektörel yolda da (pyarrow/RE2) kullanılır; sadece ortak sözdizimi
+NEGATIVE_RE = re.compile(
+    r'(?i)^[^0-9]*-[0-9]'
+    rf'|^\s*\(\s*{_CURRENCY_RE}\s*[0-9][0-9.,]*\s*{_CURRENCY_RE}\s*\)\s*{_CURRENCY_RE}\s*$'
+    rf'|[0-9]-\s*{_CURRENCY_RE}\s*$'
+)
+NON_NUMERIC_RE = re.compile(r'[^0-9,.]')
+LAST_SEPARATOR_RE = re.compile(r'^(.*)[.,]([0-9]*)$')  # greedy: son ayraçtan böler
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+
+@lru_cache(maxsize=8192)
+def _parse_text(text: str) -> Tuple[Optional[str], Optional[str]]:
+    """Metin -> (kanonik sayı metni | None, para birimi | None)"""
+    s = DATE_SUFFIX_RE.sub('', text.strip())
+    lowered = s.lower()
+
+    currency = None
+    for token, symbol in CURRENCY_TOKENS:
+        if token in lowered:
+            currency = symbol
+            break
+
+    digits = NON_NUMERIC_RE.sub('', s)
+    if not any(c.isdigit() for c in digits):
+        return None, currency
+
+    canonical = re.sub(r'\D', '', digits)
+    split = LAST_SEPARATOR_RE.match(digits)
+    if split:
+        int_part, dec_part = split.groups()
+        separator_count = digits.count(',') + digits.count('.')
+        mixed = ',' in digits and '.' in digits
+        if mixed or (separator_count == 1 and (',' in digits or len(dec_part) != 3)):
+            int_digits = re.sub(r'\D', '', int_part) or '0'
+            canonical = f"{int_digits}.{dec_part}" if dec_part else int_digits
+
+    if NEGATIVE_RE.search(s):
+        canonical = f"-{canonical}"
+    return canonical, currency
+
+
+def parse_amount_parts(value) -> Tuple[Optional[str], Optional[str]]:
+    """Tekil değer -> (kanonik sayı metni | None, para birimi | None)
+
+    Kanonik metin Decimal veya float'a kayıpsız çevrilebilir (ör. "-1250000.5").
+    """
+    if value is None:
+        return None, None
+    if _is_number(value):
+        if isinstance(value, float) and math.isnan(value):
+            return None, None
+        return str(value), None
+    return _parse_text(str(value))
+
+
+def parse_amount_decimal(value) -> Tuple[Optional[Decimal], Optional[str]]:
+    """Tekil değer -> (Decimal | None, para birimi | None)"""
+    canonical, currency = parse_amount_parts(value)
+    if canonical is None:
+        return None, currency
+    try:
+        return Decimal(canonical), currency
+    except InvalidOperation:
+        return None, currency
+
+
+def parse_amounts(values):
+    """Toplu ayrıştırma - (değerler, para birimleri) paralel numpy dizileri döndürür.
+
+    Değerler float'tır (ayrıştırılamayanlar NaN), para birimleri object dizisidir (None olabilir).
+    Girdi liste, tuple veya pandas Series olabilir; sıra korunur.
+    """
+    import numpy as np
+    import pandas as pd
+
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    series = series.reset_index(drop=True)
+
+    numeric_mask = series.map(_is_number).astype(bool)
+    result = pd.Series(np.nan, index=series.index, dtype=float)
+    result[numeric_mask] = pd.to_numeric(series[numeric_mask], errors='coerce').astype(float)
+
+    # Desenler string olarak verilir: pyarrow destekli str dtype'ta C++ regex motoru kullanılır
+    text = series[~numeric_mask & series.notna()].astype(str).str.strip()
+    text = text.str.replace('(?s)' + DATE_SUFFIX_RE.pattern, '', regex=True)
+    lowered = text.str.lower()
+
+    currencies = pd.Series([None] * len(series), index=series.index, dtype=object)
+    for token, symbol in reversed(CURRENCY_TOKENS):
+        # Ters sırada yazılır: listede önce gelen token son sözü söyler
+        currencies[lowered.index[lowered.str.contains(token, regex=False)]] = symbol
+
+    digits = text.str.replace(NON_NUMERIC_RE.pattern, '', regex=True)
+    has_digit = digits.str.contains('[0-9]', regex=True)
+    text, digits = text[has_digit], digits[has_digit]
+
+    has_separator = digits.str.contains('[.,]', regex=True)
+    mixed = digits.str.contains(',', regex=False) & digits.str.contains('.', regex=False)
+    int_digits = digits.str.replace('[.,][0-9]*$', '', regex=True).str.replace('[^0-9]', '', regex=True)
+    dec_part = digits.str.replace('^.*[.,]', '', regex=True)
+    single_comma = digits.str.contains(',', regex=False)
+    is_decimal = has_separator & (mixed | ((digits.str.count('[.,]') == 1) & (single_comma | (dec_part.str.len() != 3))))
+
+    int_digits = int_digits.where(int_digits != '', '0')
+    with_decimal = (int_digits + '.' + dec_part).where(dec_part != '', int_digits)
+    canonical = digits.str.replace('[^0-9]', '', regex=True).where(~is_decimal, with_decimal)
+
+    negative = text.str.contains(NEGATIVE_RE.pattern, regex=True)
+    parsed = pd.to_numeric(canonical, errors='coerce')
+    result[parsed.index] = parsed.where(~negative, -parsed)
+
+    return result.to_numpy(), currencies.to_numpy()
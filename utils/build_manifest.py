@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Pipeline adımları için make benzeri derleme manifesti
+
+Her adımın parmak izi = girdi dosyalarının içerik özetleri + kod dosyalarının özetleri
++ parametreler + bağımlı adımların parmak izleri. Parmak izi son başarılı çalıştırmadakiyle
+aynıysa ve o çalıştırmanın ürettiği çıktı dosyaları hâlâ aynı içerikle duruyorsa adım
+atlanabilir. Çıktı içeriği de karşılaştırılır: sabit adlı bir çıktıyı (ör.
+LLM_Input_Satis_Analizi.json) başka bir şirket/ay çalıştırması yeniden yazdıysa adım bayattır.
+
+İçerik özetleri (SHA-256) dosya boyutu + mtime ile önbelleğe alınır; değişmeyen
+dosyalar tekrar okunmaz, böylece değişiklik olmayan tekrar çalıştırma milisaniyeler sürer.
+
+Ortam değişkenleri: PIPELINE_MANIFEST
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_MANIFEST_PATH = Path(__file__).parent.parent / ".cache" / "pipeline_manifest.json"
+
+
+class BuildManifest:
+    """Adım parmak izlerini ve dosya özetlerini saklayan JSON manifest"""
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path: Manifest dosyası (varsayılan: env PIPELINE_MANIFEST veya .cache/pipeline_manifest.json)
+        """
+        self.path = Path(path or os.getenv("PIPELINE_MANIFEST", str(DEFAULT_MANIFEST_PATH)))
+        self._files = {}
+        self._steps = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._files = data.get("files", {})
+            self._steps = data.get("steps", {})
+        except (OSError, ValueError):
+            pass
+
+    def file_hash(self, path: str) -> Optional[str]:
+        """Dosya içeriğinin SHA-256 özeti (dosya yoksa None); boyut + mtime değişmediyse önbellekten"""
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        cached = self._files.get(path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        self._files[path] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def fingerprint(self, inputs: Iterable[str], code: Iterable[str], params: Dict = None,
+                    dependencies: Dict[str, str] = None) -> str:
+        """Girdi + kod dosyaları, parametreler ve bağımlı adım parmak izlerinden tek özet"""
+        key_source = {
+            "inputs": {os.path.abspath(p): self.file_hash(p) for p in sorted(set(inputs))},
+            "code": {os.path.abspath(p): self.file_hash(p) for p in sorted(set(code))},
+            "params": params or {},
+            "dependencies": dependencies or {},
+        }
+        key_json = json.dumps(key_source, sort_keys=True, default=str)
+        return hashlib.sha256(key_json.encode("utf-8")).hexdigest()
+
+    def is_fresh(self, step_id: str, fingerprint: str) -> bool:
+        """Parmak izi aynı ve kayıtlı çıktıların hepsi kayıttaki içerikle duruyorsa True"""
+        entry = self._steps.get(step_id)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return False
+        outputs = entry.get("outputs")
+        # Eski manifest biçimi (sadece yol listesi) içerik doğrulamasına izin vermez
+        if not outputs or not isinstance(outputs, dict):
+            return False
+        return all(digest is not None and self.file_hash(p) == digest for p, digest in outputs.items())
+
+    def record(self, step_id: str, fingerprint: str, outputs: List[str]):
+        """Başarılı çalıştırmanın parmak izini ve ürettiği çıktıların içerik özetlerini kaydeder"""
+        self._steps[step_id] = {
+            "fingerprint": fingerprint,
+            "outputs": {os.path.abspath(p): self.file_hash(p) for p in sorted(outputs)},
+            "built_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    def refresh_outputs(self, step_id: str):
+        """Kayıtlı çıktıların özetlerini güncel içerikle yeniler.
+
+        Bir sonraki adım aynı dosyayı yerinde zenginleştirdiğinde (satış JSON'u) çalıştırma
+        sonunda çağrılır; aksi halde önceki adım kendi kaydıyla hiç eşleşmezdi.
+        """
+        entry = self._steps.get(step_id)
+        if entry and isinstance(entry.get("outputs"), dict):
+            entry["outputs"] = {p: self.file_hash(p) for p in entry["outputs"]}
+
+    def save(self):
+        """Manifesti atomik olarak yazar (önce geçici dosya, sonra yer değiştirme)"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"files": self._files, "steps": self._steps}, f, ensure_ascii=False, indent=1)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"[WARNING] Pipeline manifesti yazılamadı: {e}")
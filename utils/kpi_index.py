@@ -0,0 +1,162 @@
+"""
+KPI rapor dosyaları için kalıcı SQLite indeksi.
+
+Her kayıt: şirket (normalize), yıl, ay, oluşturulma zamanı, dosya yolu. (şirket, yıl, ay,
+oluşturulma zamanı) üzerindeki indeks sayesinde en güncel KPI dosyası dizin taraması
+yapılmadan O(log n) sorguyla bulunur.
+
+runner_monthly her KPI JSON'u yazdığında kaydı ekler. İndeks, ay klasörünün mtime'ı
+kayıttakinden farklıysa (dışarıdan dosya eklenmiş/silinmiş) veya dosya artık yoksa
+bayat sayılır; bu durumda çağıran taraf klasörü yeniden tarayıp index_files ile günceller.
+
+Ortam değişkenleri: KPI_INDEX (0 = kapalı), KPI_INDEX_PATH
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from contextlib import closing
+from pathlib import Path
+from typing import Iterable, Optional
+
+INDEX_FILENAME = ".kpi_index.sqlite"
+
+# NormVision_KPI_{şirket}_{ay adı}_{yıl}_{YYYYmmdd_HHMMSS}.json, klasör: MM-{ay adı}
+KPI_YEAR_PATTERN = re.compile(r"_(\d{4})_\d{8}_\d{6}\.json$")
+MONTH_FOLDER_PATTERN = re.compile(r"^(\d{2})-")
+
+
+class KPIReportIndex:
+    """Şirket + dönem -> en güncel KPI JSON yolu"""
+
+    def __init__(self, reports_base: str, db_path: str = None):
+        """
+        Args:
+            reports_base: KPI raporlarının kök klasörü (Reports/Monthly)
+            db_path: SQLite dosyası (varsayılan: env KPI_INDEX_PATH veya reports_base/.kpi_index.sqlite)
+        """
+        self.reports_base = Path(os.path.abspath(reports_base))
+        self.db_path = Path(db_path or os.getenv("KPI_INDEX_PATH") or self.reports_base / INDEX_FILENAME)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS kpi_reports (
+                       path TEXT PRIMARY KEY,
+                       company TEXT NOT NULL,
+                       year INTEGER NOT NULL,
+                       month INTEGER NOT NULL,
+                       created_at REAL NOT NULL,
+                       folder TEXT NOT NULL
+                   )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_kpi_reports_period "
+                "ON kpi_reports(company, year, month, created_at)"
+            )
+            # Klasör -> son indekslemedeki mtime (bayatlık kontrolü)
+            conn.execute("CREATE TABLE IF NOT EXISTS folders (folder TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL)")
+            # Aranan ad -> klasör adı (fuzzy eşleşmeler tekrar taranmaz)
+            conn.execute("CREATE TABLE IF NOT EXISTS aliases (alias TEXT PRIMARY KEY, company TEXT NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # Her çağrıda ayrı bağlantı: thread'ler ve process'ler arasında güvenli
+        return sqlite3.connect(str(self.db_path), timeout=30)
+
+    @staticmethod
+    def _folder_mtime(folder: str) -> Optional[int]:
+        try:
+            return os.stat(folder).st_mtime_ns
+        except OSError:
+            return None
+
+    def record(self, path: str, company: str, year: int, month: int):
+        """KPI dosyasını ekler ve klasörünün güncel mtime'ını saklar"""
+        with closing(self._connect()) as conn, conn:
+            self._record(conn, path, company, year, month)
+
+    def _record(self, conn: sqlite3.Connection, path: str, company: str, year: int, month: int):
+        path = os.path.abspath(path)
+        folder = os.path.dirname(path)
+        conn.execute(
+            "INSERT OR REPLACE INTO kpi_reports (path, company, year, month, created_at, folder) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (path, company, year, month, os.path.getctime(path), folder),
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO folders (folder, mtime_ns) VALUES (?, ?)",
+            (folder, self._folder_mtime(folder)),
+        )
+
+    def index_files(self, paths: Iterable[str], alias: str = None) -> int:
+        """Şirket klasörü taramasında bulunan KPI dosyalarıyla o şirketin kayıtlarını yeniler
+        (şirket = rapor kökü altındaki ilk klasör; artık olmayan dosyaların kayıtları silinir)
+
+        Args:
+            paths: Şirket klasöründeki tüm KPI JSON yolları
+            alias: Aranan normalize şirket adı; klasör adından farklıysa eşleşme olarak saklanır
+
+        Returns:
+            int: Eklenen kayıt sayısı
+        """
+        count = 0
+        replaced = set()
+        with closing(self._connect()) as conn, conn:
+            for path in paths:
+                path = Path(path)
+                year_match = KPI_YEAR_PATTERN.search(path.name)
+                month_match = MONTH_FOLDER_PATTERN.match(path.parent.name)
+                try:
+                    company = path.relative_to(self.reports_base).parts[0]
+                except ValueError:
+                    continue
+                if company not in replaced:
+                    conn.execute("DELETE FROM kpi_reports WHERE company = ?", (company,))
+                    replaced.add(company)
+                if not (year_match and month_match):
+                    continue
+                self._record(conn, str(path), company, int(year_match.group(1)), int(month_match.group(1)))
+                if alias and alias != company:
+                    conn.execute("INSERT OR REPLACE INTO aliases (alias, company) VALUES (?, ?)", (alias, company))
+                count += 1
+        return count
+
+    def latest(self, company: str, year: int, month: int) -> Optional[str]:
+        """Dönemin en güncel KPI dosyası; kayıt yoksa veya indeks bayatsa None"""
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT company FROM aliases WHERE alias = ?", (company,)).fetchone()
+            if row:
+                company = row[0]
+            row = conn.execute(
+                "SELECT r.path, r.folder, f.mtime_ns FROM kpi_reports r "
+                "LEFT JOIN folders f ON f.folder = r.folder "
+                "WHERE r.company = ? AND r.year = ? AND r.month = ? "
+                "ORDER BY r.created_at DESC LIMIT 1",
+                (company, year, month),
+            ).fetchone()
+        if row is None:
+            return None
+        path, folder, mtime_ns = row
+        if mtime_ns is None or self._folder_mtime(folder) != mtime_ns or not os.path.exists(path):
+            return None
+        return path
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_kpi_index(reports_base: str) -> Optional[KPIReportIndex]:
+    """Rapor kökü başına paylaşılan indeks örneği (KPI_INDEX=0 ise veya açılamazsa None)"""
+    if os.getenv("KPI_INDEX", "1").lower() in ("0", "false", "no"):
+        return None
+    key = os.path.abspath(reports_base)
+    with _indexes_lock:
+        if key not in _indexes:
+            try:
+                _indexes[key] = KPIReportIndex(reports_base)
+            except (OSError, sqlite3.Error) as e:
+                print(f"[WARNING] KPI indeksi açılamadı: {e}")
+                return None
+        return _indexes[key]